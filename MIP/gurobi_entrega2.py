@@ -3,151 +3,111 @@
 # property "preprocess"
 # Enables/disables pre-processing. Pre-processing tries to improve your MIP formulation. -1 means automatic, 0 means off and 1 means on.
 
-from mip import * # https://docs.python-mip.com/en/latest/index.html
+import argparse
+import os
+import sqlite3
+import sys
 import time
-import re
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'gurobipy')) # módulos compartilhados com a versão gurobipy
+from gap_heuristic import solve_heuristic
+from gap_results import InstanceResult
+from instance_loader import instance_hash, read_instance
+from results_store import ResultsStore, export_results_file, import_missing_results
+from solver_backends import HighsBackend, MipBackend, SolverBackend
+from sweep_executor import SweepJob, run_sweep
+
+INSTANCES_ZIP = os.path.join(BASE_DIR, 'instancias-parte2.zip')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
 
 cases_name = ["d60900", "d201600", "d401600", "d801600", "e60900", "e801600" ]
 
 MAX_SECONDS = 3 * 60 # 3min convertido para segundos -> tempo máximo para cada instância
 MAX_AGENTS = 80 # número máximo de agentes
+THREADS_PER_JOB = 1 # threads do solver em cada execução (o executor usa no máximo núcleos / THREADS_PER_JOB processos)
 
-def solveInstance(filename):
-    print("[!] Iniciando resolução com arquivo de entrada '{}'".format(filename))
-    input_reader = open(filename, "r")
-
-    first_line = input_reader.readline()
-    content_lines = input_reader.readlines()
-
-    input_reader.close() # fechando arquivo de entrada
-
-    agents_and_tasks = first_line.split(" ")
-    nb_agents = int(agents_and_tasks[0])
-    nb_tasks = int(agents_and_tasks[1])
-    print("\tNúmero de agentes = {}\n\tNúmero de tarefas = {}".format(nb_agents, nb_tasks))
-
-    # para cada agente i (i=1,...,m):
-    # satisfacao (c_{ij} = lucro) por alocar a tarefa j ao agente i (j=1,...,n)
-    profits_agents = [] # cada linha desse array 2D representa o lucro gerado por um agente ao realizar cada tarefa
-    for i in range(nb_agents):
-        profits_agents.append(list(map(int, content_lines[i].split(" ")[:-1])))
-    
-    # para cada agente i (i=1,...,m):
-    # recurso consumido (a_{ij}) ao alocar a tarefa j ao agente i (j=1,...,n) 
-    effort_agents = [] # cada linha desse array 2D representa o recurso consumido por um agente ao realizar cada tarefa
-    for i in range(nb_agents):
-        effort_agents.append(list(map(int, content_lines[nb_agents + i].split(" ")[:-1])))
-    
-    # capacidade do agente i (i=1,...,m)
-    capacities_agents = [] # cada item (de índice i) desse array representa a capacidade de realização de tarefas do agente i
-    capacities_array_line_index = nb_agents * 2
-    capacities_array = content_lines[capacities_array_line_index].split(" ")
-    for i in range(nb_agents):
-        capacities_agents.append(int(capacities_array[i]))
-    
-    # for i in range(nb_agents):
-    #     print("\tAgente {} com capacidade = {}".format(i, capacities_agents[i]))
-
-    # ===== Criação do modelo =====
-    # sense=MAXIMIZE -> queremos maximizar nossa função objetiva
-    # GRB = Gurobi
-    # CBC = Coin-Or Branch and Cut
-    # export GUROBI_HOME="/home/haltz/Downloads/USP - 2º semestre 2021/ProgMat/gurobi_lib/gurobi9.1.2_linux64/gurobi912/linux64/"
-    # Para usar a licença do Gurobi: export GRB_LICENSE_FILE="/home/haltz/Downloads/USP - 2º semestre 2021/ProgMat/gurobi_lib/gurobi.lic"
-    model = Model(sense = MAXIMIZE, solver_name = GRB)
-    model.preprocess = 0 # desabilizando preprocessamento
-    # Pre-processing tries to improve your MIP formulation. -1 means automatic, 0 means off and 1 means on.
-
-    # ===== Variáveis de decisão =====
-    decision_variables = []
+OUTPUT_FILE = 'gurobi_entrega2_sem_preprocessing.csv'  # gerado a partir do banco de resultados (results_store.py)
+STORE_FILE = 'gurobi_entrega2.sqlite'
 
-    for i in range(nb_agents): # criando os x_{ij} no qual x = agente executa ou não tarefa (1 ou 0), i = agente e j = tarefa
-        decision_variables.append([ model.add_var(name='X[{}][{}]'.format(i, j), var_type=BINARY) for j in range(nb_tasks) ]) # para cada agente, cria uma lista de variáveis de decisão de tamanho "nb_tasks" (= qtd. de tarefas disponíveis) 
-    
-    # ===== Restrições =====
-        
-    # Σ_{i=1}^m x_{ij} = 1, j = 1, 2, ..., n -> cada tarefa j só é executada por um agente
-    for j in range(nb_tasks):
-        model += xsum(decision_variables[i][j] for i in range(nb_agents)) == 1
-    
-    # Σ_{j=1}^n a_{ij} * x_{ij} <= cap_{i}, i = 1, 2, ..., m -> cada agente i não pode executar mais tarefas do que a sua capacidade
-    for i in range(nb_agents):
-        model += xsum(effort_agents[i][j] * decision_variables[i][j] for j in range(nb_tasks)) <= capacities_agents[i]
-    
-    # x_{ij} E {0,1}, i = 1, 2, ..., n; j = 1, 2, ..., n -> restrição garantida pelo var_type=BINARY ao criar a variável de decisão
+# GRB = Gurobi e CBC = Coin-Or Branch and Cut (via python-mip); HIGHS via highspy
+SOLVER_NAMES = ['GRB', 'CBC', 'HIGHS']
 
-    # ===== Função Objetivo =====
-    # Σ_{i=1}^m Σ_{j=1}^n ( c_{ij} * x_{ij} )
-    model.objective = xsum(profits_agents[i][j] * decision_variables[i][j] for j in range(nb_tasks) for i in range(nb_agents))
+MipRun = namedtuple('MipRun', ['solver_name', 'mip_start'])
 
-    print('Model has {} vars, {} constraints and {} nzs'.format(model.num_cols, model.num_rows, model.num_nz))
+def makeBackend(instance, solver_name) -> SolverBackend:
+    # export GUROBI_HOME="/home/haltz/Downloads/USP - 2º semestre 2021/ProgMat/gurobi_lib/gurobi9.1.2_linux64/gurobi912/linux64/"
+    # Para usar a licença do Gurobi: export GRB_LICENSE_FILE="/home/haltz/Downloads/USP - 2º semestre 2021/ProgMat/gurobi_lib/gurobi.lic"
+    if solver_name == 'HIGHS':
+        return HighsBackend(instance)
+    return MipBackend(instance, solver_name=solver_name)
 
+def solveInstance(filename, solver_name='GRB', mip_start=True) -> InstanceResult:
+    print("[!] Iniciando resolução com arquivo de entrada '{}'".format(filename))
+    instance = read_instance(filename, cache_dir=CACHE_DIR, zip_path=INSTANCES_ZIP)
+    print("\tNúmero de agentes = {}\n\tNúmero de tarefas = {}".format(instance.nb_agents, instance.nb_tasks))
 
-    model.setParam("heu*", "default")
+    # ===== Criação do modelo =====
+    # o modelo (variáveis x_{ij}, restrições de atribuição e capacidade, objetivo de maximização) é o mesmo
+    # de gurobipy/test.py e fica em solver_backends.py
+    build_start = time.time()
+    backend = makeBackend(instance, solver_name)
+    backend.configure(MAX_SECONDS, THREADS_PER_JOB, presolve=False) # desabilitando preprocessamento
+    build_time = time.time() - build_start # tempo de construção do modelo, medido à parte da otimização
+
+    # ===== MIP start =====
+    # solução da heurística gulosa + busca local (gap_heuristic.py) como solução inicial do solver
+    time_offset = 0.0
+    if mip_start:
+        heuristic = solve_heuristic(instance)
+        if heuristic is not None:
+            backend.set_start(heuristic.assignment)
+            time_offset = heuristic.elapsed
+            backend.configure(max(MAX_SECONDS - time_offset, 0.0), THREADS_PER_JOB, presolve=False) # heurística + solver em MAX_SECONDS
+            print('\tMIP start com "lucro" de {} ({:.2f}s)'.format(heuristic.objective, heuristic.elapsed))
 
     # Realizando otimização com tempo limite de MAX_SECONDS
-    status = model.optimize(max_seconds=MAX_SECONDS)
-
-    result_text = analyzeResult(status, model)
-
-    return (result_text, model)
-
-def analyzeResult(solve_status, model):
-    solution_text = ''
-    if solve_status == OptimizationStatus.OPTIMAL: # resultado ótimo encontrado
-        solution_text = 'Solução ótima encontrada com "lucro" de {}'.format(model.objective_value)
-    elif solve_status == OptimizationStatus.FEASIBLE: # resultado viável encontrado
-        solution_text = 'Solução viável encontrada com "lucro" de {} - esperança (melhor possível): {}'.format(model.objective_value, model.objective_bound)
-    elif solve_status == OptimizationStatus.NO_SOLUTION_FOUND: # nenhum resultado encontrado
-        solution_text = 'Solução factível não encontrada:'
-    
-    print('\t' + solution_text)
-
-    #if solve_status == OptimizationStatus.OPTIMAL or solve_status == OptimizationStatus.FEASIBLE:
-    #    print('\n=== Solução ===\nObs.: X[i][j] = 1 representa que agente i realiza tarefa j\n')
-    #    for var in model.vars:
-    #        if abs(var.x) > 1e-6: # só printamos valores diferentes de zero
-    #            print('{} : {}'.format(var.name, var.x))
-    
-    return solution_text
-
-# Salvando resultados de cada caso de teste
-def formatTestcaseCSV(case_name: str, exec_time, sol_text: str, num_nos_explorados, valor_limite_dual, gap, vars):
-    #        'caso_teste,tempo_total,conclusao'
-    line = f'{case_name},{exec_time},{sol_text},{num_nos_explorados},{valor_limite_dual},{gap}'
-
-    # for var in vars: # variáveis do modelo
-    #     if abs(var.x) > 1e-6:
-    #         # X[i][j] -> var.name
-    #         indices = re.findall(r'\[(\d+)]\[(\d+)]', var.name)[0]
-    #         assert len(indices) >= 2, 'var.name malformed! should be X[i][j]'
-    #         i, j = indices
-    #         line += f',{j}'
-    
-    return line
-
-# Preparando primeira linha do arquivo de saída CSV
-# o número de nós explorados, o valor da melhor solução, o valor do limitante dual e o GAP para cada instância resolvida. Analisar os resultados obtidos.
-first_line = 'caso_teste,tempo_total,conclusao,num_nos_explorados,limitante_dual,gap'
-# for i in range(MAX_AGENTS):
-#     first_line += ',agente{}'.format(i)
-
-output_file = open('gurobi_entrega2_sem_preprocessing.csv', 'a')
-output_file.write(first_line + '\n')
-
-for case_name in cases_name:
-    start_time = time.time()
-    
-    result_text, model = solveInstance("instancias-parte2/" + case_name + ".in")
-
-    exec_time = time.time() - start_time # tempo gasto resolvendo o caso de teste
-
-    gap = model.gap
-    best_possible_value = model.objective_bound
-    nb_explored_nodes = 0
-    
-    output_file.write(formatTestcaseCSV(case_name, exec_time, result_text,  nb_explored_nodes, best_possible_value, gap, model.vars) + '\n')
-    output_file.flush()
-
-print("Finalizando programa...")
-output_file.close() 
\ No newline at end of file
+    result = backend.solve(time_offset)
+    result.build_time = build_time
+    backend.dispose()
+
+    print('\t{}: "lucro" de {} - limitante dual: {}'.format(result.status, result.best_result, result.best_expected))
+    return result
+
+# Executado em um processo do pool: devolve apenas o resultado (o modelo não é picklable)
+def solveCase(job: SweepJob) -> InstanceResult:
+    return solveInstance("instancias-parte2/" + job.instance_name + ".in", job.run.solver_name, job.run.mip_start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve todas as instâncias com python-mip (GRB/CBC) ou HiGHS')
+    parser.add_argument('--solver', choices=SOLVER_NAMES, default='GRB',
+                        help='solver (CBC e HIGHS não precisam de licença)')
+    parser.add_argument('--cores', type=int, default=None,
+                        help='orçamento de núcleos para rodar as instâncias em paralelo (padrão: todos os disponíveis)')
+    parser.add_argument('--no-mip-start', dest='mip_start', action='store_false',
+                        help='não passa a solução da heurística como MIP start')
+    args = parser.parse_args()
+
+    # Resultados no banco e, no fim, no arquivo de saída CSV (mesmo formato de gurobipy/test.py)
+    # o número de nós explorados, o valor da melhor solução, o valor do limitante dual e o GAP para cada instância resolvida. Analisar os resultados obtidos.
+    preset_name = f'{args.solver} sem preprocessing' + ('' if args.mip_start else ' sem MIP start')
+
+    # só este processo escreve no banco; os workers devolvem os resultados
+    def writeCaseResult(job: SweepJob, result: InstanceResult):
+        store.add(result, preset_name, {'solver': job.run.solver_name, 'mip_start': job.run.mip_start, 'presolve': False},
+                  instance_hash(result.instance), job.repetition, MAX_SECONDS)
+
+    jobs = [SweepJob(MipRun(args.solver, args.mip_start), case_name, 0) for case_name in cases_name]
+    with ResultsStore(STORE_FILE) as store:
+        import_missing_results(store, OUTPUT_FILE, preset_name)
+        run_sweep(jobs, solveCase, writeCaseResult, args.cores, THREADS_PER_JOB)
+
+    connection = sqlite3.connect(STORE_FILE)
+    export_results_file(connection, [preset_name], OUTPUT_FILE)
+    connection.close()
+
+    print("Finalizando programa...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from gap_matrices import active_columns
+from gap_results import InstanceResult
+from instance_loader import Instance
+from lagrangian import LinearRelaxation, solve_linear_relaxation
+from solver_backends import SolverBackend, make_backend
+from termination import TerminationMonitor
+from trajectory import TrajectoryRecorder
+
+# Formulação esparsa por lista de candidatos: o modelo só tem x_ij para os k melhores agentes de cada
+# tarefa (lucro alto e pouco consumo da capacidade do agente) e os pares entram sob demanda.
+#  1. pricing no LP: com os duais (u_j das tarefas, w_i das capacidades), todo par de fora com
+#     d_ij = c_ij - u_j - a_ij w_i > 0 entra, até o LP restrito ser o LP do modelo completo;
+#  2. depois do MIP: uma solução que usa um par de fora vale no máximo z_LP + d_ij (d_ij <= 0). Se
+#     algum par ainda pode chegar a incumbente + 1 (lucros inteiros), ele entra e o MIP roda de novo
+#     com o tempo que sobra, partindo da melhor solução. Sem nenhum, o resultado vale para o GAP inteiro.
+# O limitante devolvido é max(limitante do MIP restrito, z_LP + max d_ij dos pares de fora).
+
+### CONSTANTES ###
+
+NB_CANDIDATES = 8  # agentes por tarefa na lista inicial
+PRICING_TOLERANCE = 1e-6
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class CandidateStats:
+    nb_initial: int      # pares da lista inicial (k por tarefa + solução da heurística)
+    nb_priced_lp: int    # pares que entraram no pricing do LP
+    nb_priced_mip: int   # pares que entraram depois do MIP
+    nb_rounds: int       # execuções do MIP
+    pricing_time: float
+
+
+def candidate_mask(instance: Instance, nb_candidates: int) -> np.ndarray:
+    # (m x n) bool: os k agentes de cada tarefa com menor soma das posições no ranking do lucro (maior
+    # primeiro) e no da fração da capacidade consumida (menor primeiro)
+    profits = np.asarray(instance.profits, dtype=np.float64)
+    usage = np.asarray(instance.capacityReductions, dtype=np.float64) / np.asarray(instance.totalCaps, dtype=np.float64)[:, None]
+    score = np.argsort(np.argsort(-profits, axis=0), axis=0) + np.argsort(np.argsort(usage, axis=0), axis=0)
+    mask = np.zeros(profits.shape, dtype=bool)
+    if nb_candidates >= instance.nb_agents:
+        mask[:] = True
+        return mask
+    best = np.argpartition(score, nb_candidates - 1, axis=0)[:nb_candidates]
+    mask[best, np.arange(instance.nb_tasks)[None, :]] = True
+    return mask
+
+
+def price_candidates(instance: Instance, candidates: np.ndarray, universe: np.ndarray) -> Tuple[np.ndarray, LinearRelaxation]:
+    # Resolve o LP restrito e inclui os pares de fora com custo reduzido positivo até não sobrar nenhum.
+    # LP restrito inviável (capacidades apertadas demais para os candidatos): dobra a lista por tarefa.
+    candidates = candidates.copy()
+    nb_per_task = max(1, int(candidates.sum(axis=0).min()))
+    while True:
+        try:
+            relaxation = solve_linear_relaxation(instance, candidates)
+        except ValueError:
+            if candidates.sum() == universe.sum():
+                raise
+            nb_per_task *= 2
+            candidates |= candidate_mask(instance, nb_per_task) & universe
+            continue
+
+        entering = universe & ~candidates & (relaxation.reduced_costs > PRICING_TOLERANCE)
+        if not entering.any():
+            return candidates, relaxation
+        candidates |= entering
+
+
+class CandidateBackend(SolverBackend):
+    # Envolve um backend do modelo compacto (make_backend) montado só com as colunas candidatas.
+    # active (reduction.py) limita o universo de pares que podem entrar.
+    def __init__(self, backend_name: str, instance: Instance, active: Optional[np.ndarray] = None,
+                 nb_candidates: int = NB_CANDIDATES):
+        super().__init__(instance, active)
+        self.name = backend_name
+        self.universe = np.zeros((instance.nb_agents, instance.nb_tasks), dtype=bool)
+        self.universe.ravel()[self.columns] = True
+        self.nb_candidates = nb_candidates
+        self.time_limit = math.inf
+        self.threads, self.presolve = 1, True
+
+        start = time.perf_counter()
+        self.candidates = candidate_mask(instance, nb_candidates) & self.universe
+        nb_initial = int(self.candidates.sum())
+        self.candidates, self.relaxation = price_candidates(instance, self.candidates, self.universe)
+        self.stats = CandidateStats(nb_initial, int(self.candidates.sum()) - nb_initial, 0, 0, time.perf_counter() - start)
+        self.inner = make_backend(backend_name, instance, self.candidates)
+
+    def reset(self):
+        # os pares que já entraram continuam no modelo
+        self.inner.reset()
+        self.stats.nb_rounds = 0
+
+    def configure(self, time_limit: float, threads: int, presolve: bool):
+        self.time_limit, self.threads, self.presolve = time_limit, threads, presolve
+        self.inner.configure(time_limit, threads, presolve)
+
+    def set_start(self, assignment: np.ndarray):
+        # a solução de partida precisa estar no modelo: pares dela que não são candidatos entram já
+        tasks = np.arange(assignment.size)
+        missing = ~self.candidates[assignment, tasks]
+        if missing.any():
+            self._add_pairs(assignment[missing], tasks[missing])
+            self.stats.nb_initial += int(missing.sum())
+        self.inner.set_start(assignment)
+
+    def version(self) -> str:
+        return self.inner.version()
+
+    def dispose(self):
+        self.inner.dispose()
+
+    def best_assignment(self) -> Optional[np.ndarray]:
+        return self.inner.best_assignment()
+
+    def add_columns(self, columns: np.ndarray):
+        agents, tasks = np.divmod(np.asarray(columns), self.instance.nb_tasks)
+        self._add_pairs(agents, tasks)
+
+    def _add_pairs(self, agents: np.ndarray, tasks: np.ndarray):
+        self.candidates[agents, tasks] = True
+        self.inner.add_columns(agents * self.instance.nb_tasks + tasks)
+        self.inner.configure(self.time_limit, self.threads, self.presolve)
+
+    def exclusion_bound(self) -> float:
+        # melhor valor possível de uma solução com algum par fora do modelo
+        excluded = self.universe & ~self.candidates
+        if not excluded.any():
+            return -math.inf
+        return self.relaxation.bound + float(self.relaxation.reduced_costs[excluded].max())
+
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        # a trajetória das rodadas é uma só: o optimize() herdado fecha com a amostra final uma vez
+        time_offset = recorder.time_offset
+        exec_time, nodes, iterations = 0.0, 0.0, 0.0
+        while True:
+            result, round_iterations = self.inner.run(recorder, monitor)
+            self.stats.nb_rounds += 1
+            exec_time += result.exec_time
+            nodes += result.nb_explored_nodes
+            iterations += round_iterations
+            remaining = self.time_limit - exec_time
+            if math.isnan(result.best_result) or (monitor is not None and monitor.stop_reason is not None) or remaining <= 0:
+                break
+
+            # lucros inteiros: só interessam pares que ainda podem levar a incumbente + 1
+            threshold = result.best_result + 1 - PRICING_TOLERANCE
+            entering = self.universe & ~self.candidates & (self.relaxation.bound + self.relaxation.reduced_costs >= threshold)
+            if not entering.any():
+                break
+
+            assignment = self.inner.best_assignment()
+            start = time.perf_counter()
+            nb_before = int(self.candidates.sum())
+            self.candidates |= entering
+            self.candidates, self.relaxation = price_candidates(self.instance, self.candidates, self.universe)
+            self.stats.pricing_time += time.perf_counter() - start
+            self.stats.nb_priced_mip += int(self.candidates.sum()) - nb_before
+
+            self.inner.add_columns(active_columns(self.instance, self.candidates))
+            self.inner.configure(remaining, self.threads, self.presolve)
+            self.inner.set_start(assignment)
+            recorder.time_offset = time_offset + exec_time
+
+        recorder.time_offset = time_offset
+        result.exec_time, result.nb_explored_nodes = exec_time, nodes
+        excluded_bound = self.exclusion_bound()
+        if excluded_bound > result.best_expected:
+            excluded_bound = math.floor(excluded_bound + PRICING_TOLERANCE)
+            result.best_expected = max(result.best_expected, excluded_bound)
+            if not math.isnan(result.best_result) and result.best_result != 0:
+                result.gap = abs(excluded_bound - result.best_result) / abs(result.best_result)
+        return result, iterations
@@ -0,0 +1,379 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from gap_heuristic import local_search, regret_greedy
+from gap_results import InstanceResult
+from instance_loader import Instance
+from lagrangian import knapsack_01, solve_linear_relaxation
+from solver_backends import SolverBackend, highspy
+from termination import TerminationMonitor
+from trajectory import NO_VALUE, TrajectoryRecorder
+
+# Decomposição de Dantzig-Wolfe do GAP por agente. O mestre escolhe, para cada agente i, um conjunto
+# de tarefas que cabe na sua mochila (coluna k, λ_ik):
+#   max Σ_ik c_ik λ_ik   s.a.  Σ_ik a_jik λ_ik = 1 (tarefa j),  Σ_k λ_ik <= 1 (agente i),  λ >= 0
+# Novas colunas vêm do pricing: uma mochila 0/1 por agente com lucros c_ij - u_j (u = duais das tarefas).
+# O limitante do mestre é o da relaxação lagrangiana (nunca pior que o LP do modelo compacto).
+# Branch-and-price: ramifica em x_ij = Σ_k a_jik λ_ik (x_ij = 0 / x_ij = 1) e repete a geração de colunas.
+# Nas instâncias D/E o limitante da raiz é fraco para o tempo disponível: ver o README.
+
+### CONSTANTES ###
+
+REDUCED_COST_TOLERANCE = 1e-6
+INTEGRALITY_TOLERANCE = 1e-6
+ROUNDING_TIME_LIMIT = 1.0  # segundos da busca local usada para arredondar o x fracionário da raiz
+INITIAL_COLUMNS = 64  # capacidade inicial da matriz de incidência coluna x tarefa (dobra quando enche)
+BOX_FRACTION = 0.002  # meia largura inicial da caixa de estabilização, em fração do lucro médio |c_ij|
+
+### CLASSES E TIPOS ###
+
+Fixing = Tuple[int, int, int]  # (agente, tarefa, 0 ou 1): x_ij fixado no ramo
+
+@dataclass
+class Node:
+    fixings: List[Fixing]
+    center: np.ndarray  # duais das tarefas com o melhor limitante lagrangiano conhecido (herdado do pai)
+    bound: float = math.inf  # limitante do pai (o nó só é resolvido se puder melhorar a solução)
+
+
+@dataclass
+class MasterSolution:
+    value: float  # só é o valor do mestre restrito quando stabilized é falso
+    lambdas: np.ndarray  # colunas dos agentes
+    task_duals: np.ndarray
+    agent_duals: np.ndarray
+    stabilized: bool  # alguma coluna de estabilização na solução (a caixa está limitando os duais)
+    artificial: bool  # alguma tarefa coberta pela coluna artificial
+
+
+class MasterProblem:
+    # Mestre restrito no HiGHS. Linhas: n tarefas (= 1) e m agentes (<= 1). Colunas fixas por tarefa:
+    #  - artificial (custo -big_m): mantém o mestre sempre viável, inclusive nos nós com fixações conflitantes;
+    #  - estabilização (+e_j com custo centro_j - Δ, -e_j com custo -(centro_j + Δ)): prendem o dual u_j na
+    #    caixa [centro_j - Δ, centro_j + Δ]. O mestre do GAP é muito degenerado e, sem a caixa, os duais
+    #    saltam para a ordem de big_m e o pricing só gera colunas inúteis.
+    # As colunas dos agentes vêm depois dessas 3n.
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None):
+        self.instance = instance
+        self.active = np.ones((instance.nb_agents, instance.nb_tasks), dtype=bool) if active is None else active
+        self.profits = np.asarray(instance.profits, dtype=np.float64)
+        self.weights = np.asarray(instance.capacityReductions, dtype=np.int64)
+        m, n = instance.nb_agents, instance.nb_tasks
+        self.big_m = float(np.abs(self.profits).sum()) + 1.0
+
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue('output_flag', False)
+        self.highs.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        lower = np.concatenate([np.ones(n), np.full(m, -highspy.kHighsInf)])
+        upper = np.ones(n + m)
+        self.highs.addRows(n + m, lower, upper, 0, np.array([], dtype=np.int32), np.array([], dtype=np.int32), np.array([]))
+        for sign in (1.0, 1.0, -1.0):
+            for j in range(n):
+                self.highs.addCol(-self.big_m, 0.0, highspy.kHighsInf, 1, np.array([j], dtype=np.int32), np.array([sign]))
+        # o mestre muda a cada iteração: simplex primal sem presolve, partindo da base anterior (novas
+        # colunas mantêm a base viável)
+        self.highs.setOptionValue('presolve', 'off')
+        self.highs.setOptionValue('solver', 'simplex')
+        self.highs.setOptionValue('simplex_strategy', 4)
+        self.set_box(np.zeros(n), math.inf)
+
+        # colunas dos agentes: agente, lucro e incidência (bool, coluna x tarefa) em arrays que crescem
+        self.nb_columns = 0
+        self.column_agent = np.zeros(INITIAL_COLUMNS, dtype=np.int64)
+        self.column_tasks = np.zeros((INITIAL_COLUMNS, n), dtype=bool)
+        self.allowed = np.ones(INITIAL_COLUMNS, dtype=bool)  # limite superior atual (fixações do nó) de cada coluna
+
+    def add_column(self, agent: int, tasks: np.ndarray) -> None:
+        if self.nb_columns == self.column_agent.size:
+            self.column_agent = np.concatenate([self.column_agent, np.zeros_like(self.column_agent)])
+            self.column_tasks = np.concatenate([self.column_tasks, np.zeros_like(self.column_tasks)])
+            self.allowed = np.concatenate([self.allowed, np.ones_like(self.allowed)])
+        k = self.nb_columns
+        self.column_agent[k] = agent
+        self.column_tasks[k] = False
+        self.column_tasks[k, tasks] = True
+        self.allowed[k] = True
+        self.nb_columns += 1
+
+        n = self.instance.nb_tasks
+        rows = np.append(tasks, n + agent).astype(np.int32)
+        self.highs.addCol(float(self.profits[agent, tasks].sum()), 0.0, highspy.kHighsInf, rows.size, rows, np.ones(rows.size))
+
+    def set_box(self, center: np.ndarray, delta: float) -> None:
+        # caixa dos duais das tarefas; delta infinito desliga a estabilização
+        n = self.instance.nb_tasks
+        columns = np.arange(n, 3 * n, dtype=np.int32)
+        if math.isinf(delta):
+            self.highs.changeColsBounds(2 * n, columns, np.zeros(2 * n), np.zeros(2 * n))
+            return
+        self.highs.changeColsCost(2 * n, columns, np.concatenate([center - delta, -(center + delta)]))
+        self.highs.changeColsBounds(2 * n, columns, np.zeros(2 * n), np.full(2 * n, highspy.kHighsInf))
+
+    def apply_fixings(self, fixings: List[Fixing]) -> None:
+        # colunas incompatíveis com as fixações do nó ficam com limite superior 0
+        k = self.nb_columns
+        agents, tasks = self.column_agent[:k], self.column_tasks[:k]
+        allowed = np.ones(k, dtype=bool)
+        for i, j, value in fixings:
+            if value == 0:
+                allowed &= ~((agents == i) & tasks[:, j])
+            else:
+                allowed &= ~((agents == i) & ~tasks[:, j])
+                allowed &= ~((agents != i) & tasks[:, j])
+        # só as colunas que mudaram: alterar o limite das outras descartaria a base do simplex
+        changed = np.flatnonzero(allowed != self.allowed[:k])
+        self.allowed[:k] = allowed
+        if changed.size:
+            columns = (3 * self.instance.nb_tasks + changed).astype(np.int32)
+            self.highs.changeColsBounds(changed.size, columns, np.zeros(changed.size), np.where(allowed[changed], highspy.kHighsInf, 0.0))
+
+    def solve(self) -> MasterSolution:
+        self.highs.run()
+        solution = self.highs.getSolution()
+        n = self.instance.nb_tasks
+        values = np.asarray(solution.col_value)
+        duals = np.asarray(solution.row_dual)
+        return MasterSolution(
+            value=self.highs.getInfo().objective_function_value,
+            lambdas=values[3 * n:3 * n + self.nb_columns],
+            task_duals=duals[:n],
+            agent_duals=duals[n:],
+            stabilized=bool(values[n:3 * n].max() > INTEGRALITY_TOLERANCE),
+            artificial=bool(values[:n].max() > INTEGRALITY_TOLERANCE)
+        )
+
+    def fractional_x(self, lambdas: np.ndarray) -> np.ndarray:
+        # λ pode ser anterior às últimas colunas do pricing (parada antes da convergência): essas valem 0
+        used = np.flatnonzero(lambdas > INTEGRALITY_TOLERANCE)
+        x = np.zeros((self.instance.nb_agents, self.instance.nb_tasks))
+        np.add.at(x, self.column_agent[used], lambdas[used, None] * self.column_tasks[used])
+        return x
+
+
+def price_agent(master: MasterProblem, agent: int, task_duals: np.ndarray, fixings: List[Fixing]) -> Tuple[float, Optional[np.ndarray]]:
+    # melhor coluna do agente respeitando as fixações: devolve (valor reduzido sem o dual do agente, tarefas)
+    reduced = master.profits[agent] - task_duals
+    weights = master.weights[agent]
+    capacity = int(master.instance.totalCaps[agent])
+
+    allowed = master.active[agent].copy()
+    forced = np.zeros(master.instance.nb_tasks, dtype=bool)
+    for i, j, value in fixings:
+        if i == agent and value == 1:
+            forced[j] = True
+        elif i == agent:
+            allowed[j] = False
+        elif value == 1:
+            allowed[j] = False  # tarefa fixada em outro agente
+    allowed &= ~forced
+
+    capacity -= int(weights[forced].sum())
+    if capacity < 0:
+        return -math.inf, None  # as tarefas obrigatórias não cabem: agente sem coluna viável
+
+    candidates = np.flatnonzero(allowed & (reduced > 0))
+    value = float(reduced[forced].sum())
+    chosen_tasks = np.flatnonzero(forced)
+    if candidates.size:
+        best, chosen = knapsack_01(reduced[candidates], weights[candidates], capacity)
+        value += best
+        chosen_tasks = np.concatenate([chosen_tasks, candidates[chosen]])
+    return value, np.sort(chosen_tasks)
+
+
+def lagrangian_pricing(master: MasterProblem, task_duals: np.ndarray, fixings: List[Fixing]) -> Tuple[float, List[Optional[np.ndarray]]]:
+    # L(u) = Σ_j u_j + Σ_i max(0, melhor coluna de i): limitante válido do nó para qualquer u (não
+    # depende do LP ter convergido). Devolve L(u) e a melhor coluna de cada agente (None se não há).
+    bound = float(task_duals.sum())
+    columns: List[Optional[np.ndarray]] = []
+    for agent in range(master.instance.nb_agents):
+        column_value, tasks = price_agent(master, agent, task_duals, fixings)
+        if tasks is None:
+            return -math.inf, []  # nó inviável
+        bound += max(0.0, column_value)
+        columns.append(tasks)
+    return bound, columns
+
+
+def column_generation(master: MasterProblem, node: Node, deadline: float, cutoff: float) -> Tuple[float, float, MasterSolution]:
+    # Resolve o mestre do nó (método da caixa: os duais ficam perto do centro, o ponto com o melhor
+    # limitante lagrangiano). Devolve (valor do mestre, limitante válido do nó, solução do mestre) e
+    # deixa em node.center o centro final, herdado pelos filhos.
+    master.apply_fixings(node.fixings)
+    center_bound, _ = lagrangian_pricing(master, node.center, node.fixings)
+    delta = BOX_FRACTION * float(np.abs(master.profits).mean())
+    master.set_box(node.center, delta)
+    while True:
+        solution = master.solve()
+        value = -math.inf if solution.stabilized else solution.value
+        # lucros inteiros: o nó está resolvido quando o mestre chega a floor(limitante), e é podado
+        # quando o limitante não chega a cutoff + 1
+        if math.floor(center_bound + 1e-6) <= value + 1e-6 or center_bound < cutoff + 1 - 1e-6 or time.perf_counter() > deadline:
+            return value, center_bound, solution
+
+        bound, columns = lagrangian_pricing(master, solution.task_duals, node.fixings)
+        moved = bound < center_bound  # passo sério: o centro vai para os duais atuais
+        if moved:
+            node.center, center_bound = solution.task_duals, bound
+
+        added = 0
+        for agent, tasks in enumerate(columns):
+            reduced_cost = master.profits[agent, tasks].sum() - solution.task_duals[tasks].sum() - solution.agent_duals[agent]
+            if reduced_cost > REDUCED_COST_TOLERANCE:
+                master.add_column(agent, tasks)
+                added += 1
+
+        if added == 0 and not solution.stabilized:
+            return value, value, solution  # nenhuma coluna melhora o mestre: é o ótimo do LP do nó
+        if added == 0:
+            # ótimo dentro da caixa com a caixa limitando: aumenta; grande demais, desliga a estabilização
+            delta *= 2
+            if delta > master.big_m:
+                delta = math.inf
+        if added == 0 or moved:
+            master.set_box(node.center, delta)
+
+
+def round_solution(instance: Instance, x: np.ndarray, time_limit: float) -> Optional[Tuple[np.ndarray, float]]:
+    # arredonda o x fracionário: gulosa por arrependimento usando x como preferência + busca local
+    desirability = x + 1e-3 * (np.asarray(instance.profits, dtype=np.float64) / np.abs(instance.profits).max())
+    return local_search(instance, regret_greedy(instance, desirability), time_limit)
+
+
+class BranchAndPriceBackend(SolverBackend):
+    # Alternativa ao modelo compacto (--engine branch-and-price no test.py). Busca em profundidade com o melhor limitante dos
+    # nós abertos como limitante dual global; o MIP start vira as colunas iniciais.
+    name = 'branch-and-price'
+
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None):
+        if highspy is None:
+            raise ImportError('branch-and-price precisa do pacote highspy')
+        super().__init__(instance, active)
+        self.active = active
+        self.time_limit = math.inf
+        self.start: Optional[np.ndarray] = None
+        self.best: Optional[np.ndarray] = None
+        self.master = MasterProblem(instance, active)
+
+    def reset(self):
+        self.master = MasterProblem(self.instance, self.active)
+        self.start = None
+        self.best = None
+
+    def add_columns(self, columns: np.ndarray):
+        # os pares novos entram no universo do pricing; o mestre é remontado, como no reset()
+        self.columns = np.union1d(self.columns, columns)
+        self.active = np.zeros((self.instance.nb_agents, self.instance.nb_tasks), dtype=bool)
+        self.active.ravel()[self.columns] = True
+        self.reset()
+
+    def best_assignment(self) -> Optional[np.ndarray]:
+        return self.best
+
+    def configure(self, time_limit: float, threads: int, presolve: bool):
+        self.time_limit = time_limit
+        self.master.highs.setOptionValue('threads', threads)
+
+    def set_start(self, assignment: np.ndarray):
+        self.start = assignment.copy()
+        for agent in range(self.instance.nb_agents):
+            self.master.add_column(agent, np.flatnonzero(assignment == agent))
+
+    def version(self) -> str:
+        return f'branch-and-price-highs-{self.master.highs.version()}'
+
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        instance = self.instance
+        start = time.perf_counter()
+        deadline = start + self.time_limit
+        profits = np.asarray(instance.profits, dtype=np.float64)
+        tasks = np.arange(instance.nb_tasks)
+
+        incumbent = -math.inf
+        best_assignment: Optional[np.ndarray] = None
+
+        def update_incumbent(assignment: np.ndarray, value: float, bound: float, nodes: int):
+            nonlocal incumbent, best_assignment
+            if value > incumbent + 1e-9:
+                incumbent, best_assignment = value, assignment
+                recorder.new_incumbent(time.perf_counter() - start, value, bound, nodes)
+
+        root_bound = math.inf
+        if self.start is not None:
+            update_incumbent(self.start, float(profits[self.start, tasks].sum()), root_bound, 0)
+
+        # duais da relaxação linear do modelo compacto como primeiro centro: o limitante lagrangiano já
+        # começa no LP e as primeiras colunas saem boas
+        stack = [Node([], solve_linear_relaxation(instance, self.active).multipliers)]
+        nb_nodes = 0
+        stopped = None
+        while stack:
+            elapsed = time.perf_counter() - start
+            global_bound = max(node.bound for node in stack)
+            if recorder.due(elapsed):
+                recorder.sample(elapsed, incumbent, global_bound, nb_nodes, math.nan)
+            if time.perf_counter() > deadline:
+                stopped = 'time'
+                break
+            if monitor is not None and monitor.check(elapsed, incumbent if incumbent > -math.inf else NO_VALUE, global_bound, nb_nodes):
+                stopped = 'monitor'
+                break
+
+            node = stack.pop()
+            if node.bound < incumbent + 1 - 1e-6:
+                continue  # lucros inteiros: o nó não tem solução melhor que a atual
+            value, bound, solution = column_generation(self.master, node, deadline, incumbent)
+            nb_nodes += 1
+            bound = math.floor(bound + 1e-6)
+            if nb_nodes == 1:
+                root_bound = bound
+            if bound < incumbent + 1 - 1e-6 or (bound <= value + 1e-6 and solution.artificial):
+                continue  # podado (ou inviável: alguma tarefa ficou na coluna artificial no ótimo do nó)
+
+            x = self.master.fractional_x(solution.lambdas)
+            if np.abs(x - np.round(x)).max() <= INTEGRALITY_TOLERANCE and np.allclose(x.sum(axis=0), 1):
+                assignment = x.argmax(axis=0)
+                update_incumbent(assignment, float(profits[assignment, tasks].sum()), bound, nb_nodes)
+                if bound >= incumbent + 1 - 1e-6:
+                    stack.append(Node(node.fixings, node.center, bound))  # parou no limite de tempo sem convergir
+                continue
+            if nb_nodes == 1:
+                rounded = round_solution(instance, x, min(ROUNDING_TIME_LIMIT, max(0.0, deadline - time.perf_counter())))
+                if rounded is not None:
+                    update_incumbent(rounded[0], rounded[1], bound, nb_nodes)
+
+            # ramifica no x_ij mais fracionário; o ramo x_ij = 1 é explorado primeiro (sai por último da pilha)
+            i, j = np.unravel_index(int(np.argmax(np.minimum(x, 1 - x))), x.shape)
+            stack.append(Node(node.fixings + [(int(i), int(j), 0)], node.center, bound))
+            stack.append(Node(node.fixings + [(int(i), int(j), 1)], node.center, bound))
+
+        exec_time = time.perf_counter() - start
+        has_solution = best_assignment is not None
+        dual_bound = max([node.bound for node in stack] + [incumbent])
+        if not has_solution:
+            status = 'time limit reached' if stopped == 'time' else 'infeasible solution'
+        elif stopped == 'time':
+            status = 'time limit reached'
+        elif stopped == 'monitor':
+            status = f'early stop: {monitor.stop_reason}'
+        else:
+            status = 'optimal solution'
+            dual_bound = incumbent
+
+        dual_bound = min(dual_bound, root_bound)
+        self.best = best_assignment
+        result = InstanceResult(
+            instance=instance,
+            exec_time=exec_time,
+            build_time=0.0,
+            status=status,
+            best_result=incumbent if has_solution else math.nan,
+            nb_explored_nodes=nb_nodes,
+            best_expected=dual_bound if dual_bound < math.inf else math.nan,
+            gap=abs(dual_bound - incumbent) / abs(incumbent) if has_solution and incumbent != 0 else math.inf
+        )
+        return result, math.nan
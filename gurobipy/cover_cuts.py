@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from instance_loader import Instance
+
+# Separação de coberturas (cover inequalities) nas restrições de capacidade Σ_j a_ij x_ij <= cap_i,
+# a partir da solução fracionária x* do LP de um nó. Para cada agente:
+#  1. cobertura gulosa só no suporte de x* (item com x* = 0 na cobertura já tira 1 da folga e a
+#     desigualdade não é violada): itens em ordem crescente de (1 - x*_j) / a_ij até passar de cap_i;
+#     feito para todos os agentes de uma vez (lexsort por agente + somas acumuladas por grupo);
+#  2. só os agentes com Σ_C (1 - x*) < 1 seguem: a cobertura vira mínima (sai o item de menor x*
+#     enquanto continuar cobertura; a violação só aumenta) e é levantada;
+#  3. levantamento de Balas (independe da ordem): com C em ordem decrescente de a, μ_h = soma dos h
+#     maiores, fora de C α_j = h se μ_h <= a_ij < μ_{h+1} (até |C| - 1). Σ_C x + Σ α_j x_j <= |C| - 1
+#     vale porque μ é côncava: itens de fora com Σ α = H ocupam pelo menos μ_H e sobram menos que
+#     |C| - H itens de C que caibam.
+# Cada chamada tem um limite de tempo (o passo 2 para no meio) e a mesma cobertura não sai duas vezes.
+
+### CONSTANTES ###
+
+SUPPORT_TOLERANCE = 1e-6
+MIN_VIOLATION = 1e-3
+CALL_TIME_LIMIT = 0.02  # segundos por chamada (por nó ou rodada de cortes da raiz)
+MAX_NODES = 0  # só separa até esse nó (gurobi: contagem de nós; python-mip: profundidade); 0 = só a raiz
+
+### CLASSES E TIPOS ###
+
+# (posições no vetor x do backend, coeficientes, lado direito) de Σ coef x <= rhs
+Cut = Tuple[np.ndarray, np.ndarray, float]
+
+@dataclass
+class CoverStats:
+    nb_calls: int = 0
+    nb_cuts: int = 0
+    nb_timeouts: int = 0  # chamadas que pararam pelo CALL_TIME_LIMIT
+    separation_time: float = 0.0
+
+
+class CoverSeparator:
+    def __init__(self, instance: Instance, time_limit: float = CALL_TIME_LIMIT, max_nodes: float = MAX_NODES):
+        self.nb_tasks = instance.nb_tasks
+        self.weights = np.asarray(instance.capacityReductions, dtype=np.float64).ravel()
+        self.capacities = np.asarray(instance.totalCaps, dtype=np.float64)
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.seen: Set[Tuple[int, ...]] = set()
+        self.stats = CoverStats()
+
+    def wants(self, node: float) -> bool:
+        # cortes em todos os nós derrubam a vazão de nós mais do que melhoram o limitante
+        return node <= self.max_nodes
+
+    def separate(self, columns: np.ndarray, values: np.ndarray) -> List[Cut]:
+        # columns: par (i * n + j) de cada posição do vetor x; values: x* nessas posições
+        start = time.perf_counter()
+        self.stats.nb_calls += 1
+        values = np.asarray(values, dtype=np.float64)
+        column_agents = columns // self.nb_tasks
+
+        support = np.flatnonzero(values > SUPPORT_TOLERANCE)
+        agents, weights, x = column_agents[support], self.weights[columns[support]], values[support]
+        order = np.lexsort(((1 - x) / np.maximum(weights, SUPPORT_TOLERANCE), agents))
+        support, agents, weights, x = support[order], agents[order], weights[order], x[order]
+
+        # somas acumuladas dentro de cada agente (grupo contíguo depois do lexsort)
+        new_group = np.r_[True, agents[1:] != agents[:-1]]
+        group = np.cumsum(new_group) - 1
+        starts = np.flatnonzero(new_group)
+        load = np.cumsum(weights)
+        load -= (load - weights)[starts][group]
+        slack = np.cumsum(1 - x)
+        slack -= (slack - (1 - x))[starts][group]
+
+        # primeiro item de cada agente em que a carga passa da capacidade: fim da cobertura gulosa
+        exceeds = np.flatnonzero(load > self.capacities[agents])
+        groups, first = np.unique(group[exceeds], return_index=True)
+        ends = exceeds[first]
+        violated = slack[ends] < 1 - MIN_VIOLATION
+
+        cuts: List[Cut] = []
+        for g, end in zip(groups[violated], ends[violated]):
+            if time.perf_counter() - start > self.time_limit:
+                self.stats.nb_timeouts += 1
+                break
+            agent = int(agents[end])
+            cover = list(range(starts[g], end + 1))
+            total = load[end]
+            # mínima: tira os itens de menor x* (fim da ordem) enquanto continuar cobertura
+            for k in reversed(cover[:-1]):
+                if total - weights[k] > self.capacities[agent]:
+                    total -= weights[k]
+                    cover.remove(k)
+            cover_positions = support[cover]
+            key = (agent,) + tuple(sorted(columns[cover_positions].tolist()))
+            if key in self.seen:
+                continue
+
+            size = len(cover)
+            mu = np.cumsum(np.sort(weights[cover])[::-1])
+            positions = np.flatnonzero(column_agents == agent)
+            coeffs = np.minimum(np.searchsorted(mu, self.weights[columns[positions]], side='right'), size - 1).astype(np.float64)
+            coeffs[np.isin(positions, cover_positions)] = 1.0
+            keep = coeffs > 0
+            positions, coeffs = positions[keep], coeffs[keep]
+            if coeffs @ values[positions] - (size - 1) > MIN_VIOLATION:
+                self.seen.add(key)
+                cuts.append((positions, coeffs, float(size - 1)))
+
+        self.stats.nb_cuts += len(cuts)
+        self.stats.separation_time += time.perf_counter() - start
+        return cuts
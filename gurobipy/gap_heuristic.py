@@ -0,0 +1,200 @@
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from instance_loader import Instance
+from lagrangian import solve_linear_relaxation
+
+# Heurística primal para o GAP: gulosa por arrependimento (regret) seguida de busca local com
+# movimentos shift (tarefa troca de agente) e swap (duas tarefas trocam de agente entre si),
+# com sobrecarga de capacidade penalizada (oscilação estratégica).
+# A gulosa ordena pelo lucro descontado do preço da capacidade (duais da relaxação linear): nas
+# instâncias E, lucro e recurso andam em sentidos opostos e a gulosa só por lucro enche os agentes com
+# as tarefas que mais consomem (a busca local terminava ~13% abaixo). A busca local para quando alguns
+# ótimos locais viáveis seguidos não melhoram o melhor (nas instâncias do trabalho, o melhor sai nos
+# 4 primeiros); o limite de tempo só vale para instâncias muito grandes.
+# A solução é guardada como assignment[j] = agente da tarefa j; folga, lucro e recurso atuais de
+# cada tarefa ficam em vetores e são atualizados em O(1) a cada movimento (sem recalcular somas).
+
+### CONSTANTES ###
+
+HEURISTIC_TIME_LIMIT = 5.0  # segundos de busca local, no máximo
+PENALTY_FRACTION = 0.3
+OSCILLATION_FACTOR = 1.2  # a penalidade da sobrecarga sobe/desce por este fator
+MAX_CYCLES_WITHOUT_IMPROVEMENT = 3  # ótimos locais viáveis seguidos sem melhorar o melhor encontrado
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class HeuristicSolution:
+    assignment: np.ndarray  # (nb_tasks,) índice do agente que executa cada tarefa
+    objective: float
+    elapsed: float
+
+### FUNÇÕES ###
+
+def regret_greedy(instance: Instance, desirability: np.ndarray) -> np.ndarray:
+    # Devolve uma atribuição completa; se alguma tarefa não couber em nenhum agente ela vai para o
+    # agente que fica menos sobrecarregado e a solução é consertada depois pela busca local.
+    weights = instance.capacityReductions
+    slack = np.array(instance.totalCaps, dtype=np.int64)
+    assignment = np.full(instance.nb_tasks, -1, dtype=np.int64)
+
+    def evaluate(j: int) -> Tuple[float, int]:
+        feasible = weights[:, j] <= slack
+        nb_feasible = int(feasible.sum())
+        if nb_feasible == 0:
+            return np.inf, int((slack - weights[:, j]).argmax())
+        values = np.where(feasible, desirability[:, j], -np.inf)
+        best = int(values.argmax())
+        if nb_feasible == 1:
+            return np.inf, best  # só um agente ainda comporta a tarefa: atribui primeiro
+        second = np.partition(values, -2)[-2]
+        return values[best] - second, best
+
+    heap = [(-evaluate(j)[0], j) for j in range(instance.nb_tasks)]
+    heapq.heapify(heap)
+
+    # arrependimentos ficam desatualizados conforme as folgas diminuem: reavalia a tarefa do topo e
+    # só atribui se ela continua sendo a de maior arrependimento
+    while heap:
+        _, j = heapq.heappop(heap)
+        regret, best = evaluate(j)
+        if heap and regret < -heap[0][0]:
+            heapq.heappush(heap, (-regret, j))
+            continue
+        assignment[j] = best
+        slack[best] -= weights[best, j]
+
+    return assignment
+
+
+def initial_penalty(instance: Instance) -> float:
+    # custo por unidade de sobrecarga: uma fração da variação de lucro por unidade de recurso
+    profits = np.asarray(instance.profits, dtype=np.float64)
+    return PENALTY_FRACTION * float(profits.max() - profits.min()) / float(np.mean(instance.capacityReductions))
+
+
+class SearchState:
+    # Solução corrente da busca local com todos os acumulados mantidos incrementalmente
+    def __init__(self, instance: Instance, assignment: np.ndarray):
+        self.profits = np.asarray(instance.profits, dtype=np.float64)
+        self.weights = np.asarray(instance.capacityReductions, dtype=np.int64)
+        tasks = np.arange(instance.nb_tasks)
+
+        self.assignment = assignment.copy()
+        self.current_profit = self.profits[self.assignment, tasks]   # c_{a(j) j}
+        self.current_weight = self.weights[self.assignment, tasks]   # a_{a(j) j}
+        self.slack = np.array(instance.totalCaps, dtype=np.int64) - np.bincount(self.assignment, self.current_weight, instance.nb_agents).astype(np.int64)
+        self.objective = float(self.current_profit.sum())
+
+    def move(self, j: int, k: int):
+        i = self.assignment[j]
+        self.slack[i] += self.current_weight[j]
+        self.slack[k] -= self.weights[k, j]
+        self.objective += self.profits[k, j] - self.current_profit[j]
+        self.assignment[j] = k
+        self.current_profit[j] = self.profits[k, j]
+        self.current_weight[j] = self.weights[k, j]
+
+    def is_feasible(self) -> bool:
+        return bool((self.slack >= 0).all())
+
+
+def shift_pass(state: SearchState, penalty: float) -> bool:
+    # shift: tarefa j vai para o agente k de maior ganho, descontando penalty * variação da sobrecarga
+    # (com a solução viável e sem criar sobrecarga, é o shift comum por lucro)
+    improved = False
+    overload = np.maximum(0, -state.slack)
+    for j in range(state.assignment.size):
+        i = state.assignment[j]
+        overload_i = max(0, -(state.slack[i] + state.current_weight[j])) - overload[i]
+        overload_k = np.maximum(0, state.weights[:, j] - state.slack) - overload
+        score = state.profits[:, j] - state.current_profit[j] - penalty * (overload_i + overload_k)
+        score[i] = -np.inf
+        k = int(score.argmax())
+        if score[k] > 1e-9:
+            state.move(j, k)
+            overload[i] = max(0, -state.slack[i])
+            overload[k] = max(0, -state.slack[k])
+            improved = True
+    return improved
+
+
+def swap_pass(state: SearchState, penalty: float, deadline: float) -> bool:
+    # swap: j1 (agente i) <-> j2 (agente k), avaliando todos os j2 de uma vez com a mesma penalidade
+    # de sobrecarga do shift (entre soluções viáveis, só aceita trocas que continuam viáveis)
+    improved = False
+    assignment, profits, weights = state.assignment, state.profits, state.weights
+    for j1 in range(assignment.size):
+        if time.perf_counter() >= deadline:
+            break
+        i = assignment[j1]
+        overload = np.maximum(0, -state.slack)
+        new_slack_i = state.slack[i] + state.current_weight[j1] - weights[i, :]
+        new_slack_k = state.slack[assignment] + state.current_weight - weights[assignment, j1]
+        overload_delta = (np.maximum(0, -new_slack_i) - overload[i]) + (np.maximum(0, -new_slack_k) - overload[assignment])
+
+        delta = profits[assignment, j1] + profits[i, :] - state.current_profit[j1] - state.current_profit
+        score = delta - penalty * overload_delta
+        score[assignment == i] = -np.inf
+        j2 = int(score.argmax())
+        if score[j2] > 1e-9:
+            k = assignment[j2]
+            state.move(j1, k)
+            state.move(j2, i)
+            improved = True
+    return improved
+
+
+def local_search(instance: Instance, assignment: np.ndarray, time_limit: float = HEURISTIC_TIME_LIMIT) -> Optional[Tuple[np.ndarray, float]]:
+    # Oscilação estratégica: a penalidade sobe até a solução ficar viável; cada ótimo local viável
+    # (shift + swap) é comparado com o melhor e a penalidade é relaxada para explorar a vizinhança.
+    deadline = time.perf_counter() + time_limit
+    state = SearchState(instance, assignment)
+    penalty = initial_penalty(instance)
+    best: Optional[Tuple[np.ndarray, float]] = None
+    without_improvement = 0
+
+    while time.perf_counter() < deadline and without_improvement < MAX_CYCLES_WITHOUT_IMPROVEMENT:
+        if shift_pass(state, penalty) or swap_pass(state, penalty, deadline):
+            continue
+        if not state.is_feasible():
+            penalty *= OSCILLATION_FACTOR
+            continue
+
+        if best is None or state.objective > best[1]:
+            best = (state.assignment.copy(), state.objective)
+            without_improvement = 0
+        else:
+            without_improvement += 1
+        penalty /= OSCILLATION_FACTOR
+
+    return best
+
+
+def price_adjusted_profits(instance: Instance) -> np.ndarray:
+    # c_ij - w_i a_ij: lucro menos o recurso pelo preço (dual) da capacidade do agente no LP
+    capacity_duals = solve_linear_relaxation(instance).capacity_duals
+    return np.asarray(instance.profits, dtype=np.float64) - capacity_duals[:, None] * np.asarray(instance.capacityReductions, dtype=np.float64)
+
+
+def solve_heuristic(instance: Instance, time_limit: float = HEURISTIC_TIME_LIMIT) -> Optional[HeuristicSolution]:
+    start = time.perf_counter()
+
+    # gulosa pelo lucro descontado; o que não couber vira sobrecarga e é consertado pela busca local penalizada
+    assignment = regret_greedy(instance, price_adjusted_profits(instance))
+    best = local_search(instance, assignment, time_limit)
+    if best is None:
+        return None  # não chegou a uma solução viável dentro do tempo
+
+    return HeuristicSolution(best[0], best[1], time.perf_counter() - start)
+
+
+def assignment_to_x(assignment: np.ndarray, nb_agents: int) -> np.ndarray:
+    x = np.zeros((nb_agents, assignment.size))
+    x[assignment, np.arange(assignment.size)] = 1.0
+    return x
@@ -0,0 +1,38 @@
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from instance_loader import Instance
+
+# As variáveis x_{ij} são achatadas em ordem de linha (agente a agente): coluna k = i * nb_tasks + j.
+# Com `columns` as matrizes só têm as colunas desses pares (na ordem dada), sem montar as m*n colunas.
+
+
+def assignment_matrix(instance: Instance, columns: Optional[np.ndarray] = None) -> sp.csr_matrix:
+    # (n x m*n): linha j soma x_{ij} de todos os agentes i
+    nb_agents, nb_tasks = instance.nb_agents, instance.nb_tasks
+    if columns is not None:
+        return sp.csr_matrix((np.ones(columns.size), (columns % nb_tasks, np.arange(columns.size))), shape=(nb_tasks, columns.size))
+    indices = (np.arange(nb_agents) * nb_tasks)[None, :] + np.arange(nb_tasks)[:, None]
+    indptr = np.arange(0, nb_agents * nb_tasks + 1, nb_agents)
+    data = np.ones(nb_agents * nb_tasks)
+    return sp.csr_matrix((data, indices.ravel(), indptr), shape=(nb_tasks, nb_agents * nb_tasks))
+
+
+def capacity_matrix(instance: Instance, columns: Optional[np.ndarray] = None) -> sp.csr_matrix:
+    # (m x m*n): linha i é a_{i*} nas colunas do agente i
+    nb_agents, nb_tasks = instance.nb_agents, instance.nb_tasks
+    data = np.asarray(instance.capacityReductions, dtype=np.float64).ravel()
+    if columns is not None:
+        return sp.csr_matrix((data[columns], (columns // nb_tasks, np.arange(columns.size))), shape=(nb_agents, columns.size))
+    indices = np.arange(nb_agents * nb_tasks)
+    indptr = np.arange(0, nb_agents * nb_tasks + 1, nb_tasks)
+    return sp.csr_matrix((data, indices, indptr), shape=(nb_agents, nb_agents * nb_tasks))
+
+
+def active_columns(instance: Instance, active: Optional[np.ndarray] = None) -> np.ndarray:
+    # colunas (ordem achatada acima) das variáveis que entram no modelo; todas sem redução (reduction.py)
+    if active is None:
+        return np.arange(instance.nb_agents * instance.nb_tasks)
+    return np.flatnonzero(np.asarray(active, dtype=bool).ravel())
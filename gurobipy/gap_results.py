@@ -0,0 +1,145 @@
+import csv
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from instance_loader import Instance
+from trajectory import Trajectory, TrajectoryRecorder, primal_integral, time_to_first_incumbent, time_to_gap
+
+# Resultado de uma execução e o CSV de resultados, comuns a todos os backends (solver_backends.py). A
+# fonte dos resultados é o banco (results_store.py); os CSVs são exportados dele.
+
+### CONSTANTES ###
+
+RESULTS_SCHEMA = 6  # muda junto com RESULT_COLUMNS (1: as 8 colunas originais; 2: limitante_lagrangiano antes do gap;
+                    # 3: com vars_removidas e nnz_removidos da redução; 4: sem elas; 5: de volta, no fim;
+                    # 6: tempo_heuristica)
+# colunas novas só entram no fim: as 8 primeiras são as dos CSVs originais
+RESULT_COLUMNS = ('data_atual', 'caso_teste', 'tempo_total', 'conclusao', 'melhor_resultado', 'num_nos_explorados',
+                  'limitante_dual', 'gap(%)', 'tempo_construcao', 'limitante_lagrangiano', 'tempo_primeira_solucao',
+                  'integral_primal', 'tempo_gap_1pct', 'solver', 'vars_removidas', 'nnz_removidos', 'tempo_heuristica')
+HEADER_START = 'data_atual,'
+PRESET_MARKER = 'Preset usado: '
+SCHEMA_MARKER = 'Esquema: '
+
+# coluna do CSV -> (campo do InstanceResult, escala, formato); o gap vai em % no CSV
+COLUMN_FIELDS = {
+    'tempo_total': ('exec_time', 1, '.3f'),
+    'conclusao': ('status', 1, 's'),
+    'melhor_resultado': ('best_result', 1, '.3f'),
+    'num_nos_explorados': ('nb_explored_nodes', 1, '.0f'),
+    'limitante_dual': ('best_expected', 1, '.3f'),
+    'gap(%)': ('gap', 100, '.3f'),
+    'tempo_construcao': ('build_time', 1, '.3f'),
+    'limitante_lagrangiano': ('lagrangian_bound', 1, '.3f'),
+    'tempo_primeira_solucao': ('time_to_first_incumbent', 1, '.3f'),
+    'integral_primal': ('primal_integral', 1, '.3f'),
+    'tempo_gap_1pct': ('time_to_target_gap', 1, '.3f'),
+    'solver': ('solver', 1, 's'),
+    'vars_removidas': ('removed_variables', 1, '.0f'),
+    'nnz_removidos': ('removed_nonzeros', 1, '.0f'),
+    'tempo_heuristica': ('heuristic_time', 1, '.3f'),
+}
+
+### CLASSES E TIPOS ###
+
+# case_name, exec_time, sol_text, best_result, nb_explored_nodes, best_expected, gap
+@dataclass
+class InstanceResult:
+    instance: Instance
+    exec_time: float
+    build_time: float
+    status: str  # texto da conclusão, no mesmo vocabulário para todos os backends
+    best_result: float  # nan sem solução
+    nb_explored_nodes: float  # nan quando o backend não informa
+    best_expected: float
+    gap: float
+    lagrangian_bound: Optional[float] = None  # limitante da relaxação lagrangiana (lagrangian.py)
+    time_to_first_incumbent: Optional[float] = None  # segundos (inclui o tempo da heurística quando há MIP start)
+    primal_integral: Optional[float] = None
+    time_to_target_gap: Optional[float] = None  # segundos até o gap do solver chegar a 1% (trajectory.TARGET_GAP)
+    trajectory: Optional[Trajectory] = None  # amostras do callback, gravadas pelo processo principal
+    stop_reason: Optional[str] = None  # motivo da parada antecipada (termination.py), se houve
+    solver: str = ''  # backend e versão (ex.: gurobi-13.0.3)
+    removed_variables: Optional[int] = None  # redução do problema (reduction.py), quando usada
+    removed_nonzeros: Optional[int] = None
+    heuristic_time: Optional[float] = None  # segundos antes do solver (heurística do MIP start), já somados à trajetória
+
+### FUNÇÕES ###
+
+def finish_instance_result(result: InstanceResult, recorder: TrajectoryRecorder, iterations: float) -> InstanceResult:
+    # última amostra com o estado final (a trajetória sempre termina onde o solver parou)
+    recorder.sample(result.exec_time, result.best_result, result.best_expected, result.nb_explored_nodes, iterations)
+    result.trajectory = recorder.to_columns()
+    result.heuristic_time = recorder.time_offset
+    result.time_to_target_gap = time_to_gap(result.trajectory)
+
+    # integral primal com o limitante dual final como referência (o ótimo nem sempre é conhecido)
+    result.time_to_first_incumbent = time_to_first_incumbent(recorder.incumbents)
+    result.primal_integral = primal_integral(recorder.incumbents, result.best_expected, recorder.time_offset + result.exec_time)
+    return result
+
+
+def format_results_row(date: str, case_name: str, values: Dict[str, object]) -> List[str]:
+    # valores: campos do InstanceResult (como no banco, results_store.py) -> linha nas colunas de RESULT_COLUMNS
+    cells = {'data_atual': date, 'caso_teste': case_name}
+    for column, (field, scale, fmt) in COLUMN_FIELDS.items():
+        value = values.get(field)
+        if value is None:
+            cells[column] = ''
+        elif isinstance(value, str):
+            cells[column] = value
+        else:
+            cells[column] = format(value * scale, fmt)
+    return [cells[column] for column in RESULT_COLUMNS]
+
+
+def parse_results_row(row: Dict[Optional[str], object]) -> Dict[str, object]:
+    # inverso de format_results_row para uma linha de read_results_file (coluna vazia ou ausente -> None)
+    values: Dict[str, object] = dict()
+    for column, (field, scale, fmt) in COLUMN_FIELDS.items():
+        text = row.get(column) or ''
+        if fmt == 's':
+            values[field] = text
+        else:
+            values[field] = float(text) / scale if text else None
+    return values
+
+
+def write_results_file(preset_name: str, rows: Iterable[List[str]], output_file_name: str):
+    # os CSVs são gerados a partir do banco de resultados e reescritos inteiros (um bloco só)
+    os.makedirs(os.path.dirname(output_file_name) or '.', exist_ok=True)
+    with open(output_file_name, 'w', newline='') as output_file:
+        output_file.write(PRESET_MARKER + preset_name + '\n')
+        output_file.write(f'{SCHEMA_MARKER}{RESULTS_SCHEMA}\n')
+        writer = csv.writer(output_file, lineterminator='\n')
+        writer.writerow(RESULT_COLUMNS)
+        writer.writerows(rows)
+
+
+def read_results_file(output_file_name: str) -> List[Dict[Optional[str], object]]:
+    # Linhas de um CSV de resultados. O arquivo pode ter vários blocos (execuções antigas do script
+    # repetiam "Preset usado" e o cabeçalho; mudanças de esquema começam um bloco novo): cada linha é
+    # lida com o último cabeçalho acima dela.
+    rows: List[Dict[Optional[str], object]] = []
+    header: Optional[List[str]] = None
+    with open(output_file_name) as output_file:
+        for line in output_file:
+            if line.startswith(PRESET_MARKER) or line.startswith(SCHEMA_MARKER) or not line.strip():
+                continue
+            values = next(csv.reader([line]))
+            if line.startswith(HEADER_START):
+                header = values
+            elif header is not None:
+                # como no csv.DictReader: valores a mais ficam na chave None, colunas que faltam não aparecem
+                row: Dict[Optional[str], object] = dict(zip(header, values))
+                if len(values) > len(header):
+                    row[None] = values[len(header):]
+                rows.append(row)
+    return rows
+
+
+def results_preset_name(output_file_name: str) -> Optional[str]:
+    with open(output_file_name) as output_file:
+        first_line = output_file.readline().strip()
+    return first_line[len(PRESET_MARKER):] if first_line.startswith(PRESET_MARKER) else None
@@ -0,0 +1,78 @@
+import dataclasses
+import math
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from instance_loader import Instance
+
+# Características baratas de uma instância (só operações vetoriais sobre as matrizes m x n, alguns
+# milissegundos mesmo em 200x10000), usadas pelo seletor de presets (preset_selector.py). Todas são
+# adimensionais ou contagens: instâncias da mesma classe com tamanhos diferentes ficam próximas.
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class InstanceFeatures:
+    nb_agents: int
+    nb_tasks: int
+    tasks_per_agent: float
+    capacity_tightness: float  # Σ_j média_i a_ij / Σ_i cap_i (> 1: nem a média cabe)
+    min_tightness: float  # Σ_j min_i a_ij / Σ_i cap_i (limite inferior do uso da capacidade)
+    profit_weight_correlation: float  # Pearson entre lucro e recurso de todos os pares (D: fortemente positiva)
+    profit_cv: float  # coeficiente de variação dos lucros
+    weight_cv: float  # coeficiente de variação dos recursos
+    capacity_cv: float
+    mean_regret: float  # diferença média entre o melhor e o segundo melhor lucro de cada tarefa, relativa ao lucro médio
+    infeasible_pairs: float  # fração dos pares com a_ij > cap_i
+
+    def as_vector(self) -> np.ndarray:
+        # tamanhos em escala log (o seletor compara distâncias entre instâncias)
+        values = dataclasses.astuple(self)
+        return np.array([math.log(value) if name in LOG_FEATURES else value
+                         for name, value in zip(FEATURE_NAMES, values)], dtype=np.float64)
+
+
+FEATURE_NAMES: Tuple[str, ...] = tuple(field.name for field in dataclasses.fields(InstanceFeatures))
+LOG_FEATURES = ('nb_agents', 'nb_tasks', 'tasks_per_agent')
+
+### FUNÇÕES ###
+
+def coefficient_of_variation(values: np.ndarray) -> float:
+    mean = float(np.abs(values).mean())
+    return float(values.std() / mean) if mean > 0 else 0.0
+
+
+def extract_features(instance: Instance) -> InstanceFeatures:
+    profits = np.asarray(instance.profits, dtype=np.float64)
+    weights = np.asarray(instance.capacityReductions, dtype=np.float64)
+    capacities = np.asarray(instance.totalCaps, dtype=np.float64)
+    total_capacity = capacities.sum()
+
+    if profits.std() > 0 and weights.std() > 0:
+        correlation = float(np.corrcoef(profits.ravel(), weights.ravel())[0, 1])
+    else:
+        correlation = 0.0
+
+    # dois maiores lucros de cada tarefa (com um agente só não há arrependimento)
+    if instance.nb_agents > 1:
+        top_two = np.partition(profits, instance.nb_agents - 2, axis=0)[-2:]
+        regret = float((top_two[1] - top_two[0]).mean())
+    else:
+        regret = 0.0
+    mean_profit = float(np.abs(profits).mean())
+
+    return InstanceFeatures(
+        nb_agents=instance.nb_agents,
+        nb_tasks=instance.nb_tasks,
+        tasks_per_agent=instance.nb_tasks / instance.nb_agents,
+        capacity_tightness=float(weights.mean(axis=0).sum() / total_capacity),
+        min_tightness=float(weights.min(axis=0).sum() / total_capacity),
+        profit_weight_correlation=correlation,
+        profit_cv=coefficient_of_variation(profits),
+        weight_cv=coefficient_of_variation(weights),
+        capacity_cv=coefficient_of_variation(capacities),
+        mean_regret=regret / mean_profit if mean_profit > 0 else 0.0,
+        infeasible_pairs=float((weights > capacities[:, None]).mean())
+    )
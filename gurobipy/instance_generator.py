@@ -0,0 +1,89 @@
+import argparse
+import os
+from typing import Optional
+
+import numpy as np
+
+from instance_loader import Instance, TOKEN_DTYPE
+
+# Gerador das classes clássicas do GAP (Chu & Beasley; Laguna et al. para a E), no formato .in do
+# read_instance. Os arquivos são de minimização (custo c_ij); como nas instâncias do zip, o .in traz os
+# lucros -c_ij. Com a mesma (classe, m, n, semente) o arquivo gerado é sempre o mesmo.
+#   C: a_ij ~ U[5, 25], c_ij ~ U[10, 50]
+#   D: a_ij ~ U[1, 100], c_ij = 111 - a_ij + U[-10, 10]
+#   E: a_ij = 1 - 10 ln U(0, 1], c_ij = 1000 / a_ij - 10 U[0, 1)  (truncados para inteiros)
+# Capacidade: cap_i = 0.8 Σ_j a_ij / m (na E, pelo menos max_j a_ij), sem casas decimais.
+# Conferido com d60900, d801600 e e60900 do zip: mesmas faixas, mesmas relações e mesmas capacidades.
+
+### CONSTANTES ###
+
+KINDS = ('C', 'D', 'E')
+CAPACITY_RATIO = 0.8
+GENERATED_DIR = 'instances/geradas'
+
+### FUNÇÕES ###
+
+def instance_name(kind: str, nb_agents: int, nb_tasks: int, seed: int = 0) -> str:
+    # com separadores (d20x1600_s0): sem eles, (20, 1600) e (201, 600) davam o mesmo nome e o mesmo .npy
+    # do cache; também não colide com as instâncias do zip (d801600)
+    return f'{kind.lower()}{nb_agents}x{nb_tasks}_s{seed}'
+
+
+def generate_instance(kind: str, nb_agents: int, nb_tasks: int, seed: int = 0) -> Instance:
+    kind = kind.upper()
+    if kind not in KINDS:
+        raise ValueError(f'Classe desconhecida: {kind} (opções: {", ".join(KINDS)})')
+    # a semente inclui classe e tamanho: cada instância da grade é independente das outras
+    rng = np.random.default_rng([seed, nb_agents, nb_tasks, KINDS.index(kind)])
+    shape = (nb_agents, nb_tasks)
+
+    if kind == 'C':
+        weights = rng.integers(5, 26, shape)
+        costs = rng.integers(10, 51, shape)
+    elif kind == 'D':
+        weights = rng.integers(1, 101, shape)
+        costs = 111 - weights + rng.integers(-10, 11, shape)
+    else:
+        weights = (1 - 10 * np.log(1 - rng.random(shape))).astype(TOKEN_DTYPE)
+        costs = np.maximum(1000 / weights - 10 * rng.random(shape), 0).astype(TOKEN_DTYPE)
+
+    capacities = np.floor(CAPACITY_RATIO * weights.sum(axis=1) / nb_agents).astype(TOKEN_DTYPE)
+    if kind == 'E':
+        capacities = np.maximum(capacities, weights.max(axis=1))
+
+    return Instance(instance_name(kind, nb_agents, nb_tasks, seed), nb_agents, nb_tasks,
+                    -costs.astype(TOKEN_DTYPE), weights.astype(TOKEN_DTYPE), capacities)
+
+
+def write_instance(instance: Instance, filename: str):
+    # m n, depois uma linha por agente com os lucros, uma por agente com os recursos e as capacidades
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp_file = f'{filename}.{os.getpid()}.tmp'
+    with open(tmp_file, 'w') as output_file:
+        output_file.write(f'{instance.nb_agents} {instance.nb_tasks}\n')
+        for block in (instance.profits, instance.capacityReductions, instance.totalCaps[None, :]):
+            np.savetxt(output_file, block, fmt='%d')
+    os.replace(tmp_file, filename)
+
+
+def generated_file(kind: str, nb_agents: int, nb_tasks: int, seed: int = 0, output_dir: str = GENERATED_DIR) -> str:
+    # gera o arquivo só se ainda não existir (o conteúdo só depende dos parâmetros)
+    filename = os.path.join(output_dir, instance_name(kind, nb_agents, nb_tasks, seed) + '.in')
+    if not os.path.exists(filename):
+        write_instance(generate_instance(kind, nb_agents, nb_tasks, seed), filename)
+    return filename
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description='Gera instâncias do GAP (classes C, D e E) no formato .in')
+    parser.add_argument('--kind', choices=KINDS, type=str.upper, default='D')
+    parser.add_argument('--agents', type=int, required=True)
+    parser.add_argument('--tasks', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output-dir', default=GENERATED_DIR)
+    args = parser.parse_args(argv)
+    print(generated_file(args.kind, args.agents, args.tasks, args.seed, args.output_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+### CONSTANTES ###
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INSTANCES_ZIP = os.path.join(BASE_DIR, 'instancias-parte2.zip')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')  # arquivos .npy ao lado de instancias-parte2.zip
+
+TOKEN_DTYPE = np.int64
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class Instance:
+    name: str
+    nb_agents: int
+    nb_tasks: int
+    profits: np.ndarray             # (nb_agents, nb_tasks)
+    capacityReductions: np.ndarray  # (nb_agents, nb_tasks)
+    totalCaps: np.ndarray           # (nb_agents,)
+
+### FUNÇÕES ###
+
+# O arquivo .in é apenas uma sequência de inteiros:
+#   m n | m*n lucros | m*n recursos consumidos | m capacidades
+# então guardamos essa sequência inteira em um único vetor e as matrizes são views dele.
+def parse_tokens(content: bytes) -> np.ndarray:
+    tokens = np.fromstring(content, dtype=TOKEN_DTYPE, sep=' ')
+    if tokens.size < 2:
+        raise ValueError('Instância vazia ou malformada')
+
+    nb_agents, nb_tasks = int(tokens[0]), int(tokens[1])
+    expected = 2 + 2 * nb_agents * nb_tasks + nb_agents
+    if tokens.size < expected:
+        raise ValueError(f'Instância malformada: esperados {expected} inteiros, encontrados {tokens.size}')
+    return tokens[:expected]
+
+
+def instance_from_tokens(name: str, tokens: np.ndarray) -> Instance:
+    nb_agents, nb_tasks = int(tokens[0]), int(tokens[1])
+    block = nb_agents * nb_tasks
+
+    profits = tokens[2:2 + block].reshape(nb_agents, nb_tasks)
+    capacityReductions = tokens[2 + block:2 + 2 * block].reshape(nb_agents, nb_tasks)
+    totalCaps = tokens[2 + 2 * block:2 + 2 * block + nb_agents]
+
+    return Instance(name, nb_agents, nb_tasks, profits, capacityReductions, totalCaps)
+
+
+def instance_hash(instance: Instance) -> str:
+    # hash do conteúdo (dimensões + matrizes + capacidades), independente do nome/caminho do arquivo
+    digest = hashlib.sha1()
+    digest.update(np.array([instance.nb_agents, instance.nb_tasks], dtype=TOKEN_DTYPE).tobytes())
+    for block in (instance.profits, instance.capacityReductions, instance.totalCaps):
+        digest.update(np.ascontiguousarray(block, dtype=TOKEN_DTYPE).tobytes())
+    return digest.hexdigest()
+
+
+def _read_source(filename: str, zip_path: str) -> bytes:
+    if os.path.exists(filename):
+        with open(filename, 'rb') as input_reader:
+            return input_reader.read()
+
+    # arquivo ainda não foi extraído (make instances): lê direto do zip
+    with zipfile.ZipFile(zip_path) as instances_zip:
+        return instances_zip.read(os.path.basename(filename))
+
+
+def _source_mtime(filename: str, zip_path: str) -> float:
+    if os.path.exists(filename):
+        return os.path.getmtime(filename)
+    return os.path.getmtime(zip_path)
+
+
+def cache_path_for(filename: str, cache_dir: str = CACHE_DIR) -> str:
+    base_name = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(cache_dir, base_name + '.npy')
+
+
+def read_instance(filename: str, cache_dir: Optional[str] = CACHE_DIR, zip_path: str = INSTANCES_ZIP) -> Instance:
+    if cache_dir is None:
+        return instance_from_tokens(filename, parse_tokens(_read_source(filename, zip_path)))
+
+    cache_file = cache_path_for(filename, cache_dir)
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= _source_mtime(filename, zip_path):
+        # memmap somente leitura: as matrizes do Instance apontam direto para o arquivo
+        return instance_from_tokens(filename, np.load(cache_file, mmap_mode='r'))
+
+    tokens = parse_tokens(_read_source(filename, zip_path))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'wb') as cache_writer:
+        np.save(cache_writer, tokens)
+    os.replace(tmp_file, cache_file)  # escrita atômica (vários processos podem carregar a mesma instância)
+
+    return instance_from_tokens(filename, tokens)
@@ -0,0 +1,184 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.optimize import linprog
+
+from gap_matrices import active_columns, assignment_matrix, capacity_matrix
+from instance_loader import Instance
+
+# Relaxação lagrangiana das restrições de atribuição (Σ_i x_{ij} = 1) com multiplicadores u_j livres:
+#   L(u) = Σ_j u_j + Σ_i max { Σ_j (c_{ij} - u_j) x_{ij} : Σ_j a_{ij} x_{ij} <= cap_i, x_{ij} E {0,1} }
+# O problema relaxado separa em uma mochila 0/1 por agente e L(u) >= ótimo para qualquer u,
+# então o menor L(u) encontrado pelo subgradiente é um limitante dual válido.
+
+### CONSTANTES ###
+
+MAX_ITERATIONS = 1000
+TIME_LIMIT = 5.0  # segundos no laço do subgradiente (sem contar o LP inicial)
+STEP_SCALE = 0.5  # fator inicial do passo de Polyak (reduzido à metade quando o limitante estagna)
+MIN_STEP_SCALE = 1e-4
+PATIENCE = 10  # iterações sem melhora antes de reduzir o passo
+TARGET_GAP = 0.005  # sem solução viável conhecida, mira 0.5% abaixo do melhor limitante
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class LagrangianResult:
+    bound: float                # limitante dual (inteiro, já que os lucros são inteiros)
+    multipliers: np.ndarray     # u_j que geraram o limitante
+    relaxed_x: np.ndarray       # solução (m x n, bool) das mochilas nesses multiplicadores
+    iterations: int
+    elapsed: float
+
+
+@dataclass
+class LinearRelaxation:
+    bound: float
+    multipliers: np.ndarray     # u_j: duais das restrições de atribuição
+    capacity_duals: np.ndarray  # w_i >= 0: duais das capacidades
+    reduced_costs: np.ndarray   # (m x n) d_ij = c_ij - u_j - a_ij w_i, também para os pares fora do LP
+
+### FUNÇÕES ###
+
+def knapsack_01(values: np.ndarray, weights: np.ndarray, capacity: int) -> Tuple[float, np.ndarray]:
+    # Programação dinâmica sobre a capacidade, vetorizada em numpy (um passo por item).
+    # values > 0 e weights >= 1; devolve o valor ótimo e a máscara dos itens escolhidos.
+    chosen = np.zeros(values.size, dtype=bool)
+    fits = weights <= capacity
+    if not fits.any():
+        return 0.0, chosen
+
+    # atalho: todos os itens lucrativos cabem juntos (caso comum perto dos multiplicadores ótimos)
+    if weights[fits].sum() <= capacity:
+        chosen[fits] = True
+        return float(values[fits].sum()), chosen
+
+    items = np.flatnonzero(fits)
+    capacity = int(min(capacity, weights[items].sum()))
+    best = np.zeros(capacity + 1)
+    take = np.zeros((items.size, capacity + 1), dtype=bool)
+
+    for t, item in enumerate(items):
+        weight = int(weights[item])
+        candidate = best[:capacity + 1 - weight] + values[item]  # temporário: usa best antes da atualização (0/1)
+        np.greater(candidate, best[weight:], out=take[t, weight:])
+        np.maximum(best[weight:], candidate, out=best[weight:])
+
+    remaining = capacity
+    for t in range(items.size - 1, -1, -1):
+        if take[t, remaining]:
+            chosen[items[t]] = True
+            remaining -= int(weights[items[t]])
+
+    return float(best[capacity]), chosen
+
+
+def solve_linear_relaxation(instance: Instance, active: Optional[np.ndarray] = None) -> LinearRelaxation:
+    # Relaxação linear do modelo compacto (HiGHS do scipy) só com as colunas dos pares em `active`.
+    # Com os duais, d_ij > 0 num par de fora quer dizer que ele melhoraria o LP (pricing em candidates.py);
+    # num par do LP, d_ij < 0 em x_ij = 0 e d_ij > 0 em x_ij = 1 (fixação em reduction.py).
+    columns = active_columns(instance, active)
+    profits = np.asarray(instance.profits, dtype=np.float64)
+    result = linprog(-profits.ravel()[columns],
+                     A_ub=capacity_matrix(instance, columns), b_ub=instance.totalCaps,
+                     A_eq=assignment_matrix(instance, columns), b_eq=np.ones(instance.nb_tasks),
+                     bounds=(0, 1), method='highs')
+    if result.status != 0:
+        raise ValueError(f'Relaxação linear sem solução ótima: {result.message}')
+
+    # linprog minimiza -c: troca o sinal do valor e dos duais
+    multipliers = -result.eqlin.marginals
+    capacity_duals = -result.ineqlin.marginals
+    weights = np.asarray(instance.capacityReductions, dtype=np.float64)
+    return LinearRelaxation(
+        bound=-result.fun,
+        multipliers=multipliers,
+        capacity_duals=capacity_duals,
+        reduced_costs=profits - multipliers[None, :] - weights * capacity_duals[:, None],
+    )
+
+
+def lp_multipliers(instance: Instance) -> np.ndarray:
+    # Duais das restrições de atribuição na relaxação linear. Com eles L(u) já começa no limitante do
+    # LP e o subgradiente só precisa andar o pouco que falta.
+    return solve_linear_relaxation(instance).multipliers
+
+
+def lagrangian_subproblem(instance: Instance, profits: np.ndarray, multipliers: np.ndarray) -> Tuple[float, np.ndarray]:
+    reduced = profits - multipliers[None, :]
+    relaxed_x = np.zeros(reduced.shape, dtype=bool)
+    value = float(multipliers.sum())
+
+    for i in range(instance.nb_agents):
+        # só itens com lucro reduzido positivo podem entrar na mochila do agente i
+        candidates = np.flatnonzero(reduced[i] > 0)
+        if candidates.size == 0:
+            continue
+        agent_value, chosen = knapsack_01(reduced[i, candidates], instance.capacityReductions[i, candidates], int(instance.totalCaps[i]))
+        value += agent_value
+        relaxed_x[i, candidates[chosen]] = True
+
+    return value, relaxed_x
+
+
+def solve_lagrangian(instance: Instance,
+                     lower_bound: Optional[float] = None,
+                     initial_multipliers: Optional[np.ndarray] = None,
+                     warm_start_lp: bool = True,
+                     max_iterations: int = MAX_ITERATIONS,
+                     time_limit: float = TIME_LIMIT) -> LagrangianResult:
+    start = time.perf_counter()
+    profits = np.asarray(instance.profits, dtype=np.float64)
+
+    if initial_multipliers is not None:
+        multipliers = np.asarray(initial_multipliers, dtype=np.float64).copy()
+    elif warm_start_lp:
+        multipliers = lp_multipliers(instance)
+    else:
+        # u_j = segundo melhor lucro da tarefa j: no início cada tarefa só é lucrativa para o seu
+        # melhor agente, e as mochilas começam pequenas (~n/m itens por agente)
+        multipliers = np.sort(profits, axis=0)[-2] if instance.nb_agents > 1 else profits[0] - 1
+    loop_start = time.perf_counter()
+    best_value = math.inf
+    best_multipliers = multipliers.copy()
+    best_x = np.zeros(profits.shape, dtype=bool)
+
+    step_scale = STEP_SCALE
+    without_improvement = 0
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        value, relaxed_x = lagrangian_subproblem(instance, profits, multipliers)
+        if value < best_value - 1e-9:
+            best_value, best_multipliers, best_x = value, multipliers.copy(), relaxed_x
+            without_improvement = 0
+        else:
+            without_improvement += 1
+            if without_improvement >= PATIENCE:
+                step_scale /= 2
+                without_improvement = 0
+
+        # subgradiente de L em u: 1 - Σ_i x_{ij}
+        subgradient = 1.0 - relaxed_x.sum(axis=0)
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            break  # x relaxado atende todas as atribuições: é ótimo e L(u) é o ótimo do GAP
+
+        target = lower_bound if lower_bound is not None else best_value - TARGET_GAP * abs(best_value)
+        if lower_bound is not None and best_value - lower_bound < 1 - 1e-6:
+            break  # lucros inteiros: limitante já prova a otimalidade de lower_bound
+
+        multipliers = multipliers - step_scale * (value - target) / norm * subgradient
+
+        if step_scale < MIN_STEP_SCALE or time.perf_counter() - loop_start > time_limit:
+            break
+
+    return LagrangianResult(
+        bound=math.floor(best_value + 1e-6),
+        multipliers=best_multipliers,
+        relaxed_x=best_x,
+        iterations=iteration,
+        elapsed=time.perf_counter() - start,
+    )
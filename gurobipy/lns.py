@@ -0,0 +1,176 @@
+import math
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from gap_results import InstanceResult, finish_instance_result
+from instance_loader import Instance
+from solver_backends import SolverBackend
+from trajectory import TrajectoryRecorder
+
+# Busca em vizinhança grande (LNS) a partir da melhor solução conhecida. Cada vizinhança libera as
+# tarefas de um subconjunto de agentes (sorteado, pela folga ou por tarefas relacionadas) e fixa o resto:
+# o sub-MIP usa o mesmo modelo compacto (setup_instance_model) só com os pares em `active` — nas tarefas
+# fixadas só o par da solução atual, nas liberadas os agentes escolhidos. Os sub-MIPs rodam em paralelo
+# num pool de processos; este processo guarda a incumbente global e cada vizinhança nova parte dela.
+
+### CONSTANTES ###
+
+SUB_TIME_LIMIT = 10.0  # segundos de cada sub-MIP
+MIN_SUB_TIME = 1.0  # não começa sub-MIP com menos tempo que isso até o fim
+INITIAL_SIZE = 4  # agentes liberados por vizinhança (ajustado durante a busca)
+MIN_SIZE = 2
+SEED = 0
+OPTIMAL_GAP = 1e-9  # gap com o limitante dual a partir do qual a incumbente é ótima e a busca para
+
+RANDOM = 'aleatoria'
+SLACK = 'folga'
+RELATED = 'relacionada'
+NEIGHBOURHOODS = (RANDOM, SLACK, RELATED)
+
+### CLASSES E TIPOS ###
+
+# monta o sub-MIP: (instância, pares ativos, limite de tempo) -> backend com os parâmetros do preset
+ModelBuilder = Callable[[Instance, np.ndarray, float], SolverBackend]
+
+@dataclass
+class SubResult:
+    neighbourhood: str
+    assignment: Optional[np.ndarray]
+    value: float
+    optimal: bool  # sub-MIP resolvido até o fim: a vizinhança pode crescer
+    nodes: float
+
+
+@dataclass
+class LnsStats:
+    nb_subproblems: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(NEIGHBOURHOODS, 0))
+    nb_improvements: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(NEIGHBOURHOODS, 0))
+    final_size: int = INITIAL_SIZE
+
+### FUNÇÕES ###
+
+def assignment_value(instance: Instance, assignment: np.ndarray) -> float:
+    return float(np.asarray(instance.profits)[assignment, np.arange(assignment.size)].sum())
+
+
+def choose_agents(instance: Instance, assignment: np.ndarray, neighbourhood: str, size: int, rng: random.Random) -> np.ndarray:
+    nb_agents = instance.nb_agents
+    size = min(size, nb_agents)
+    if neighbourhood == SLACK:
+        # metade entre os agentes com folga (recebem tarefas), sorteados com peso proporcional a ela;
+        # a outra metade ao acaso (cedem tarefas)
+        load = np.bincount(assignment, weights=np.asarray(instance.capacityReductions)[assignment, np.arange(assignment.size)], minlength=nb_agents)
+        slack = np.maximum(np.asarray(instance.totalCaps, dtype=np.float64) - load, 0) + 1
+        weights = (slack / slack.sum()).tolist()
+        receivers = set()
+        while len(receivers) < (size + 1) // 2:
+            receivers.add(rng.choices(range(nb_agents), weights)[0])
+        others = [agent for agent in range(nb_agents) if agent not in receivers]
+        return np.array(sorted(receivers | set(rng.sample(others, size - len(receivers)))))
+    if neighbourhood == RELATED:
+        # agente de uma tarefa sorteada e os agentes mais bem classificados (lucro) nas tarefas dele
+        seed_agent = int(assignment[rng.randrange(assignment.size)])
+        tasks = np.flatnonzero(assignment == seed_agent)
+        profit_rank = np.argsort(np.argsort(-np.asarray(instance.profits)[:, tasks], axis=0), axis=0)
+        score = profit_rank.mean(axis=1)
+        score[seed_agent] = -math.inf
+        return np.sort(np.argsort(score, kind='stable')[:size])
+    return np.array(sorted(rng.sample(range(nb_agents), size)))
+
+
+def neighbourhood_mask(instance: Instance, assignment: np.ndarray, agents: np.ndarray) -> np.ndarray:
+    # (m x n) pares do sub-MIP: as tarefas dos agentes liberados podem ir para qualquer um deles
+    tasks = np.arange(assignment.size)
+    active = np.zeros((instance.nb_agents, instance.nb_tasks), dtype=bool)
+    active[assignment, tasks] = True
+    free_tasks = tasks[np.isin(assignment, agents)]
+    active[np.ix_(agents, free_tasks)] = True
+    return active
+
+
+_worker_instance: Optional[Instance] = None
+_worker_builder: Optional[ModelBuilder] = None
+
+def _init_worker(instance: Instance, builder: ModelBuilder):
+    global _worker_instance, _worker_builder
+    _worker_instance, _worker_builder = instance, builder
+
+
+def solve_neighbourhood(neighbourhood: str, assignment: np.ndarray, agents: np.ndarray, time_limit: float) -> SubResult:
+    instance = _worker_instance
+    backend = _worker_builder(instance, neighbourhood_mask(instance, assignment, agents), time_limit)
+    try:
+        backend.set_start(assignment)
+        result = backend.solve()
+        best = backend.best_assignment()
+    finally:
+        backend.dispose()
+    value = -math.inf if best is None else assignment_value(instance, best)
+    return SubResult(neighbourhood, best, value, result.status == 'optimal solution', result.nb_explored_nodes)
+
+
+def lns_gap(dual_bound: float, best_value: float) -> float:
+    return abs(dual_bound - best_value) / abs(best_value) if not math.isnan(dual_bound) and best_value != 0 else math.inf
+
+
+def run_lns(instance: Instance, builder: ModelBuilder, assignment: np.ndarray, time_limit: float, nb_workers: int,
+            dual_bound: float = math.nan, time_offset: float = 0.0, seed: int = SEED) -> Tuple[InstanceResult, LnsStats]:
+    # time_offset: tempo gasto antes (heurística que gerou `assignment`), somado à linha do tempo
+    rng = random.Random(seed)
+    stats = LnsStats()
+    recorder = TrajectoryRecorder(time_offset)
+    best_assignment, best_value = assignment.copy(), assignment_value(instance, assignment)
+    recorder.new_incumbent(0.0, best_value, dual_bound, 0)
+    size, nodes = INITIAL_SIZE, 0.0
+
+    start = time.perf_counter()
+    deadline = start + time_limit
+    optimal = lns_gap(dual_bound, best_value) <= OPTIMAL_GAP
+    with ProcessPoolExecutor(max_workers=nb_workers, initializer=_init_worker, initargs=(instance, builder)) as pool:
+        def submit():
+            neighbourhood = NEIGHBOURHOODS[sum(stats.nb_subproblems.values()) % len(NEIGHBOURHOODS)]
+            stats.nb_subproblems[neighbourhood] += 1
+            agents = choose_agents(instance, best_assignment, neighbourhood, size, rng)
+            sub_time = max(MIN_SUB_TIME, min(SUB_TIME_LIMIT, deadline - time.perf_counter()))
+            return pool.submit(solve_neighbourhood, neighbourhood, best_assignment, agents, sub_time)
+
+        pending = set() if optimal else {submit() for _ in range(nb_workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sub = future.result()
+                nodes += 0 if math.isnan(sub.nodes) else sub.nodes
+                if sub.value > best_value + 1e-6:
+                    best_assignment, best_value = sub.assignment, sub.value
+                    stats.nb_improvements[sub.neighbourhood] += 1
+                    recorder.new_incumbent(time.perf_counter() - start, best_value, dual_bound, nodes)
+                    optimal = lns_gap(dual_bound, best_value) <= OPTIMAL_GAP
+                # vizinhança resolvida até o fim cresce; sub-MIP que estourou o tempo diminui
+                size = min(size + 1, instance.nb_agents) if sub.optimal else max(size - 1, MIN_SIZE)
+                if not optimal and deadline - time.perf_counter() >= MIN_SUB_TIME:
+                    pending.add(submit())
+            if optimal:
+                # incumbente igual ao limitante: os sub-MIPs em andamento não têm o que melhorar
+                for future in pending:
+                    future.cancel()
+                break
+        exec_time = time.perf_counter() - start
+    stats.final_size = size
+
+    result = InstanceResult(
+        instance=instance,
+        exec_time=exec_time,
+        build_time=0.0,
+        status='optimal solution' if optimal else 'time limit reached',
+        best_result=best_value,
+        nb_explored_nodes=nodes,
+        best_expected=dual_bound,
+        gap=lns_gap(dual_bound, best_value)
+    )
+    result.lagrangian_bound = None if math.isnan(dual_bound) else dual_bound
+    return finish_instance_result(result, recorder, math.nan), stats
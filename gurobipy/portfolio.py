@@ -0,0 +1,161 @@
+import dataclasses
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gap_results import InstanceResult
+from instance_loader import Instance
+from solver_backends import SolverBackend
+from termination import TerminationMonitor, TerminationPolicy
+from trajectory import NO_VALUE, TrajectoryRecorder
+
+# Corrida de presets (portfólio): N presets resolvem a mesma instância ao mesmo tempo, um processo com
+# 1 thread cada. A melhor solução fica em memória compartilhada: cada solver publica as suas e recebe as
+# dos outros como incumbente (poda igual a um cutoff). A corrida acaba quando alguma execução prova a
+# otimalidade (limitante < melhor solução + 1, lucros inteiros) ou chega ao gap alvo; as outras param
+# pelo callback. Só gurobi e HiGHS trocam soluções e param no meio; o CBC roda até o seu limite.
+
+### CONSTANTES ###
+
+BOUND_TOLERANCE = 1e-6
+RACE_LOST = 'race won by another preset'
+
+### CLASSES E TIPOS ###
+
+# monta e configura o modelo de um preset (chamado dentro do processo da corrida)
+PresetBuilder = Callable[[], SolverBackend]
+
+@dataclasses.dataclass
+class RaceResult:
+    result: InstanceResult     # melhor solução e limitante da corrida (trajetória da execução com a melhor solução)
+    winner: Optional[str]      # preset que provou a otimalidade ou chegou ao gap alvo (None: todas no limite de tempo)
+    runs: Dict[str, InstanceResult]
+
+
+class RaceMonitor(TerminationMonitor):
+    # política do preset + fim da corrida; a melhor solução compartilhada fica nos globais do processo
+    shares_incumbent = True
+
+    def __init__(self, policy: TerminationPolicy, index: int):
+        super().__init__(policy)
+        self.index = index
+        self.injected = -math.inf  # última solução de fora entregue ao solver
+
+    def publish(self, value: float, assignment: np.ndarray):
+        with _race_best.get_lock():
+            if value > _race_best.value:
+                _race_assignment[:] = assignment
+                _race_best.value = value
+
+    def incoming(self, incumbent: float) -> Optional[np.ndarray]:
+        best = _race_best.value
+        if best <= max(incumbent if abs(incumbent) < NO_VALUE else -math.inf, self.injected) + BOUND_TOLERANCE:
+            return None
+        with _race_best.get_lock():
+            self.injected = _race_best.value
+            return np.array(_race_assignment[:])
+
+    def check(self, runtime: float, incumbent: float, bound: float, nodes: float) -> Optional[str]:
+        if self.stop_reason is None and _race_stop.is_set():
+            self.stop_reason = RACE_LOST
+        if self.stop_reason is None and abs(bound) < NO_VALUE:
+            reason = race_reason(_race_best.value, bound, self.policy.gap)
+            if reason is not None:
+                finish_race(self.index)
+                self.stop_reason = reason
+        return super().check(runtime, incumbent, bound, nodes)
+
+### FUNÇÕES ###
+
+def race_reason(best: float, bound: float, target_gap: Optional[float]) -> Optional[str]:
+    # o limitante de uma execução vale para todas: compara com a melhor solução da corrida
+    if math.isinf(best):
+        return None
+    if bound < best + 1 - BOUND_TOLERANCE:
+        return 'race: optimality proven'
+    if target_gap is not None and best != 0 and abs(bound - best) / abs(best) <= target_gap:
+        return f'race: gap {abs(bound - best) / abs(best) * 100:.3f}% <= {target_gap * 100:.3f}%'
+    return None
+
+
+_race_best = None
+_race_assignment = None
+_race_stop = None
+_race_winner = None
+
+def _init_race(best, assignment, stop, winner):
+    global _race_best, _race_assignment, _race_stop, _race_winner
+    _race_best, _race_assignment, _race_stop, _race_winner = best, assignment, stop, winner
+
+
+def finish_race(index: int):
+    with _race_winner.get_lock():
+        if _race_winner.value < 0:
+            _race_winner.value = index
+    _race_stop.set()
+
+
+def race_preset(index: int, build: PresetBuilder, start: Optional[np.ndarray], time_offset: float,
+                policy: TerminationPolicy) -> Tuple[int, InstanceResult]:
+    backend = build()
+    try:
+        if start is not None:
+            backend.set_start(start)
+        monitor = RaceMonitor(policy, index)
+        result = backend.optimize(TrajectoryRecorder(time_offset), monitor)
+        result.stop_reason = monitor.stop_reason
+        result.solver = backend.version()
+    finally:
+        backend.dispose()
+
+    if result.status == 'optimal solution':
+        finish_race(index)
+    elif not math.isnan(result.best_result) and not math.isnan(result.best_expected):
+        if race_reason(max(result.best_result, _race_best.value), result.best_expected, policy.gap) is not None:
+            finish_race(index)
+    return index, result
+
+
+def run_race(instance: Instance, builders: Dict[str, PresetBuilder], start: Optional[np.ndarray] = None,
+             start_value: float = -math.inf, time_offset: float = 0.0,
+             policy: Optional[TerminationPolicy] = None) -> RaceResult:
+    # start: solução inicial (heurística) passada a todos os presets como MIP start
+    names: List[str] = list(builders)
+    policy = TerminationPolicy() if policy is None else policy
+    best = multiprocessing.Value('d', start_value)
+    assignment = multiprocessing.Array('l', instance.nb_tasks)
+    if start is not None:
+        assignment[:] = start
+    stop, winner = multiprocessing.Event(), multiprocessing.Value('i', -1)
+
+    race_start = time.perf_counter()
+    runs: Dict[str, InstanceResult] = dict()
+    with ProcessPoolExecutor(max_workers=len(names), initializer=_init_race, initargs=(best, assignment, stop, winner)) as pool:
+        futures = [pool.submit(race_preset, index, builders[name], start, time_offset, policy) for index, name in enumerate(names)]
+        for future in as_completed(futures):
+            index, result = future.result()
+            runs[names[index]] = result
+    wall_time = time.perf_counter() - race_start
+
+    solved = [result for result in runs.values() if not math.isnan(result.best_result)]
+    bounds = [result.best_expected for result in runs.values() if not math.isnan(result.best_expected)]
+    winner_name = names[winner.value] if winner.value >= 0 else None
+    if not solved:
+        result = dataclasses.replace(next(iter(runs.values())))
+    else:
+        result = dataclasses.replace(max(solved, key=lambda run: run.best_result))
+    result.exec_time = wall_time
+    result.nb_explored_nodes = float(np.nansum([run.nb_explored_nodes for run in runs.values()]))
+    result.best_expected = min(bounds) if bounds else math.nan
+    if solved and bounds:
+        result.gap = abs(result.best_expected - result.best_result) / abs(result.best_result) if result.best_result != 0 else math.inf
+    if winner_name is not None:
+        result.status = runs[winner_name].status
+    if solved and bounds and race_reason(result.best_result, result.best_expected, None) is not None:
+        result.status = 'optimal solution'  # provada por uma execução, encontrada por outra
+    result.stop_reason = winner_name
+    return RaceResult(result, winner_name, runs)
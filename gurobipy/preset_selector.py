@@ -0,0 +1,128 @@
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gap_results import read_results_file
+from instance_features import extract_features
+from instance_loader import Instance
+
+# Seleção automática de preset: aprende com o histórico dos CSVs de resultados (um arquivo por preset)
+# qual preset foi melhor em cada instância e, numa instância nova, escolhe pelos vizinhos mais próximos
+# no espaço das características (instance_features.py, padronizadas). Cada vizinho vota com o ranking
+# dos presets na instância dele (menor gap médio, desempate pelo tempo médio), com peso 1 / distância.
+
+### CONSTANTES ###
+
+NB_NEIGHBOURS = 3
+HISTORY_COLUMNS = ('caso_teste', 'gap(%)', 'tempo_total')
+DISTANCE_EPSILON = 1e-6  # vizinho com as mesmas características (a própria instância) domina o voto
+
+### CLASSES E TIPOS ###
+
+# (gap médio em %, tempo médio em segundos) de um preset em uma instância
+PresetScore = Tuple[float, float]
+
+@dataclass
+class PresetSelector:
+    preset_names: List[str]
+    instance_names: List[str]
+    features: np.ndarray  # (instâncias x características), já padronizadas
+    ranks: np.ndarray  # (instâncias x presets), 0 = melhor; preset sem histórico na instância fica em último
+    gaps: np.ndarray  # (instâncias x presets), gap médio em %; nan sem histórico
+    mean: np.ndarray
+    scale: np.ndarray
+    nb_neighbours: int = NB_NEIGHBOURS
+
+    def standardize(self, features: np.ndarray) -> np.ndarray:
+        return (features - self.mean) / self.scale
+
+    def preset_scores(self, features: np.ndarray, exclude: Optional[int] = None) -> np.ndarray:
+        # ranking médio previsto de cada preset (menor é melhor); exclude: instância fora do treino
+        distances = np.linalg.norm(self.features - self.standardize(features), axis=1)
+        if exclude is not None:
+            distances[exclude] = np.inf
+        neighbours = np.argsort(distances, kind='stable')[:self.nb_neighbours]
+        neighbours = neighbours[np.isfinite(distances[neighbours])]
+        weights = 1 / (distances[neighbours] + DISTANCE_EPSILON)
+        return weights @ self.ranks[neighbours] / weights.sum()
+
+    def select(self, features: np.ndarray, exclude: Optional[int] = None) -> str:
+        # empate: o primeiro preset da lista (a ordem dos runs, Default primeiro)
+        return self.preset_names[int(np.argmin(self.preset_scores(features, exclude)))]
+
+### FUNÇÕES ###
+
+def history_row(row: Dict) -> Optional[Tuple[str, float, float]]:
+    # (instância, gap, tempo) de uma linha do CSV; None se a linha não bate com o cabeçalho do bloco
+    # (valores a mais ou a menos) ou se falta alguma coluna do histórico
+    if None in row or any(not row.get(column) for column in HISTORY_COLUMNS):
+        return None
+    try:
+        gap, exec_time = float(row['gap(%)']), float(row['tempo_total'])
+    except ValueError:
+        return None
+    return os.path.splitext(os.path.basename(row['caso_teste']))[0], gap, exec_time
+
+
+def load_history(result_files: Dict[str, str]) -> Dict[str, Dict[str, PresetScore]]:
+    # result_files: preset -> CSV; devolve instância -> preset -> (gap médio, tempo médio)
+    history: Dict[str, Dict[str, PresetScore]] = dict()
+    for preset_name, file_name in result_files.items():
+        if not os.path.exists(file_name):
+            continue
+        runs: Dict[str, List[Tuple[float, float]]] = dict()
+        rows = read_results_file(file_name)
+        for row in rows:
+            values = history_row(row)
+            if values is not None:
+                instance_name, gap, exec_time = values
+                runs.setdefault(instance_name, []).append((gap, exec_time))
+        nb_rejected = len(rows) - sum(len(values) for values in runs.values())
+        if nb_rejected:
+            print(f'[seletor] {file_name}: {nb_rejected} linhas sem as colunas {", ".join(HISTORY_COLUMNS)} ficaram fora do histórico')
+        for instance_name, values in runs.items():
+            gap, exec_time = np.mean(values, axis=0)
+            history.setdefault(instance_name, dict())[preset_name] = (float(gap), float(exec_time))
+    return history
+
+
+def train_selector(result_files: Dict[str, str], load_instance: Callable[[str], Instance],
+                   nb_neighbours: int = NB_NEIGHBOURS) -> PresetSelector:
+    # load_instance: nome da instância (ex.: d60900) -> Instance, para extrair as características
+    preset_names = list(result_files)
+    history = load_history(result_files)
+    if not history:
+        raise ValueError('Sem histórico de resultados para treinar o seletor: ' + ', '.join(result_files.values()))
+
+    instance_names = sorted(history)
+    features = np.array([extract_features(load_instance(name)).as_vector() for name in instance_names])
+    gaps = np.full((len(instance_names), len(preset_names)), np.nan)
+    ranks = np.full(gaps.shape, float(len(preset_names) - 1))
+    for row, instance_name in enumerate(instance_names):
+        scores = history[instance_name]
+        order = sorted(scores, key=lambda preset: (round(scores[preset][0], 3), scores[preset][1]))
+        for rank, preset_name in enumerate(order):
+            column = preset_names.index(preset_name)
+            ranks[row, column] = rank
+            gaps[row, column] = scores[preset_name][0]
+
+    # características constantes no treino (ex.: todas as instâncias sem pares inviáveis) não pesam
+    mean, scale = features.mean(axis=0), features.std(axis=0)
+    scale[scale == 0] = 1.0
+    return PresetSelector(preset_names, instance_names, (features - mean) / scale, ranks, gaps, mean, scale, nb_neighbours)
+
+
+def leave_one_out(selector: PresetSelector) -> List[Tuple[str, str, str, float]]:
+    # para cada instância do histórico, o preset escolhido sem ela no treino: (instância, escolhido,
+    # melhor, diferença de gap em pontos percentuais)
+    original_features = selector.features * selector.scale + selector.mean
+    evaluation = []
+    for row, instance_name in enumerate(selector.instance_names):
+        chosen = selector.select(original_features[row], exclude=row)
+        best = selector.preset_names[int(np.argmin(selector.ranks[row]))]
+        chosen_gap = selector.gaps[row, selector.preset_names.index(chosen)]
+        best_gap = selector.gaps[row, selector.preset_names.index(best)]
+        evaluation.append((instance_name, chosen, best, float(chosen_gap - best_gap)))
+    return evaluation
@@ -0,0 +1,72 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from instance_loader import Instance
+from lagrangian import solve_linear_relaxation
+
+# Redução do problema antes de montar o modelo: só os pares (agente, tarefa) em `active` viram
+# variáveis x_ij.
+#  - pares impossíveis: a_ij > cap_i, x_ij nunca pode ser 1;
+#  - fixação por custo reduzido: com z_LP e o custo reduzido d_ij da relaxação linear, toda solução com
+#    x_ij = 1 vale no máximo z_LP - d_ij. Se isso fica abaixo da solução conhecida (heurística), x_ij = 0.
+#    Do mesmo jeito, se x_ij = 0 custa mais que a folga, x_ij = 1 e os outros agentes saem da tarefa j.
+# A comparação é estrita: a solução conhecida continua viável no modelo reduzido (serve de MIP start).
+# Fora do sweep: só compensa com uma solução quase ótima. Nas instâncias D, nem as soluções finais de
+# 180 s do gurobi fixam variável alguma (custos reduzidos de ~10 contra folgas de 25 a 150). Nas E, as
+# soluções da heurística ou de 20 s do HiGHS também não fixam nenhuma, e nenhuma instância tem par impossível.
+
+### CONSTANTES ###
+
+FIXING_TOLERANCE = 1e-6
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class Reduction:
+    active: np.ndarray          # (m x n) bool: pares mantidos no modelo
+    nb_infeasible_pairs: int    # a_ij > cap_i
+    nb_fixed_zero: int          # x_ij = 0 pelo custo reduzido
+    nb_fixed_tasks: int         # tarefas com x_ij = 1 fixado (as outras m - 1 variáveis saem)
+    nb_removed_variables: int
+    nb_removed_nonzeros: int    # coeficientes das restrições: 1 na atribuição da tarefa e a_ij na capacidade (se não nulo)
+    lp_bound: float
+    elapsed: float
+
+### FUNÇÕES ###
+
+def reduce_problem(instance: Instance, incumbent: Optional[float] = None) -> Reduction:
+    start = time.perf_counter()
+    weights = np.asarray(instance.capacityReductions)
+    feasible = weights <= np.asarray(instance.totalCaps)[:, None]
+    active = feasible.copy()
+
+    relaxation = solve_linear_relaxation(instance, feasible)
+    nb_fixed_zero, nb_fixed_tasks = 0, 0
+    if incumbent is not None:
+        # folga um pouco maior que a exata: erro numérico do LP nunca tira o par de uma solução tão boa quanto a conhecida
+        slack = relaxation.bound - incumbent + FIXING_TOLERANCE
+        fixed_zero = active & (-relaxation.reduced_costs > slack)
+        active &= ~fixed_zero
+        nb_fixed_zero = int(fixed_zero.sum())
+
+        # x_ij = 1: a coluna j fica só com o agente i
+        agents, tasks = np.nonzero(active & (relaxation.reduced_costs > slack))
+        active[:, tasks] = False
+        active[agents, tasks] = True
+        nb_fixed_tasks = int(tasks.size)
+
+    removed = ~active
+    nb_removed_variables = int(removed.sum())
+    return Reduction(
+        active=active,
+        nb_infeasible_pairs=int(feasible.size - feasible.sum()),
+        nb_fixed_zero=nb_fixed_zero,
+        nb_fixed_tasks=nb_fixed_tasks,
+        nb_removed_variables=nb_removed_variables,
+        nb_removed_nonzeros=nb_removed_variables + int(np.count_nonzero(weights[removed])),
+        lp_bound=relaxation.bound,
+        elapsed=time.perf_counter() - start,
+    )
@@ -0,0 +1,366 @@
+import argparse
+import csv
+import dataclasses
+import datetime
+import io
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from gap_results import (InstanceResult, format_results_row, parse_results_row, read_results_file, results_preset_name,
+                         write_results_file)
+from trajectory import TRAJECTORY_COLUMNS, Trajectory
+
+# Banco de resultados (SQLite, um arquivo só): uma linha por execução com o sweep que a gerou, o preset e
+# os parâmetros, o hash da instância, a versão do solver e todos os campos do InstanceResult; a
+# trajetória vai (opcional) numa tabela à parte, e as escolhas do seletor de presets em outra. É a fonte
+# dos resultados: os CSVs (inclusive os vencedores do portfolio e os presets escolhidos) são exportados
+# daqui. As escritas são acumuladas e gravadas em lote numa transação. O relatório agrega por preset
+# (mediana do gap, média geométrica deslocada do tempo e do gap, vitórias por instância) a partir de uma
+# única consulta, com numpy.
+#   python results_store.py report [--preset Default] [--solver highs]
+#   python results_store.py import results/*.csv   (CSVs antigos, sem hash nem parâmetros)
+#   python results_store.py export --preset Default results/default.csv
+
+### CONSTANTES ###
+
+STORE_FILE = 'results/results.sqlite'
+BATCH_SIZE = 50  # resultados por transação
+FLUSH_SECONDS = 60.0  # ... ou o tempo desde a última gravação, o que vier antes
+
+TIME_SHIFT = 10.0  # deslocamento da média geométrica dos tempos (segundos)
+GAP_SHIFT = 1.0  # idem para o gap (%)
+WIN_TOLERANCE = 1e-3  # diferença de gap (%) considerada empate
+
+# campos do InstanceResult que viram colunas (instance vira nome + hash, trajectory vai para outra tabela)
+RESULT_FIELDS = tuple(field.name for field in dataclasses.fields(InstanceResult) if field.name not in ('instance', 'trajectory'))
+RUN_FIELDS = ('run_id', 'date', 'preset', 'params', 'instance', 'instance_hash', 'repetition', 'time_limit')
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    preset TEXT NOT NULL,
+    params TEXT,
+    instance TEXT NOT NULL,
+    instance_hash TEXT,
+    repetition INTEGER,
+    time_limit REAL,
+    {", ".join(RESULT_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS results_preset ON results (preset);
+CREATE INDEX IF NOT EXISTS results_instance ON results (instance, preset);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+CREATE TABLE IF NOT EXISTS trajectories (
+    result_id INTEGER PRIMARY KEY REFERENCES results (id),
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS selections (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    label TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    preset TEXT NOT NULL,
+    feature_time REAL
+);
+'''
+WINNERS_COLUMNS = ('caso_teste', 'repeticao', 'vencedor', 'tempo_total', 'conclusao')
+SELECTION_COLUMNS = ('caso_teste', 'preset', 'tempo_caracteristicas')
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class PresetSummary:
+    preset: str
+    nb_runs: int
+    nb_instances: int
+    nb_optimal: int
+    median_gap: float  # %
+    sgm_gap: float  # média geométrica deslocada do gap (%)
+    median_time: float
+    sgm_time: float  # média geométrica deslocada do tempo total (segundos)
+    wins: int  # instâncias em que o preset teve o menor gap mediano (empates contam para todos)
+
+
+class ResultsStore:
+    # Um por processo escritor (o processo principal do sweep). add() só acumula; a transação sai a cada
+    # BATCH_SIZE resultados, a cada FLUSH_SECONDS ou no close(). on_commit roda depois da gravação (ex.:
+    # marcar o job como concluído no ledger só quando o resultado já está no banco).
+    def __init__(self, file_name: str = STORE_FILE, batch_size: int = BATCH_SIZE, store_trajectories: bool = True):
+        os.makedirs(os.path.dirname(file_name) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(file_name)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        add_missing_columns(self.connection)
+        self.batch_size = batch_size
+        self.store_trajectories = store_trajectories
+        self.run_id = datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}'
+        self.pending: List[tuple] = []
+        self.last_flush = time.perf_counter()
+
+    def add(self, result: InstanceResult, preset: str, params: Optional[Dict[str, object]] = None,
+            instance_hash: Optional[str] = None, repetition: Optional[int] = None, time_limit: Optional[float] = None,
+            on_commit: Optional[Callable[[], None]] = None):
+        date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        instance_name = os.path.splitext(os.path.basename(result.instance.name))[0]
+        row = (self.run_id, date, preset, None if params is None else json.dumps(params, sort_keys=True),
+               instance_name, instance_hash, repetition, time_limit) + tuple(getattr(result, name) for name in RESULT_FIELDS)
+        trajectory = result.trajectory if self.store_trajectories else None
+        self.pending.append((row, trajectory, on_commit))
+        if len(self.pending) >= self.batch_size or time.perf_counter() - self.last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def add_selection(self, label: str, instance_name: str, preset: str, feature_time: float):
+        # preset escolhido pelo seletor para uma instância (poucas linhas: gravadas na hora, fora do lote)
+        date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.connection:
+            self.connection.execute('INSERT INTO selections (run_id, date, label, instance, preset, feature_time) VALUES (?, ?, ?, ?, ?, ?)',
+                                    (self.run_id, date, label, instance_name, preset, feature_time))
+
+    def flush(self):
+        self.last_flush = time.perf_counter()
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        columns = RUN_FIELDS + RESULT_FIELDS
+        insert = f'INSERT INTO results ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+        with self.connection:  # uma transação para o lote inteiro
+            for row, trajectory, _ in pending:
+                result_id = self.connection.execute(insert, row).lastrowid
+                if trajectory is not None:
+                    self.connection.execute('INSERT INTO trajectories (result_id, data) VALUES (?, ?)',
+                                            (result_id, trajectory_to_blob(trajectory)))
+        for _, _, on_commit in pending:
+            if on_commit is not None:
+                on_commit()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+### FUNÇÕES ###
+
+def add_missing_columns(connection: sqlite3.Connection):
+    # bancos criados antes de um campo novo do InstanceResult ganham a coluna (vazia nas linhas antigas)
+    existing = {row[1] for row in connection.execute('PRAGMA table_info(results)')}
+    with connection:
+        for name in RESULT_FIELDS:
+            if name not in existing:
+                connection.execute(f'ALTER TABLE results ADD COLUMN {name}')
+
+
+def trajectory_to_blob(trajectory: Trajectory) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, np.column_stack([trajectory[name] for name in TRAJECTORY_COLUMNS]), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def read_stored_trajectory(connection: sqlite3.Connection, result_id: int) -> Optional[Trajectory]:
+    row = connection.execute('SELECT data FROM trajectories WHERE result_id = ?', (result_id,)).fetchone()
+    if row is None:
+        return None
+    values = np.load(io.BytesIO(row[0]), allow_pickle=False).reshape(-1, len(TRAJECTORY_COLUMNS))
+    return {name: values[:, k] for k, name in enumerate(TRAJECTORY_COLUMNS)}
+
+
+def query_results(connection: sqlite3.Connection, columns: Sequence[str], preset: Optional[str] = None,
+                  solver: Optional[str] = None, run_id: Optional[str] = None) -> Dict[str, np.ndarray]:
+    # colunas pedidas como arrays (NULL -> nan nas numéricas); filtros por igualdade/prefixo
+    conditions, values = [], []
+    if preset is not None:
+        conditions.append('preset = ?')
+        values.append(preset)
+    if solver is not None:
+        conditions.append('solver LIKE ?')
+        values.append(solver + '%')
+    if run_id is not None:
+        conditions.append('run_id = ?')
+        values.append(run_id)
+    where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+    rows = connection.execute(f'SELECT {", ".join(columns)} FROM results{where}', values).fetchall()
+    data = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = dict()
+    for name, column in zip(columns, data):
+        if all(value is None or isinstance(value, (int, float)) for value in column):
+            arrays[name] = np.array([math.nan if value is None else value for value in column], dtype=np.float64)
+        else:
+            arrays[name] = np.array(column, dtype=object)
+    return arrays
+
+
+def shifted_geometric_mean(values: np.ndarray, shift: float) -> float:
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return math.nan
+    return float(np.exp(np.log(np.maximum(values, 0) + shift).mean()) - shift)
+
+
+def summarize(results: Dict[str, np.ndarray]) -> List[PresetSummary]:
+    # results: colunas preset, instance, gap (fração), exec_time e status (query_results)
+    presets, preset_index = np.unique(results['preset'].astype(str), return_inverse=True)
+    instances, instance_index = np.unique(results['instance'].astype(str), return_inverse=True)
+    gap = results['gap'] * 100
+    exec_time = results['exec_time']
+    optimal = results['status'] == 'optimal solution'
+
+    # gap mediano de cada (instância, preset) sobre as repetições: ordena por célula e pega o meio
+    cell = instance_index * len(presets) + preset_index
+    order = np.lexsort((np.where(np.isnan(gap), np.inf, gap), cell))
+    cells, starts, counts = np.unique(cell[order], return_index=True, return_counts=True)
+    sorted_gap = np.where(np.isnan(gap), np.inf, gap)[order]
+    cell_median = (sorted_gap[starts + (counts - 1) // 2] + sorted_gap[starts + counts // 2]) / 2
+    medians = np.full(len(instances) * len(presets), np.inf)
+    medians[cells] = cell_median
+    medians = medians.reshape(len(instances), len(presets))
+    best = medians.min(axis=1, keepdims=True)
+    winners = (medians <= best + WIN_TOLERANCE) & np.isfinite(best)
+
+    summaries = []
+    for k, preset in enumerate(presets):
+        rows = preset_index == k
+        summaries.append(PresetSummary(
+            preset=str(preset),
+            nb_runs=int(rows.sum()),
+            nb_instances=int(np.unique(instance_index[rows]).size),
+            nb_optimal=int(optimal[rows].sum()),
+            median_gap=float(np.nanmedian(gap[rows])) if np.isfinite(gap[rows]).any() else math.nan,
+            sgm_gap=shifted_geometric_mean(gap[rows], GAP_SHIFT),
+            median_time=float(np.nanmedian(exec_time[rows])) if np.isfinite(exec_time[rows]).any() else math.nan,
+            sgm_time=shifted_geometric_mean(exec_time[rows], TIME_SHIFT),
+            wins=int(winners[:, k].sum())
+        ))
+    return sorted(summaries, key=lambda summary: (-summary.wins, summary.sgm_gap))
+
+
+def import_results_file(store: ResultsStore, file_name: str, preset: Optional[str] = None) -> int:
+    # CSV antigo -> banco; o que o CSV não tem (hash, parâmetros, trajetória) fica NULL. Cada linha é lida
+    # com o cabeçalho do próprio bloco; linhas que não batem com ele (valores a mais) ficam de fora
+    preset = preset or results_preset_name(file_name) or os.path.splitext(os.path.basename(file_name))[0]
+
+    nb_rows = 0
+    for row in read_results_file(file_name):
+        if None in row or not row.get('caso_teste'):
+            continue
+        instance_name = os.path.splitext(os.path.basename(row['caso_teste']))[0]
+        values = parse_results_row(row)
+        store.pending.append(((store.run_id, row.get('data_atual'), preset, None, instance_name, None, None, None)
+                              + tuple(values.get(name) for name in RESULT_FIELDS), None, None))
+        nb_rows += 1
+    store.flush()
+    return nb_rows
+
+
+def import_missing_results(store: ResultsStore, file_name: str, preset: str) -> int:
+    # CSV de antes do banco: entra uma vez, na primeira execução do preset, para a exportação não
+    # apagar o histórico dele
+    if not os.path.exists(file_name):
+        return 0
+    store.flush()
+    if store.connection.execute('SELECT 1 FROM results WHERE preset = ? LIMIT 1', (preset,)).fetchone() is not None:
+        return 0
+    return import_results_file(store, file_name, preset)
+
+
+def export_results_file(connection: sqlite3.Connection, presets: Sequence[str], output_file_name: str,
+                        preset_name: Optional[str] = None) -> int:
+    # todas as execuções dos presets, em ordem de gravação, no formato CSV de gap_results.py
+    columns = ('date', 'instance') + RESULT_FIELDS
+    rows = connection.execute(f'SELECT {", ".join(columns)} FROM results WHERE preset IN ({", ".join("?" * len(presets))}) '
+                              f'ORDER BY id', list(presets)).fetchall()
+    lines = [format_results_row(row[0], f'instances/{row[1]}.in', dict(zip(RESULT_FIELDS, row[2:]))) for row in rows]
+    write_results_file(preset_name or presets[0], lines, output_file_name)
+    return len(lines)
+
+
+def write_table_file(header: Sequence[str], rows: List[Sequence[object]], output_file_name: str):
+    # CSV simples (sem as linhas de preset e esquema dos arquivos de resultados), reescrito inteiro
+    os.makedirs(os.path.dirname(output_file_name) or '.', exist_ok=True)
+    with open(output_file_name, 'w', newline='') as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def export_winners_file(connection: sqlite3.Connection, preset: str, output_file_name: str) -> int:
+    # vencedor de cada corrida do portfolio (gravado nos parâmetros da execução)
+    rows = connection.execute('SELECT instance, repetition, params, exec_time, status FROM results WHERE preset = ? ORDER BY id',
+                              (preset,)).fetchall()
+    lines = [(instance, '' if repetition is None else repetition, (json.loads(params).get('winner') if params else None) or '',
+              '' if exec_time is None else f'{exec_time:.3f}', status or '')
+             for instance, repetition, params, exec_time, status in rows]
+    write_table_file(WINNERS_COLUMNS, lines, output_file_name)
+    return len(lines)
+
+
+def export_selections_file(connection: sqlite3.Connection, label: str, output_file_name: str) -> int:
+    rows = connection.execute('SELECT instance, preset, feature_time FROM selections WHERE label = ? ORDER BY id', (label,)).fetchall()
+    lines = [(instance, preset, '' if feature_time is None else f'{feature_time:.6f}') for instance, preset, feature_time in rows]
+    write_table_file(SELECTION_COLUMNS, lines, output_file_name)
+    return len(lines)
+
+
+def print_report(summaries: List[PresetSummary], elapsed: float):
+    print(f'{"preset":>40} {"execuções":>9} {"instâncias":>10} {"ótimas":>6} {"vitórias":>8} '
+          f'{"gap med.(%)":>11} {"gap sgm(%)":>10} {"tempo med.":>10} {"tempo sgm":>9}')
+    for summary in summaries:
+        print(f'{summary.preset:>40} {summary.nb_runs:9d} {summary.nb_instances:10d} {summary.nb_optimal:6d} {summary.wins:8d} '
+              f'{summary.median_gap:11.3f} {summary.sgm_gap:10.3f} {summary.median_time:10.1f} {summary.sgm_time:9.1f}')
+    print(f'\n{sum(summary.nb_runs for summary in summaries)} execuções agregadas em {elapsed * 1000:.1f} ms')
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description='Banco de resultados: relatório por preset, importação dos CSVs antigos e exportação')
+    parser.add_argument('--store', default=STORE_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    report = commands.add_parser('report', help='mediana e média geométrica deslocada do gap e do tempo, vitórias por instância')
+    report.add_argument('--preset', default=None)
+    report.add_argument('--solver', default=None, help='prefixo da coluna solver (ex.: highs, gurobi-13)')
+    report.add_argument('--run-id', default=None, help='só um sweep')
+    import_command = commands.add_parser('import', help='importa CSVs de resultados (o preset vem da linha "Preset usado")')
+    import_command.add_argument('files', nargs='+')
+    export_command = commands.add_parser('export', help='gera o CSV de resultados de um preset a partir do banco')
+    export_command.add_argument('--preset', required=True)
+    export_command.add_argument('file')
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        with ResultsStore(args.store) as store:
+            for file_name in args.files:
+                print(f'{file_name}: {import_results_file(store, file_name)} linhas')
+        return
+
+    if not os.path.exists(args.store):
+        sys.exit(f'Sem banco de resultados em {args.store}')
+    if args.command == 'export':
+        connection = sqlite3.connect(args.store)
+        add_missing_columns(connection)
+        print(f'{args.file}: {export_results_file(connection, [args.preset], args.file)} linhas')
+        connection.close()
+        return
+    start = time.perf_counter()
+    connection = sqlite3.connect(args.store)
+    results = query_results(connection, ('preset', 'instance', 'gap', 'exec_time', 'status'), args.preset, args.solver, args.run_id)
+    connection.close()
+    if results['preset'].size == 0:
+        sys.exit('Nenhuma execução com esses filtros')
+    summaries = summarize(results)
+    print_report(summaries, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import json
+import os
+from typing import Any, Dict
+
+### CONSTANTES ###
+
+LEDGER_OK = 'ok'
+LEDGER_FAILED = 'failed'
+
+### CLASSES E TIPOS ###
+
+Ledger = Dict[str, str]  # chave do job -> último status registrado
+
+### FUNÇÕES ###
+
+# Um job do sweep é identificado pelo conteúdo da instância (e não pelo nome do arquivo), pelos
+# parâmetros do solver, pelo limite de tempo, pela repetição e pela versão do solver.
+def ledger_key(instance_hash: str, solver_params: Dict[str, Any], time_limit: float, repetition: int, solver_version: str) -> str:
+    return json.dumps({
+        'instance': instance_hash,
+        'params': solver_params,
+        'time_limit': time_limit,
+        'repetition': repetition,
+        'solver': solver_version,
+    }, sort_keys=True)
+
+
+def load_ledger(ledger_file_name: str) -> Ledger:
+    ledger: Ledger = dict()
+    if not os.path.exists(ledger_file_name):
+        return ledger
+
+    with open(ledger_file_name, 'r') as ledger_file:
+        for line in ledger_file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # última linha pode ter ficado pela metade se o processo morreu escrevendo
+            ledger[entry['key']] = entry['status']
+    return ledger
+
+
+def is_done(ledger: Ledger, key: str) -> bool:
+    return ledger.get(key) == LEDGER_OK
+
+
+def record_ledger_entry(ledger: Ledger, ledger_file_name: str, key: str, status: str) -> None:
+    ledger[key] = status
+    with open(ledger_file_name, 'a') as ledger_file:
+        ledger_file.write(json.dumps({'key': key, 'status': status}) + '\n')
+        ledger_file.flush()
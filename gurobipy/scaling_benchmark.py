@@ -0,0 +1,183 @@
+import argparse
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from instance_generator import KINDS, generated_file, instance_name
+from instance_loader import read_instance
+from gap_heuristic import solve_heuristic
+from solver_backends import BACKEND_NAMES, GUROBI, make_backend
+
+# Benchmark de escala: gera instâncias C/D/E em uma grade de tamanhos (instance_generator.py) e mede cada
+# etapa do pipeline em um processo novo por instância (o pico de RSS não mistura instâncias):
+#   parse (read_instance sem cache), build (modelo do backend), heuristic (MIP start) e solve.
+# Cada etapa vira uma linha JSON (tempo, pico de RSS acumulado até o fim da etapa e, no solve, gap e
+# status). Com --baseline as linhas são comparadas com um benchmark anterior e qualquer etapa mais lenta,
+# mais pesada ou com gap pior que a tolerância faz o script terminar com código 1.
+
+### CONSTANTES ###
+
+SIZES = ((20, 200), (40, 400), (80, 1600), (100, 2000), (100, 5000), (200, 5000), (200, 10000))
+TIME_LIMIT = 60.0  # segundos do solve em cada instância
+THREADS = 1
+OUTPUT_FILE = 'results/scaling/benchmark.jsonl'
+
+TIME_TOLERANCE = 0.25  # regressão: etapa mais de 25% mais lenta ...
+TIME_SLACK = 0.5       # ... e mais de 0.5s (tempos curtos oscilam muito)
+RSS_TOLERANCE = 0.15
+RSS_SLACK_MB = 20.0
+GAP_TOLERANCE = 1e-3   # gap final (fração) pior que o do baseline por mais que isso
+
+STAGES = ('parse', 'build', 'heuristic', 'solve')
+
+### FUNÇÕES ###
+
+def peak_rss_mb() -> float:
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def benchmark_instance(filename: str, backend_name: str, time_limit: float) -> List[Dict[str, object]]:
+    # roda no processo do pool (um por instância); devolve uma linha por etapa
+    rows = []
+
+    def stage(name: str, start: float, **extra):
+        rows.append(dict(stage=name, time=time.perf_counter() - start, peak_rss_mb=peak_rss_mb(), **extra))
+
+    rows.append(dict(stage='start', time=0.0, peak_rss_mb=peak_rss_mb()))
+
+    start = time.perf_counter()
+    instance = read_instance(filename, cache_dir=None)
+    stage('parse', start)
+
+    start = time.perf_counter()
+    backend = make_backend(backend_name, instance)
+    backend.configure(time_limit, THREADS, True)
+    stage('build', start, variables=instance.nb_agents * instance.nb_tasks)
+
+    start = time.perf_counter()
+    heuristic = solve_heuristic(instance)
+    stage('heuristic', start, objective=None if heuristic is None else heuristic.objective)
+
+    start = time.perf_counter()
+    if heuristic is not None:
+        backend.set_start(heuristic.assignment)
+    result = backend.solve(0.0 if heuristic is None else heuristic.elapsed)
+    backend.dispose()
+    stage('solve', start, solver_time=result.exec_time, status=result.status,
+          objective=None if math.isnan(result.best_result) else result.best_result,
+          bound=None if math.isnan(result.best_expected) else result.best_expected,
+          gap=None if math.isinf(result.gap) or math.isnan(result.gap) else result.gap,
+          solver=result.solver)
+    return rows
+
+
+def run_benchmark(sizes: List[Tuple[int, int]], kinds: List[str], seeds: List[int], backend_name: str,
+                  time_limit: float, output_file: str) -> List[Dict[str, object]]:
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    records = []
+    with open(output_file, 'w') as output:
+        for nb_agents, nb_tasks in sizes:
+            for kind in kinds:
+                for seed in seeds:
+                    name = instance_name(kind, nb_agents, nb_tasks, seed)
+                    start = time.perf_counter()
+                    filename = generated_file(kind, nb_agents, nb_tasks, seed)
+                    case = dict(date=date, instance=name, kind=kind, agents=nb_agents, tasks=nb_tasks, seed=seed,
+                                backend=backend_name, time_limit=time_limit)
+                    print(f'[benchmark] {name} ({backend_name}; arquivo em {time.perf_counter() - start:.1f}s)')
+
+                    # processo novo (spawn) por instância: o pico de RSS é só desta instância
+                    try:
+                        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                            rows = pool.submit(benchmark_instance, filename, backend_name, time_limit).result()
+                    except (BrokenProcessPool, Exception) as e:  # sem memória o processo morre sem exceção
+                        rows = [dict(stage='error', time=math.nan, peak_rss_mb=math.nan, error=str(e) or type(e).__name__)]
+
+                    for row in rows:
+                        record = dict(case, **row)
+                        records.append(record)
+                        output.write(json.dumps(record) + '\n')
+                        output.flush()
+                        gap_text = '' if record.get('gap') is None else f', gap {record["gap"] * 100:.3f}%'
+                        print(f'\t{record["stage"]:>9}: {record["time"]:8.2f}s, pico {record["peak_rss_mb"]:8.1f} MB{gap_text}')
+    return records
+
+
+def read_records(filename: str) -> List[Dict[str, object]]:
+    with open(filename) as records_file:
+        return [json.loads(line) for line in records_file if line.strip()]
+
+
+def find_regressions(records: List[Dict[str, object]], baseline: List[Dict[str, object]]) -> List[str]:
+    # compara etapa a etapa (mesma instância, backend e etapa) com o benchmark de referência
+    def key(record):
+        return record['instance'], record['backend'], record['stage']
+
+    reference = {key(record): record for record in baseline}
+    regressions = []
+    for record in records:
+        base = reference.get(key(record))
+        if record['stage'] == 'error':
+            regressions.append(f'{record["instance"]}: falhou ({record.get("error")})')
+        if base is None or record['stage'] not in STAGES:
+            continue
+        label = f'{record["instance"]} {record["stage"]}'
+        # no solve o tempo é limitado pelo time_limit: a regressão aparece no gap
+        if record['stage'] != 'solve' and record['time'] > base['time'] * (1 + TIME_TOLERANCE) + TIME_SLACK:
+            regressions.append(f'{label}: tempo {record["time"]:.2f}s (baseline {base["time"]:.2f}s)')
+        if record['peak_rss_mb'] > base['peak_rss_mb'] * (1 + RSS_TOLERANCE) + RSS_SLACK_MB:
+            regressions.append(f'{label}: pico de RSS {record["peak_rss_mb"]:.1f} MB (baseline {base["peak_rss_mb"]:.1f} MB)')
+        if record['stage'] == 'solve':
+            gap, base_gap = record.get('gap'), base.get('gap')
+            if base_gap is not None and (gap is None or gap > base_gap + GAP_TOLERANCE):
+                gap_text = 'sem solução' if gap is None else f'{gap * 100:.3f}%'
+                regressions.append(f'{label}: gap {gap_text} (baseline {base_gap * 100:.3f}%)')
+            if base['status'] == 'optimal solution' and record['status'] != 'optimal solution' and \
+                    record['time'] > base['time'] * (1 + TIME_TOLERANCE) + TIME_SLACK:
+                regressions.append(f'{label}: não provou a otimalidade (baseline em {base["time"]:.2f}s)')
+    return regressions
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    agents, tasks = text.lower().split('x')
+    return int(agents), int(tasks)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description='Benchmark de escala (parse, build, heurística e solve) em instâncias geradas')
+    parser.add_argument('--sizes', type=lambda text: [parse_size(size) for size in text.split(',')],
+                        default=list(SIZES), help='tamanhos mxn separados por vírgula (ex.: 80x1600,200x10000)')
+    parser.add_argument('--kinds', type=lambda text: text.upper().split(','), default=list(KINDS),
+                        help='classes separadas por vírgula (C,D,E)')
+    parser.add_argument('--seeds', type=lambda text: [int(seed) for seed in text.split(',')], default=[0])
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default=GUROBI)
+    parser.add_argument('--time-limit', type=float, default=TIME_LIMIT)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--baseline', default=None,
+                        help='benchmark anterior (.jsonl); regressões em qualquer etapa terminam com código 1')
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.sizes, args.kinds, args.seeds, args.backend, args.time_limit, args.output)
+    print(f'\n{len(records)} linhas em {args.output}')
+    if args.baseline is not None:
+        regressions = find_regressions(records, read_records(args.baseline))
+        for regression in regressions:
+            print(f'[regressão] {regression}')
+        if regressions:
+            sys.exit(1)
+        print(f'Sem regressões em relação a {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
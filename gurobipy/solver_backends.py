@@ -0,0 +1,604 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+import scipy.sparse as sp
+
+from cover_cuts import CoverSeparator
+from gap_heuristic import assignment_to_x
+from gap_matrices import active_columns, assignment_matrix, capacity_matrix
+from gap_results import InstanceResult, finish_instance_result
+from instance_loader import Instance
+from termination import TerminationMonitor, TerminationPolicy
+from trajectory import NO_VALUE, TrajectoryRecorder
+
+# Mesmo modelo do GAP (max Σ c_ij x_ij; Σ_i x_ij = 1; Σ_j a_ij x_ij <= cap_i; x binário) em três
+# solvers. Os scripts (test.py, MIP/gurobi_entrega2.py) só conversam com SolverBackend e recebem um
+# InstanceResult com o status no mesmo vocabulário, então o pipeline inteiro roda com CBC ou HiGHS
+# numa máquina sem licença do gurobi. Os solvers são dependências opcionais: só o escolhido precisa
+# estar instalado.
+
+gp = None  # gurobipy só é importado quando o backend do gurobi é usado (import_gurobipy)
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+try:
+    import mip
+except ImportError:
+    mip = None
+
+### CONSTANTES ###
+
+GUROBI = 'gurobi'
+HIGHS = 'highs'
+CBC = 'cbc'
+BACKEND_NAMES = (GUROBI, HIGHS, CBC)
+
+DEFAULT_MIP_GAP = 1e-4  # max_mip_gap padrão do python-mip, restaurado no reset
+
+### CLASSES E TIPOS ###
+
+class SolverBackend(ABC):
+    # Interface comum. O modelo é montado no construtor; reset() descarta a solução, o MIP start e os
+    # parâmetros da execução anterior para o mesmo modelo ser reaproveitado entre presets.
+    # active (m x n, reduction.py) restringe as variáveis criadas; None = todos os pares.
+    name = ''
+    supports_cover_cuts = False  # tem enable_cover_cuts() (callback de cortes); o test.py confere antes de rodar
+    separator: Optional[CoverSeparator] = None  # coberturas (cover_cuts.py) separadas nos nós, se ativadas
+
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None):
+        self.instance = instance
+        self.columns = active_columns(instance, active)
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+    @abstractmethod
+    def configure(self, time_limit: float, threads: int, presolve: bool) -> None:
+        ...
+
+    @abstractmethod
+    def set_start(self, assignment: np.ndarray) -> None:
+        ...
+
+    @abstractmethod
+    def add_columns(self, columns: np.ndarray) -> None:
+        # inclui no modelo os pares (colunas na ordem achatada) que ainda não estão nele; o estado da
+        # execução anterior não é preservado, como no reset()
+        ...
+
+    @abstractmethod
+    def best_assignment(self) -> Optional[np.ndarray]:
+        # agente de cada tarefa na melhor solução da última execução (None se não houver)
+        ...
+
+    def _assignment_to_x(self, assignment: np.ndarray) -> np.ndarray:
+        return assignment_to_x(assignment, self.instance.nb_agents).ravel()[self.columns]
+
+    def _x_to_assignment(self, values: np.ndarray) -> np.ndarray:
+        agents, tasks = np.divmod(self.columns[np.asarray(values) > 0.5], self.instance.nb_tasks)
+        assignment = np.empty(self.instance.nb_tasks, dtype=int)
+        assignment[tasks] = agents
+        return assignment
+
+    @abstractmethod
+    def version(self) -> str:
+        ...
+
+    def dispose(self) -> None:
+        pass
+
+    @abstractmethod
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        # roda o solver: (resultado sem a amostra final, iterações do simplex); quem envolve outro backend
+        # (candidates.py) chama run() mais de uma vez e a trajetória só é fechada no fim
+        ...
+
+    def optimize(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> InstanceResult:
+        # roda o solver e devolve o resultado com a última amostra e as métricas da trajetória
+        result, iterations = self.run(recorder, monitor)
+        return finish_instance_result(result, recorder, iterations)
+
+    def solve(self, time_offset: float = 0.0, termination: Optional[TerminationPolicy] = None) -> InstanceResult:
+        # time_offset: tempo gasto antes do solver (heurística do MIP start), somado à linha do tempo
+        recorder = TrajectoryRecorder(time_offset)
+        monitor = None if termination is None else TerminationMonitor(termination)
+        result = self.optimize(recorder, monitor)
+        result.stop_reason = None if monitor is None else monitor.stop_reason
+        result.solver = self.version()
+        return result
+
+
+def import_gurobipy():
+    # import tardio: test.py e os outros backends rodam sem o gurobipy instalado (ou sem licença)
+    global gp
+    if gp is None:
+        try:
+            import gurobipy
+        except ImportError:
+            raise ImportError('backend gurobi precisa do pacote gurobipy') from None
+        gp = gurobipy
+    return gp
+
+
+def backend_version(backend_name: str) -> str:
+    # entra na chave do ledger: resultados de versões diferentes do solver não se misturam
+    if backend_name == GUROBI:
+        import_gurobipy()
+        return 'gurobi-{}.{}.{}'.format(*gp.gurobi.version())
+    elif backend_name == HIGHS:
+        return f'highs-{highspy.Highs().version()}'
+    elif backend_name == CBC:
+        return f'cbc-python-mip-{mip.__version__}'
+    raise ValueError(f'Backend desconhecido: {backend_name}')
+
+
+def _value_or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None or abs(value) >= NO_VALUE else float(value)
+
+
+### GUROBI ###
+
+def status_to_text(status: int, stop_reason: Optional[str] = None):
+    if status == gp.GRB.Status.INTERRUPTED and stop_reason is not None: return f"early stop: {stop_reason}"
+    elif status == gp.GRB.Status.CUTOFF: return "cutoff"
+    elif status == gp.GRB.Status.INFEASIBLE: return "infeasible solution"
+    elif status == gp.GRB.Status.INF_OR_UNBD: return "inf. or unbd."
+    elif status == gp.GRB.Status.INPROGRESS: return "inprogress"
+    elif status == gp.GRB.Status.INTERRUPTED: return "interrupted execution"
+    elif status == gp.GRB.Status.ITERATION_LIMIT: return "iteration limit reached"
+    elif status == gp.GRB.Status.LOADED: return "loaded"
+    elif status == gp.GRB.Status.NODE_LIMIT: return "node limit reached"
+    elif status == gp.GRB.Status.NUMERIC: return "numeric"
+    elif status == gp.GRB.Status.OPTIMAL: return "optimal solution"
+    elif status == gp.GRB.Status.SOLUTION_LIMIT: return "solution qty. limit reached"
+    elif status == gp.GRB.Status.SUBOPTIMAL: return "suboptimal solution"
+    elif status == gp.GRB.Status.TIME_LIMIT: return "time limit reached"
+    elif status == gp.GRB.Status.UNBOUNDED: return "unbounded result"
+    elif status == gp.GRB.Status.USER_OBJ_LIMIT: return "user obj. limit reached"
+    elif status == gp.GRB.Status.WORK_LIMIT: return "work limit reached"
+    else: raise ValueError(f'Unknown status: {status}')
+
+
+def insert_x_variables(model: 'gp.Model', columns: np.ndarray) -> 'gp.MVar':
+    # uma única variável vetorial x (um elemento por par ativo, na ordem achatada de gap_matrices) no
+    # lugar de m*n chamadas a addVar
+    return model.addMVar(columns.size, vtype=gp.GRB.BINARY, name="x")
+
+
+def insert_restrictions(model: 'gp.Model', instance: Instance, x_vars: 'gp.MVar', columns: np.ndarray) -> Tuple['gp.MConstr', 'gp.MConstr']:
+    # Σ_{i=1}^m x_{ij} = 1, j = 1, 2, ..., n -> cada tarefa j só é executada por um agente
+    tasks = model.addMConstr(assignment_matrix(instance, columns), x_vars, gp.GRB.EQUAL, np.ones(instance.nb_tasks), name="task")
+
+    # Σ_{j=1}^n a_{ij} * x_{ij} <= cap_{i}, i = 1, 2, ..., m -> cada agente i não pode executar mais tarefas do que a sua capacidade
+    agents = model.addMConstr(capacity_matrix(instance, columns), x_vars, gp.GRB.LESS_EQUAL, instance.totalCaps, name="agent")
+
+    # x_{ij} E {0,1}, i = 1, 2, ..., n; j = 1, 2, ..., n -> restrição garantida pelo var_type=BINARY ao criar a variável de decisão
+    ###
+    return tasks, agents
+
+
+def insert_objective(model: 'gp.Model', instance: Instance, x: 'gp.MVar', columns: np.ndarray):
+    # Σ_{i=1}^m Σ_{j=1}^n ( c_{ij} * x_{ij} ) -> coeficientes do objetivo atribuídos direto no vetor de variáveis
+    x.Obj = np.asarray(instance.profits).ravel()[columns]
+    model.ModelSense = gp.GRB.MAXIMIZE
+
+
+def gurobi_callback(model: 'gp.Model', where: int):
+    # trajetória (trajectory.py) e, se o preset tiver, política de parada antecipada (termination.py)
+    recorder: TrajectoryRecorder = model._trajectory
+    monitor: Optional[TerminationMonitor] = model._termination
+    backend: GurobiBackend = model._backend
+    if where == gp.GRB.Callback.MIPSOL:
+        runtime = model.cbGet(gp.GRB.Callback.RUNTIME)
+        bound, nodes = model.cbGet(gp.GRB.Callback.MIPSOL_OBJBND), model.cbGet(gp.GRB.Callback.MIPSOL_NODCNT)
+        objective = model.cbGet(gp.GRB.Callback.MIPSOL_OBJ)
+        recorder.new_incumbent(runtime, objective, bound, nodes)
+        if monitor is not None and monitor.shares_incumbent:
+            monitor.publish(objective, backend._x_to_assignment(model.cbGetSolution(backend.x)))
+        if monitor is not None and monitor.check(runtime, recorder.best, bound, nodes):
+            model.terminate()
+    elif where == gp.GRB.Callback.MIPNODE:
+        if monitor is not None and monitor.shares_incumbent:
+            # solução de outra execução vira incumbente (o Cutoff não muda dentro do callback; a poda é a mesma)
+            assignment = monitor.incoming(model.cbGet(gp.GRB.Callback.MIPNODE_OBJBST))
+            if assignment is not None:
+                model.cbSetSolution(backend.x, backend._assignment_to_x(assignment))
+                model.cbUseSolution()
+        if backend.separator is not None and model.cbGet(gp.GRB.Callback.MIPNODE_STATUS) == gp.GRB.OPTIMAL \
+                and backend.separator.wants(model.cbGet(gp.GRB.Callback.MIPNODE_NODCNT)):
+            x_vars = backend.x.tolist()
+            for positions, coeffs, rhs in backend.separator.separate(backend.columns, model.cbGetNodeRel(backend.x)):
+                model.cbCut(gp.LinExpr(coeffs.tolist(), [x_vars[k] for k in positions]), gp.GRB.LESS_EQUAL, rhs)
+    elif where == gp.GRB.Callback.MIP:
+        runtime = model.cbGet(gp.GRB.Callback.RUNTIME)
+        sample = recorder.due(runtime)
+        if not sample and monitor is None:
+            return
+        incumbent, bound = model.cbGet(gp.GRB.Callback.MIP_OBJBST), model.cbGet(gp.GRB.Callback.MIP_OBJBND)
+        nodes = model.cbGet(gp.GRB.Callback.MIP_NODCNT)
+        if sample:
+            recorder.iterations = model.cbGet(gp.GRB.Callback.MIP_ITRCNT)
+            recorder.sample(runtime, incumbent, bound, nodes, recorder.iterations)
+        if monitor is not None and monitor.check(runtime, incumbent, bound, nodes):
+            model.terminate()
+
+
+class GurobiBackend(SolverBackend):
+    # parâmetros específicos do gurobi (Method, Cuts, ...) vão por set_params
+    name = GUROBI
+    supports_cover_cuts = True
+
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None):
+        import_gurobipy()
+        super().__init__(instance, active)
+        self.model = gp.Model()
+        self.x = insert_x_variables(self.model, self.columns)
+        self.task_constrs, self.agent_constrs = insert_restrictions(self.model, instance, self.x, self.columns)
+        insert_objective(self.model, instance, self.x, self.columns)
+        self.model.update()
+
+    def reset(self):
+        self.model.reset(1)
+        self.model.resetParams()
+        self.separator = None
+
+    def set_params(self, params: Dict[str, float]):
+        # parâmetros sem equivalente nos outros backends (Method, Cuts, VarBranch, ...), pelo nome do gurobi
+        for name, value in params.items():
+            self.model.setParam(name, value)
+
+    def configure(self, time_limit: float, threads: int, presolve: bool):
+        self.model.setParam(gp.GRB.param.Presolve, 1 if presolve else 0)
+        self.model.setParam(gp.GRB.param.TimeLimit, time_limit)
+        self.model.setParam(gp.GRB.param.Threads, threads)
+
+    def set_start(self, assignment: np.ndarray):
+        self.x.Start = self._assignment_to_x(assignment)
+
+    def add_columns(self, columns: np.ndarray):
+        # variáveis novas entram com a sua coluna nas duas restrições; o modelo (e os parâmetros) continua o mesmo
+        self.model.reset(1)
+        columns = np.setdiff1d(columns, self.columns)
+        profits = np.asarray(self.instance.profits).ravel()
+        weights = np.asarray(self.instance.capacityReductions).ravel()
+        new_vars = []
+        for column in columns:
+            agent, task = divmod(int(column), self.instance.nb_tasks)
+            constrs = [self.task_constrs[task].item(), self.agent_constrs[agent].item()]
+            new_vars.append(self.model.addVar(vtype=gp.GRB.BINARY, obj=profits[column], column=gp.Column([1.0, float(weights[column])], constrs)))
+        self.x = gp.MVar.fromlist(self.x.tolist() + new_vars)
+        self.columns = np.concatenate([self.columns, columns])
+        self.model.update()
+
+    def best_assignment(self) -> Optional[np.ndarray]:
+        if self.model.getAttr(gp.GRB.Attr.SolCount) == 0:
+            return None
+        return self._x_to_assignment(self.x.X)
+
+    def enable_cover_cuts(self):
+        # PreCrush: cortes do usuário escritos no modelo original continuam válidos depois do presolve
+        self.separator = CoverSeparator(self.instance)
+        self.model.setParam(gp.GRB.param.PreCrush, 1)
+
+    def version(self) -> str:
+        return backend_version(GUROBI)
+
+    def dispose(self):
+        self.model.dispose()
+
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        model = self.model
+        model._trajectory = recorder
+        model._termination = monitor
+        model._backend = self
+        model.optimize(gurobi_callback)
+
+        has_solution = model.getAttr(gp.GRB.Attr.SolCount) > 0
+        result = InstanceResult(
+            instance=self.instance,
+            exec_time=model.getAttr(gp.GRB.Attr.Runtime),
+            build_time=0.0,
+            status=status_to_text(model.getAttr(gp.GRB.Attr.Status), None if monitor is None else monitor.stop_reason),
+            best_result=model.getAttr(gp.GRB.Attr.ObjVal) if has_solution else math.nan,
+            nb_explored_nodes=model.getAttr(gp.GRB.Attr.NodeCount),
+            best_expected=_value_or_nan(model.getAttr(gp.GRB.Attr.ObjBound)),
+            gap=model.getAttr(gp.GRB.Attr.MIPGap) if has_solution else math.inf
+        )
+        return result, model.getAttr(gp.GRB.Attr.IterCount)
+
+
+### HIGHS ###
+
+def highs_status_to_text(status: 'highspy.HighsModelStatus', stop_reason: Optional[str] = None) -> str:
+    statuses = highspy.HighsModelStatus
+    if status == statuses.kInterrupt and stop_reason is not None: return f"early stop: {stop_reason}"
+    elif status == statuses.kInterrupt: return "interrupted execution"
+    elif status == statuses.kOptimal: return "optimal solution"
+    elif status == statuses.kTimeLimit: return "time limit reached"
+    elif status == statuses.kInfeasible: return "infeasible solution"
+    elif status == statuses.kUnboundedOrInfeasible: return "inf. or unbd."
+    elif status == statuses.kUnbounded: return "unbounded result"
+    elif status == statuses.kIterationLimit: return "iteration limit reached"
+    elif status == statuses.kSolutionLimit: return "solution qty. limit reached"
+    elif status in (statuses.kObjectiveBound, statuses.kObjectiveTarget): return "user obj. limit reached"
+    elif status == statuses.kMemoryLimit: return "memory limit reached"
+    else: return "numeric"
+
+
+class HighsBackend(SolverBackend):
+    name = HIGHS
+
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None):
+        if highspy is None:
+            raise ImportError('backend highs precisa do pacote highspy')
+        super().__init__(instance, active)
+        self._build()
+        self.recorder: Optional[TrajectoryRecorder] = None
+        self.monitor: Optional[TerminationMonitor] = None
+
+    def _build(self):
+        instance = self.instance
+        nb_vars = self.columns.size
+        matrix = sp.vstack([assignment_matrix(instance, self.columns), capacity_matrix(instance, self.columns)]).tocsc()
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = nb_vars
+        lp.num_row_ = matrix.shape[0]
+        lp.sense_ = highspy.ObjSense.kMaximize
+        lp.col_cost_ = np.asarray(instance.profits, dtype=np.float64).ravel()[self.columns]
+        lp.col_lower_ = np.zeros(nb_vars)
+        lp.col_upper_ = np.ones(nb_vars)
+        lp.row_lower_ = np.concatenate([np.ones(instance.nb_tasks), np.full(instance.nb_agents, -highspy.kHighsInf)])
+        lp.row_upper_ = np.concatenate([np.ones(instance.nb_tasks), np.asarray(instance.totalCaps, dtype=np.float64)])
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = matrix.indptr
+        lp.a_matrix_.index_ = matrix.indices
+        lp.a_matrix_.value_ = matrix.data.astype(np.float64)
+        lp.integrality_ = [highspy.HighsVarType.kInteger] * nb_vars
+
+        self.lp = lp
+        self._new_solver()
+
+    def _callback(self, callback_type, message, data_out, data_in, user_data):
+        types = highspy.cb.HighsCallbackType
+        runtime = data_out.running_time
+        if callback_type == types.kCallbackMipImprovingSolution:
+            self.recorder.new_incumbent(runtime, data_out.objective_function_value, data_out.mip_dual_bound, data_out.mip_node_count)
+            if self.monitor is not None and self.monitor.shares_incumbent:
+                self.monitor.publish(data_out.objective_function_value, self._x_to_assignment(data_out.mip_solution))
+        elif callback_type == types.kCallbackMipUserSolution:
+            assignment = self.monitor.incoming(data_out.mip_primal_bound)
+            if assignment is not None:
+                data_in.setSolution(self._assignment_to_x(assignment))
+        elif callback_type == types.kCallbackMipInterrupt:
+            incumbent, bound, nodes = data_out.mip_primal_bound, data_out.mip_dual_bound, data_out.mip_node_count
+            if self.recorder.due(runtime):
+                self.recorder.iterations = data_out.simplex_iteration_count
+                self.recorder.sample(runtime, incumbent, bound, nodes, self.recorder.iterations)
+            if self.monitor is not None and self.monitor.check(runtime, incumbent, bound, nodes):
+                data_in.user_interrupt = True
+
+    def _new_solver(self):
+        self.highs = highspy.Highs()
+        self.highs.passModel(self.lp)
+        self.highs.setCallback(self._callback, None)
+
+    def reset(self):
+        # o relógio do Highs (getRunTime e running_time do callback) não zera entre run(): usa uma
+        # instância nova com o mesmo HighsLp
+        self._new_solver()
+
+    def configure(self, time_limit: float, threads: int, presolve: bool):
+        self.highs.setOptionValue('time_limit', float(time_limit))
+        self.highs.setOptionValue('threads', threads)
+        self.highs.setOptionValue('presolve', 'on' if presolve else 'off')
+
+    def set_start(self, assignment: np.ndarray):
+        solution = highspy.HighsSolution()
+        solution.col_value = self._assignment_to_x(assignment).tolist()
+        solution.value_valid = True
+        self.highs.setSolution(solution)
+
+    def add_columns(self, columns: np.ndarray):
+        # novo HighsLp com as colunas em ordem crescente (como no construtor)
+        self.columns = np.union1d(self.columns, columns)
+        self._build()
+
+    def best_assignment(self) -> Optional[np.ndarray]:
+        if self.highs.getInfo().primal_solution_status != highspy.SolutionStatus.kSolutionStatusFeasible:
+            return None
+        return self._x_to_assignment(self.highs.getSolution().col_value)
+
+    def version(self) -> str:
+        return backend_version(HIGHS)
+
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        self.recorder, self.monitor = recorder, monitor
+        types = highspy.cb.HighsCallbackType
+        self.highs.startCallback(types.kCallbackMipImprovingSolution)
+        self.highs.startCallback(types.kCallbackMipInterrupt)
+        sharing = monitor is not None and monitor.shares_incumbent
+        if sharing:
+            self.highs.startCallback(types.kCallbackMipUserSolution)
+        self.highs.run()
+        self.highs.stopCallback(types.kCallbackMipImprovingSolution)
+        self.highs.stopCallback(types.kCallbackMipInterrupt)
+        if sharing:
+            self.highs.stopCallback(types.kCallbackMipUserSolution)
+
+        info = self.highs.getInfo()
+        has_solution = info.primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible
+        result = InstanceResult(
+            instance=self.instance,
+            exec_time=self.highs.getRunTime(),
+            build_time=0.0,
+            status=highs_status_to_text(self.highs.getModelStatus(), None if monitor is None else monitor.stop_reason),
+            best_result=info.objective_function_value if has_solution else math.nan,
+            nb_explored_nodes=info.mip_node_count,
+            best_expected=_value_or_nan(info.mip_dual_bound),
+            gap=info.mip_gap if has_solution else math.inf
+        )
+        return result, info.simplex_iteration_count
+
+
+### PYTHON-MIP (CBC) ###
+
+def mip_status_to_text(status: 'mip.OptimizationStatus', stop_reason: Optional[str] = None) -> str:
+    statuses = mip.OptimizationStatus
+    if status == statuses.OPTIMAL: return "optimal solution"
+    elif status == statuses.FEASIBLE and stop_reason is not None: return f"early stop: {stop_reason}"
+    elif status == statuses.FEASIBLE: return "time limit reached"
+    elif status == statuses.NO_SOLUTION_FOUND: return "no solution found"
+    elif status in (statuses.INFEASIBLE, statuses.INT_INFEASIBLE): return "infeasible solution"
+    elif status == statuses.INF_OR_UNBD: return "inf. or unbd."
+    elif status == statuses.UNBOUNDED: return "unbounded result"
+    elif status == statuses.CUTOFF: return "cutoff"
+    elif status == statuses.LOADED: return "loaded"
+    else: return "numeric"
+
+
+class CoverCutGenerator(mip.ConstrsGenerator if mip is not None else object):
+    # gerador de cortes do python-mip: o modelo recebido é o pré-processado, as variáveis vêm do translate
+    def __init__(self, backend: 'MipBackend'):
+        self.backend = backend
+
+    def generate_constrs(self, model: 'mip.Model', depth: int = 0, npass: int = 0):
+        if not self.backend.separator.wants(depth):
+            return
+        x_vars = model.translate(list(self.backend.x))
+        values = np.array([0.0 if var is None else var.x for var in x_vars])
+        for positions, coeffs, rhs in self.backend.separator.separate(self.backend.columns, values):
+            variables = [x_vars[k] for k in positions]
+            if any(var is None for var in variables):
+                continue  # variável fixada e removida pelo pré-processamento
+            model += mip.LinExpr(variables=variables, coeffs=coeffs.tolist()) <= rhs
+
+
+class MipBackend(SolverBackend):
+    # python-mip não tem callback de solução utilizável com o CBC: a trajetória só tem o MIP start (no
+    # instante 0) e o resultado final, e da política de parada só o gap é aplicado (max_mip_gap).
+    name = CBC
+    supports_cover_cuts = True
+
+    def __init__(self, instance: Instance, active: Optional[np.ndarray] = None, solver_name: str = 'CBC'):
+        if mip is None:
+            raise ImportError('backend cbc precisa do pacote mip')
+        super().__init__(instance, active)
+        self.solver_name = solver_name
+        self.start_objective: Optional[float] = None
+        self.time_limit = math.inf
+        self._build()
+
+    def _build(self):
+        instance = self.instance
+        self.model = mip.Model(sense=mip.MAXIMIZE, solver_name=self.solver_name)
+
+        # vetor com um x por par ativo, criado de uma só vez; cada linha é montada direto a partir das
+        # listas de variáveis e coeficientes (sem somar termo a termo com xsum)
+        self.x = self.model.add_var_tensor((self.columns.size,), 'X', var_type=mip.BINARY)
+        agents, tasks = np.divmod(self.columns, instance.nb_tasks)
+        weights = np.asarray(instance.capacityReductions).ravel()[self.columns]
+
+        # Σ_{i=1}^m x_{ij} = 1, j = 1, 2, ..., n -> cada tarefa j só é executada por um agente
+        by_task = np.argsort(tasks, kind='stable')
+        for members in np.split(by_task, np.cumsum(np.bincount(tasks, minlength=instance.nb_tasks))[:-1]):
+            self.model.add_constr(mip.LinExpr(variables=list(self.x[members]), coeffs=[1] * members.size) == 1)
+
+        # Σ_{j=1}^n a_{ij} * x_{ij} <= cap_{i}, i = 1, 2, ..., m -> cada agente i não pode executar mais tarefas do que a sua capacidade
+        # (colunas em ordem crescente: as de cada agente são contíguas)
+        for i, members in enumerate(np.split(np.arange(self.columns.size), np.cumsum(np.bincount(agents, minlength=instance.nb_agents))[:-1])):
+            self.model.add_constr(mip.LinExpr(variables=list(self.x[members]), coeffs=weights[members].tolist()) <= int(instance.totalCaps[i]))
+
+        # Σ_{i=1}^m Σ_{j=1}^n ( c_{ij} * x_{ij} )
+        self.model.objective = mip.LinExpr(variables=list(self.x), coeffs=np.asarray(instance.profits).ravel()[self.columns].tolist())
+        if self.separator is not None:
+            self.model.cuts_generator = CoverCutGenerator(self)
+
+    def reset(self):
+        # descarta solução, MIP start e separador sem remontar o modelo; o CBC guarda o último MIP start
+        # até o próximo set_start, mas start_objective = None deixa a trajetória sem ele
+        self.model.reset()
+        self.model.start = None
+        self.model.cuts_generator = None
+        self.model.max_mip_gap = DEFAULT_MIP_GAP
+        self.separator = None
+        self.start_objective = None
+
+    def configure(self, time_limit: float, threads: int, presolve: bool):
+        self.time_limit = time_limit
+        self.model.threads = threads
+        self.model.preprocess = -1 if presolve else 0
+
+    def set_start(self, assignment: np.ndarray):
+        tasks = np.arange(assignment.size)
+        positions = np.searchsorted(self.columns, assignment * self.instance.nb_tasks + tasks)
+        self.model.start = [(self.x[k], 1.0) for k in positions]
+        self.start_objective = float(self.instance.profits[assignment, tasks].sum())
+
+    def add_columns(self, columns: np.ndarray):
+        # remonta o modelo (como o reset), mas mantém a separação de coberturas
+        self.columns = np.union1d(self.columns, columns)
+        self._build()
+        self.start_objective = None
+
+    def best_assignment(self) -> Optional[np.ndarray]:
+        if self.model.num_solutions == 0:
+            return None
+        return self._x_to_assignment([var.x for var in self.x])
+
+    def enable_cover_cuts(self):
+        self.separator = CoverSeparator(self.instance)
+        self.model.cuts_generator = CoverCutGenerator(self)
+
+    def version(self) -> str:
+        return f'{self.solver_name.lower()}-python-mip-{mip.__version__}'
+
+    def run(self, recorder: TrajectoryRecorder, monitor: Optional[TerminationMonitor]) -> Tuple[InstanceResult, float]:
+        if monitor is not None and monitor.policy.gap is not None:
+            self.model.max_mip_gap = monitor.policy.gap
+        if self.start_objective is not None:
+            recorder.new_incumbent(0.0, self.start_objective, NO_VALUE, 0)
+
+        solve_start = time.perf_counter()
+        status = self.model.optimize(max_seconds=self.time_limit)
+        exec_time = time.perf_counter() - solve_start
+
+        has_solution = self.model.num_solutions > 0
+        objective = self.model.objective_value if has_solution else math.nan
+        gap = self.model.gap if has_solution else math.inf
+        if monitor is not None and monitor.policy.gap is not None and status == mip.OptimizationStatus.FEASIBLE and gap <= monitor.policy.gap:
+            monitor.stop_reason = f'gap {gap * 100:.3f}% <= {monitor.policy.gap * 100:.3f}%'
+        if has_solution and (self.start_objective is None or objective > self.start_objective):
+            recorder.new_incumbent(exec_time, objective, NO_VALUE, math.nan)  # instante real desconhecido: limite superior
+
+        result = InstanceResult(
+            instance=self.instance,
+            exec_time=exec_time,
+            build_time=0.0,
+            status=mip_status_to_text(status, None if monitor is None else monitor.stop_reason),
+            best_result=objective,
+            nb_explored_nodes=math.nan,  # python-mip não informa
+            best_expected=_value_or_nan(self.model.objective_bound),
+            gap=gap
+        )
+        return result, math.nan
+
+
+BACKENDS: Dict[str, Type[SolverBackend]] = {
+    GUROBI: GurobiBackend,
+    HIGHS: HighsBackend,
+    CBC: MipBackend,
+}
+
+
+def make_backend(backend_name: str, instance: Instance, active: Optional[np.ndarray] = None) -> SolverBackend:
+    if backend_name not in BACKENDS:
+        raise ValueError(f'Backend desconhecido: {backend_name} (opções: {", ".join(BACKEND_NAMES)})')
+    return BACKENDS[backend_name](instance, active)
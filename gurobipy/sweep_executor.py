@@ -0,0 +1,63 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Optional
+
+### CLASSES E TIPOS ###
+
+# run: identifica o preset (Run do gurobipy ou apenas um nome); repetition começa em 0
+SweepJob = namedtuple('SweepJob', ['run', 'instance_name', 'repetition'])
+
+### FUNÇÕES ###
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS/Windows
+        return os.cpu_count() or 1
+
+
+def nb_workers(core_budget: Optional[int], threads_per_job: int) -> int:
+    # nb_workers * threads_per_job nunca passa do orçamento de núcleos
+    budget = core_budget if core_budget else available_cores()
+    return max(1, budget // max(1, threads_per_job))
+
+
+def run_sweep(jobs: Iterable[SweepJob],
+              solve_job: Callable[[SweepJob], Any],
+              write_result: Callable[[SweepJob, Any], None],
+              core_budget: Optional[int] = None,
+              threads_per_job: int = 1,
+              on_error: Optional[Callable[[SweepJob, BaseException], None]] = None) -> None:
+    # Os workers só resolvem; todos os resultados voltam para este processo, que é o único
+    # a escrever nos arquivos de resultado (sem appends concorrentes nos CSVs).
+    # solve_job precisa ser uma função de módulo (picklable) para rodar no pool.
+    jobs = list(jobs)
+    workers = min(nb_workers(core_budget, threads_per_job), max(1, len(jobs)))
+
+    def report_error(job: SweepJob, error: BaseException):
+        print(f'[ERROR] {job.instance_name} (repetição {job.repetition}): {error}')
+        if on_error is not None:
+            on_error(job, error)
+
+    if workers == 1:
+        for job in jobs:
+            try:
+                result = solve_job(job)
+            except Exception as e:
+                report_error(job, e)
+                continue
+            write_result(job, result)
+        return
+
+    print(f'[sweep] {len(jobs)} jobs em {workers} processos ({threads_per_job} thread(s) cada)')
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(solve_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                report_error(job, e)
+                continue
+            write_result(job, result)
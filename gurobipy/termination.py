@@ -0,0 +1,78 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from trajectory import NO_VALUE
+
+# Política de parada antecipada avaliada no callback do solver. Na maior parte das execuções de 180s
+# o gap para de mudar bem antes do limite de tempo; parar nesses pontos mantém a ordem entre os
+# presets e encurta o sweep.
+
+### CONSTANTES ###
+
+CHANGE_TOLERANCE = 1e-6  # variação relativa mínima para considerar que solução/limitante mudou
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class TerminationPolicy:
+    gap: Optional[float] = None          # para quando |limitante - solução| / |solução| <= gap
+    stall_seconds: Optional[float] = None  # ... quando solução e limitante não mudam por esse tempo
+    stall_nodes: Optional[float] = None    # ... ou por esse número de nós
+    work_limit: Optional[float] = None     # orçamento em work units (determinístico, aplicado pelo gurobi)
+
+
+class TerminationMonitor:
+    # shares_incumbent: o monitor também troca soluções com outras execuções (corrida do portfolio.py);
+    # os callbacks só chamam publish/incoming quando ele é True
+    shares_incumbent = False
+
+    def __init__(self, policy: TerminationPolicy):
+        self.policy = policy
+        self.incumbent = math.nan
+        self.bound = math.nan
+        self.last_change_time = 0.0
+        self.last_change_nodes = 0.0
+        self.stop_reason: Optional[str] = None
+
+    def _moved(self, incumbent: float, bound: float) -> bool:
+        def changed(old: float, new: float) -> bool:
+            if math.isnan(old):
+                return abs(new) < NO_VALUE
+            return abs(new - old) > CHANGE_TOLERANCE * max(1.0, abs(old))
+        return changed(self.incumbent, incumbent) or changed(self.bound, bound)
+
+    def check(self, runtime: float, incumbent: float, bound: float, nodes: float) -> Optional[str]:
+        # devolve o motivo da parada (texto curto, sem vírgulas por causa do CSV) ou None para continuar
+        policy = self.policy
+        if self.stop_reason is not None:
+            return self.stop_reason  # o solver ainda chama o callback algumas vezes depois do terminate
+        if self._moved(incumbent, bound):
+            self.incumbent = incumbent if abs(incumbent) < NO_VALUE else math.nan
+            self.bound = bound if abs(bound) < NO_VALUE else math.nan
+            self.last_change_time = runtime
+            self.last_change_nodes = nodes
+
+        if policy.gap is not None and not math.isnan(self.incumbent) and not math.isnan(self.bound) and self.incumbent != 0:
+            gap = abs(self.bound - self.incumbent) / abs(self.incumbent)
+            if gap <= policy.gap:
+                self.stop_reason = f'gap {gap * 100:.3f}% <= {policy.gap * 100:.3f}%'
+
+        # estagnação só conta depois da primeira solução (antes disso o solver ainda está no nó raiz)
+        if math.isnan(self.incumbent):
+            return self.stop_reason
+        if policy.stall_seconds is not None and runtime - self.last_change_time >= policy.stall_seconds:
+            self.stop_reason = f'no progress for {policy.stall_seconds:g}s'
+        if policy.stall_nodes is not None and nodes - self.last_change_nodes >= policy.stall_nodes:
+            self.stop_reason = f'no progress for {policy.stall_nodes:g} nodes'
+        return self.stop_reason
+
+    def publish(self, value: float, assignment: np.ndarray) -> None:
+        # nova solução (atribuição tarefa -> agente) encontrada por este solver
+        pass
+
+    def incoming(self, incumbent: float) -> Optional[np.ndarray]:
+        # solução melhor que `incumbent` vinda de fora, para o solver usar como incumbente (None se não houver)
+        return None
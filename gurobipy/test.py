@@ -1,11 +1,36 @@
 from collections import namedtuple
 import dataclasses
-from difflib import restore
 from enum import Enum, IntEnum
-from typing import Dict, List
-import gurobipy as gp
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import datetime
+import argparse
+import math
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from candidates import CandidateBackend
+from column_generation import BranchAndPriceBackend
+from gap_heuristic import HeuristicSolution, solve_heuristic
+from gap_results import InstanceResult
+from instance_features import extract_features
+from instance_loader import Instance, instance_hash, read_instance
+from lagrangian import solve_lagrangian
+from lns import run_lns
+from portfolio import run_race
+from preset_selector import leave_one_out, train_selector
+from reduction import Reduction, reduce_problem
+from results_store import (STORE_FILE, ResultsStore, export_results_file, export_selections_file, export_winners_file,
+                           import_missing_results)
+from run_ledger import LEDGER_FAILED, LEDGER_OK, is_done, ledger_key, load_ledger, record_ledger_entry
+from solver_backends import BACKEND_NAMES, BACKENDS, GUROBI, HIGHS, GurobiBackend, SolverBackend, backend_version, make_backend
+from sweep_executor import SweepJob, available_cores, nb_workers, run_sweep
+from termination import TerminationPolicy
+from thread_scaling import ScalingCases, load_scaling_points, print_scaling_summary, write_scaling_report
+from tuner import NB_CONFIGS, ConfigScore, RoundScores, sample_configurations, successive_halving, write_ranking
 
 ### CONSTANTES ###   
 INSTANCE_NAMES = ["d60900", "d201600", "d401600", "d801600", "e60900", "e801600"]
@@ -15,38 +40,36 @@ MAX_AGENTS = 80  # número máximo de agentes
 
 TIMES_TO_RUN_EACH_PRESET = 2
 
+THREADS_PER_JOB = 1  # threads do gurobi em cada execução; o executor nunca usa mais que núcleos / THREADS_PER_JOB processos
+WORKER_MODEL_CACHE_SIZE = 2  # modelos mantidos em memória por processo do pool
+
+LEDGER_FILE = 'results/ledger.jsonl'  # jobs já concluídos (permite retomar um sweep interrompido)
+
+TUNER_DIR = 'results/tuner'  # um CSV por configuração avaliada pelo tuner (repetição = rodada)
+TUNER_RANKING_FILE = 'results/tuner.csv'
+
+PORTFOLIO_FILE = 'results/portfolio.csv'  # melhor resultado de cada corrida de presets (portfolio.py)
+PORTFOLIO_WINNERS_FILE = 'results/portfolio_vencedores.csv'  # preset vencedor de cada corrida
+
+SELECTED_FILE = 'results/selecionado.csv'  # uma execução por instância com o preset escolhido (preset_selector.py)
+SELECTED_NAME = 'Selecionado (preset por instância)'
+SELECTED_PRESETS_FILE = 'results/selecionado_presets.csv'  # preset escolhido para cada instância
+SELECTED_LEDGER_FILE = 'results/ledger_selecionado.jsonl'  # o ledger do sweep já tem os mesmos (preset, instância)
+
+SCALING_FILE = 'results/escala_threads.csv'  # speedup e eficiência por (preset, instância, threads) (thread_scaling.py)
+SCALING_PRESETS = ['Default']  # presets do modo de escala (cada contagem de threads roda sozinha na máquina)
+
 ### CLASSES E TIPOS ###
 
-VarDict = Dict[int, Dict[int, gp.Var]]
 Run = namedtuple('Run', ['name', 'params', 'output_file'])
 
 
-@dataclass
-class Instance:
-    name: str
-    nb_agents: int
-    nb_tasks: int
-    profits: List[List[int]]
-    capacityReductions: List[List[int]]
-    totalCaps: List[int]
-
-# case_name, exec_time, sol_text, best_result, nb_explored_nodes, best_expected, gap
-@dataclass
-class InstanceResult:
-    instance: Instance
-    exec_time: float
-    status: int
-    best_result: float
-    nb_explored_nodes: int
-    best_expected: float
-    gap: float 
-
 class Method(IntEnum):
-    Auto = gp.GRB.METHOD_AUTO
-    PrimalSimplex = gp.GRB.METHOD_PRIMAL
-    DualSimplex = gp.GRB.METHOD_DUAL
-    Barrier = gp.GRB.METHOD_BARRIER
-    Concurrent = gp.GRB.METHOD_CONCURRENT
+    Auto = -1 # -1 = automatic setting (solver chooses the algorithm for the root relaxation)
+    PrimalSimplex = 0 # 0 = primal simplex
+    DualSimplex = 1 # 1 = dual simplex
+    Barrier = 2 # 2 = barrier
+    Concurrent = 3 # 3 = concurrent (several algorithms at once, first to finish wins)
 
 class Cuts(IntEnum):
     Auto = -1 # -1 = automatic setting (solver defines level of aggressiveness in the cut generation)
@@ -71,6 +94,12 @@ class VarBranch(IntEnum):
     MaximumInfeasibility = 2 # 2 = Maximum Infeasibility Branching
     Strong = 3 # 3 = Strong Branching
 
+# Engine escolhe a formulação: o modelo compacto em x_ij (resolvido pelo backend) ou o branch-and-price
+# sobre o mestre de Dantzig-Wolfe por agente (column_generation.py, LP mestre no HiGHS)
+class Engine(Enum):
+    Compact = 'compact'
+    BranchAndPrice = 'branch-and-price'
+
 @dataclass
 class SolverParams:
     presolve: bool
@@ -78,158 +107,98 @@ class SolverParams:
     cuts: Cuts
     var_branch: VarBranch
     branch_dir: BranchDir
+    mip_start: bool = True  # solução da heurística (gap_heuristic.py) como MIP start
+    termination: Optional[TerminationPolicy] = None  # parada antecipada; None = só o limite de tempo
+    time_limit: float = MAX_SECONDS
+    backend: str = GUROBI  # solver_backends.py; fora do gurobi só presolve, tempo e threads se aplicam
+    engine: Engine = Engine.Compact
+    reduce: bool = False  # reduction.py: modelo só com os pares que sobram da redução (opcional, antes de montar)
+    candidates: int = 0  # candidates.py: modelo esparso com os k melhores agentes por tarefa; 0 = todos os pares
+    cover_cuts: bool = False  # cover_cuts.py: coberturas levantadas separadas no callback (gurobi e cbc)
+    threads: int = THREADS_PER_JOB
+    concurrent_mip: int = 0  # ConcurrentMIP do gurobi: MIPs independentes (sementes diferentes) dividindo as threads
 
-### FUNÇÕES ###
-
-def read_instance(filename):
-    with open(filename, 'r') as input_reader:
-        first_line = input_reader.readline()
-        content_lines = input_reader.readlines()
-
-        agents_and_tasks = first_line.split(" ")
-        nb_agents = int(agents_and_tasks[0])
-        nb_tasks = int(agents_and_tasks[1])
-
-        profits = []
-        capacityReductions = []
-        totalCaps = []
-
-        for i in range(nb_agents):
-            profit_line = content_lines[i]
-            capRed_line = content_lines[i + nb_agents]
-
-            agent_profits = [int(profit)
-                                 for profit in profit_line.split(" ")[:-1]]
-            agent_capReds = [int(capRed)
-                                 for capRed in capRed_line.split(" ")[:-1]]
-
-            profits.append(agent_profits)
-            capacityReductions.append(agent_capReds)
-
-        total_cap_vec = content_lines[-1].split(" ")
-        for i in range(nb_agents):
-            totalCaps.append(int(total_cap_vec[i]))
-
-        return Instance(filename, nb_agents, nb_tasks, profits, capacityReductions, totalCaps)
-
-
-
-
-def insert_x_variables(model: gp.Model, instance: Instance) -> VarDict:
-    x_vars: VarDict = dict()
-    for i in range(instance.nb_agents):
-        x_vars[i] = dict()
-        for j in range(instance.nb_tasks):
-            x_vars[i][j] = model.addVar(vtype=gp.GRB.BINARY,
-                                      name="x_{}_{}".format(i, j))
-    return x_vars
-
-
-def insert_restrictions(model: gp.Model, instance: Instance, x_vars: VarDict) -> None:
-    # Σ_{i=1}^m x_{ij} = 1, j = 1, 2, ..., n -> cada tarefa j só é executada por um agente
-    for j in range(instance.nb_tasks):
-        model.addConstr(gp.quicksum(x_vars[i][j]
-                        for i in range(instance.nb_agents)) == 1)
-
-    # Σ_{j=1}^n a_{ij} * x_{ij} <= cap_{i}, i = 1, 2, ..., m -> cada agente i não pode executar mais tarefas do que a sua capacidade
-    for i in range(instance.nb_agents):
-        agent_capReds = instance.capacityReductions[i]
-        model.addConstr(gp.quicksum(x_vars[i][j] * agent_capReds[j]
-                        for j in range(instance.nb_tasks)) <= instance.totalCaps[i])
-
-    # x_{ij} E {0,1}, i = 1, 2, ..., n; j = 1, 2, ..., n -> restrição garantida pelo var_type=BINARY ao criar a variável de decisão
-    ###
-
+@dataclass
+class CachedModel:
+    instance: Instance
+    backend: SolverBackend
+    build_time: float = 0.0
+    heuristic: Optional[HeuristicSolution] = None   # calculada uma vez por instância, só quando algum preset usa MIP start ou redução
+    reduction: Optional[Reduction] = None
 
-def insert_objective(model: gp.Model, instance: Instance, x: VarDict):
-    model.setObjective(
+ModelCache = Dict[str, CachedModel]
 
-        gp.quicksum(
-            instance.profits[i][j] * x[i][j]
-                for i in range(instance.nb_agents)
-                    for j in range(instance.nb_tasks)
-        ),
-        gp.GRB.MAXIMIZE
-    )
+### FUNÇÕES ###
 
+def apply_solver_params(backend: SolverBackend, solver_params: SolverParams) -> None:
+    backend.configure(solver_params.time_limit, solver_params.threads, solver_params.presolve)
+    if isinstance(backend, CandidateBackend):
+        backend = backend.inner  # parâmetros do gurobi vão no modelo esparso
+    if solver_params.cover_cuts:
+        backend.enable_cover_cuts()
+    if not isinstance(backend, GurobiBackend):
+        return
+
+    params = {'Method': solver_params.method, 'Cuts': solver_params.cuts,
+              'VarBranch': solver_params.var_branch, 'BranchDir': solver_params.branch_dir}
+    if solver_params.concurrent_mip:
+        params['ConcurrentMIP'] = solver_params.concurrent_mip
+    if solver_params.termination is not None and solver_params.termination.work_limit is not None:
+        params['WorkLimit'] = solver_params.termination.work_limit
+    backend.set_params(params)
+
+
+def setup_instance_model(instance: Instance, solver_params: SolverParams, active: Optional[np.ndarray] = None) -> SolverBackend:
+    if solver_params.engine == Engine.BranchAndPrice:
+        backend = BranchAndPriceBackend(instance, active)
+    elif solver_params.candidates:
+        backend = CandidateBackend(solver_params.backend, instance, active, solver_params.candidates)
+    else:
+        backend = make_backend(solver_params.backend, instance, active)
+
+    apply_solver_params(backend, solver_params)
+    return backend
+
+
+def get_cached_model(model_cache: ModelCache, instance_name: str, solver_params: SolverParams, max_size: int = 0) -> CachedModel:
+    cache_key = f'{solver_params.backend}:{solver_params.engine.value}:{"reduced" if solver_params.reduce else "full"}:{solver_params.candidates}:{instance_name}'
+    cached = model_cache.get(cache_key)
+
+    heuristic = None
+    if cached is None:
+        if max_size and len(model_cache) >= max_size:
+            # descarta o modelo mais antigo (dict preserva a ordem de inserção)
+            model_cache.pop(next(iter(model_cache))).backend.dispose()
 
-def setup_instance_model(instance: Instance, solver_params: SolverParams) -> gp.Model:
-    model = gp.Model()
-
-    x_vars = insert_x_variables(model, instance)
-    insert_restrictions(model, instance, x_vars)
-    insert_objective(model, instance, x_vars)
-    # model.setParam('OutputFlag', False)
-
-    model.setParam(gp.GRB.param.Presolve, 1 if solver_params.presolve else 0)
-    model.setParam(gp.GRB.param.Method, solver_params.method)
-    model.setParam(gp.GRB.param.TimeLimit, MAX_SECONDS)
-    model.setParam(gp.GRB.param.Threads, 1)
-    model.setParam(gp.GRB.param.Cuts, solver_params.cuts)
-    model.setParam(gp.GRB.param.BranchDir, solver_params.branch_dir)
-    return model
-
-def try_pass(lmbd):
-    try:
-        lmbd()
-    except Exception as e:
-        print("[ERROR] try_print Exception: {}".format(e))
-        pass
-
-
-def solve_instance(instance: Instance, model: gp.Model) -> InstanceResult:
-    model.optimize()
-
-    '''
-    # Principais resultados
-    print("\tValor da função objetivo: {}".format(model.objVal))
-    try_pass(lambda: print(f'gp.GRB.Attr.MIPGap: {model.getAttr(gp.GRB.Attr.MIPGap)}')) # GAP
-    try_pass(lambda: print(f'gp.GRB.Attr.MaxBound: {model.getAttr(gp.GRB.Attr.MaxBound)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.NodeCount: {model.getAttr(gp.GRB.Attr.NodeCount)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.MinBound: {model.getAttr(gp.GRB.Attr.MinBound)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.MinCoeff: {model.getAttr(gp.GRB.Attr.MinCoeff)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.Runtime: {model.getAttr(gp.GRB.Attr.Runtime)}')) # Exec time
-    # try_pass(lambda: print(f'gp.GRB.Attr.Obj: {model.getAttr(gp.GRB.Attr.Obj)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.ObjBound: {model.getAttr(gp.GRB.Attr.ObjBound)}')) # limitante dual
-    try_pass(lambda: print(f'gp.GRB.Attr.ObjVal: {model.getAttr(gp.GRB.Attr.ObjVal)}')) # melhor resultado até agora
-    try_pass(lambda: print(f'gp.GRB.Attr.IterCount: {model.getAttr(gp.GRB.Attr.IterCount)}')) # número de iterações do simplex (nós explorados)
-    # try_pass(lambda: print(f'gp.GRB.Attr.BranchPriority: {model.getAttr(gp.GRB.Attr.BranchPriority)}'))
-    try_pass(lambda: print(f'gp.GRB.Attr.Status: {model.getAttr(gp.GRB.Attr.Status)}'))
-
-    # Resultados secundários
-    # try_pass(lambda: print(f'gp.GRB.Attr.IsMIP: {model.getAttr(gp.GRB.Attr.IsMIP)}'))
-    '''
-
-    instance_result = InstanceResult(
-        instance=instance,
-        exec_time=model.getAttr(gp.GRB.Attr.Runtime),
-        status=model.getAttr(gp.GRB.Attr.Status),
-        best_result=model.getAttr(gp.GRB.Attr.ObjVal),
-        nb_explored_nodes=model.getAttr(gp.GRB.Attr.NodeCount),
-        best_expected=model.getAttr(gp.GRB.Attr.ObjBound),
-        gap=model.getAttr(gp.GRB.Attr.MIPGap)
-    )
+        instance = read_instance(f"instances/{instance_name}.in")
+        if solver_params.reduce:
+            # a redução precisa de uma solução conhecida: a heurística roda antes (cobrada no orçamento do job)
+            heuristic = solve_heuristic(instance)
+
+    # tempo de construção (ou de reaproveitamento) do modelo medido à parte do Runtime do solver
+    build_start = time.perf_counter()
+    if cached is None:
+        reduction = None
+        if solver_params.reduce:
+            reduction = reduce_problem(instance, None if heuristic is None else heuristic.objective)
+        active = None if reduction is None else reduction.active
+        cached = CachedModel(instance, setup_instance_model(instance, solver_params, active), heuristic=heuristic, reduction=reduction)
+        model_cache[cache_key] = cached
+    else:
+        # mesmo modelo, sem solução/MIP start anterior e apenas com os parâmetros do novo preset
+        cached.backend.reset()
+        apply_solver_params(cached.backend, solver_params)
+    cached.build_time = time.perf_counter() - build_start
+
+    return cached
+
+def solve_instance(instance: Instance, backend: SolverBackend, build_time: float = 0.0, time_offset: float = 0.0,
+                   termination: Optional[TerminationPolicy] = None) -> InstanceResult:
+    # time_offset: tempo gasto antes do solver (heurística do MIP start), somado à linha do tempo
+    instance_result = backend.solve(time_offset, termination)
+    instance_result.build_time = build_time
     return instance_result
 
-def status_to_text(status: int):
-    if status == gp.GRB.Status.CUTOFF: return "cutoff"
-    elif status == gp.GRB.Status.INFEASIBLE: return "infeasible solution"
-    elif status == gp.GRB.Status.INF_OR_UNBD: return "inf. or unbd."
-    elif status == gp.GRB.Status.INPROGRESS: return "inprogress"
-    elif status == gp.GRB.Status.INTERRUPTED: return "interrupted execution"
-    elif status == gp.GRB.Status.ITERATION_LIMIT: return "iteration limit reached"
-    elif status == gp.GRB.Status.LOADED: return "loaded"
-    elif status == gp.GRB.Status.NODE_LIMIT: return "node limit reached"
-    elif status == gp.GRB.Status.NUMERIC: return "numeric"
-    elif status == gp.GRB.Status.OPTIMAL: return "optimal solution"
-    elif status == gp.GRB.Status.SOLUTION_LIMIT: return "solution qty. limit reached"
-    elif status == gp.GRB.Status.SUBOPTIMAL: return "suboptimal solution"
-    elif status == gp.GRB.Status.TIME_LIMIT: return "time limit reached"
-    elif status == gp.GRB.Status.UNBOUNDED: return "unbounded result"
-    elif status == gp.GRB.Status.USER_OBJ_LIMIT: return "user obj. limit reached"
-    elif status == gp.GRB.Status.WORK_LIMIT: return "work limit reached"
-    else: raise ValueError(f'Unknown status: {status}')
-
 def test_first_instance():
     instance = read_instance(f'instances/{INSTANCE_NAMES[0]}.in')
 
@@ -241,47 +210,417 @@ def test_first_instance():
     print(f'\tÚltima redCap: {instance.capacityReductions[-1][-1]}')
     print(f'\tÚltima totalCap: {instance.totalCaps[-1]}')
 
-# model = setup_instance_model(instance)
-# solve_instance(instance, model)
-
-def write_instance_result(result: InstanceResult, output_file_name: str):
-    solution_text = status_to_text(result.status)
-    curr_date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    #           data_atual,        caso_teste,          tempo_total,      conclusao,     melhor_resultado,       num_nos_explorados,       limitante_dual,       gap
-    line = f'{curr_date_str},{result.instance.name},{result.exec_time:.3f},{solution_text},{result.best_result:.3f},{result.nb_explored_nodes:.0f},{result.best_expected:.3f},{result.gap * 100:.3f}'
-
-    with open(output_file_name, 'a') as output_file:
-        output_file.write(line + '\n')
-        output_file.flush()
-    
-    return
-
-def init_results_file(preset_name: str, output_file_name):
-    zero_line = "Preset usado: " + preset_name
-    first_line = 'data_atual,caso_teste,tempo_total,conclusao,melhor_resultado,num_nos_explorados,limitante_dual,gap(%)'
-
-    with open(output_file_name, 'a') as output_file:
-        output_file.write(zero_line + '\n')
-        output_file.write(first_line + '\n')
-
-    return
-
-def run_all_instances_with_params(run: Run):
-    init_results_file(run.name, run.output_file)
-
-    solver_params = run.params
+# cache de modelos do processo atual (cada worker do pool tem o seu)
+_worker_model_cache: ModelCache = dict()
+
+def solve_job(job: SweepJob) -> InstanceResult:
+    print("\n\tInstância: {} ({}, repetição {})\n".format(job.instance_name, job.run.name, job.repetition))
+
+    params = job.run.params
+    cached = get_cached_model(_worker_model_cache, job.instance_name, params, WORKER_MODEL_CACHE_SIZE)
+
+    if params.mip_start and cached.heuristic is None:
+        cached.heuristic = solve_heuristic(cached.instance)
+        if cached.heuristic is not None:
+            print(f'\tHeurística: {cached.heuristic.objective:.0f} ({cached.heuristic.elapsed:.2f}s)')
+
+    if cached.reduction is not None:
+        reduction = cached.reduction
+        print(f'\tRedução: {reduction.nb_removed_variables} variáveis e {reduction.nb_removed_nonzeros} não nulos removidos '
+              f'({reduction.nb_infeasible_pairs} pares impossíveis, {reduction.nb_fixed_zero} x_ij = 0 e {reduction.nb_fixed_tasks} tarefas fixadas por custo reduzido, {reduction.elapsed:.2f}s)')
+
+    if isinstance(cached.backend, CandidateBackend):
+        stats = cached.backend.stats
+        print(f'\tCandidatos: {stats.nb_initial} pares iniciais, {stats.nb_priced_lp} pelo pricing do LP ({stats.pricing_time:.2f}s)')
+
+    time_offset = 0.0
+    if params.mip_start and cached.heuristic is not None:
+        # o reset do get_cached_model já descartou o MIP start da execução anterior
+        cached.backend.set_start(cached.heuristic.assignment)
+    if (params.mip_start or params.reduce) and cached.heuristic is not None:
+        time_offset = cached.heuristic.elapsed
+        # a heurística sai do orçamento do job: heurística + solver cabem no time_limit do preset
+        cached.backend.configure(max(params.time_limit - time_offset, 0.0), params.threads, params.presolve)
+
+    result = solve_instance(cached.instance, cached.backend, cached.build_time, time_offset, params.termination)
+    if isinstance(cached.backend, CandidateBackend):
+        stats = cached.backend.stats
+        print(f'\tCandidatos: {stats.nb_priced_mip} pares entraram depois do MIP ({stats.nb_rounds} execuções), {int(cached.backend.candidates.sum())} no modelo')
+    separator = (cached.backend.inner if isinstance(cached.backend, CandidateBackend) else cached.backend).separator
+    if separator is not None:
+        stats = separator.stats
+        print(f'\tCoberturas: {stats.nb_cuts} cortes em {stats.nb_calls} chamadas ({stats.separation_time:.2f}s, {stats.nb_timeouts} no limite de tempo)')
+    if cached.reduction is not None:
+        result.removed_variables = cached.reduction.nb_removed_variables
+        result.removed_nonzeros = cached.reduction.nb_removed_nonzeros
+    return result
+
+def solver_params_to_dict(solver_params: SolverParams) -> Dict[str, object]:
+    params = dataclasses.asdict(solver_params)
+    return {name: (value.name if isinstance(value, Enum) else value) for name, value in params.items()}
+
+def instances_by_size() -> Dict[str, Instance]:
+    # maiores instâncias primeiro (melhor balanceamento); os jobs são agrupados por instância nessa
+    # ordem para que os workers reaproveitem os modelos em cache
+    instances = {name: read_instance(f"instances/{name}.in") for name in INSTANCE_NAMES}
+    return dict(sorted(instances.items(), key=lambda item: item[1].nb_agents * item[1].nb_tasks, reverse=True))
+
+def lagrangian_bounds(instances: Dict[str, Instance]) -> Dict[str, float]:
+    # limitante lagrangiano de cada instância, calculado uma vez no processo principal (fora dos jobs)
+    bounds = dict()
+    for instance_name, instance in instances.items():
+        lagrangian = solve_lagrangian(instance)
+        print(f'\t{instance_name}: limitante lagrangiano {lagrangian.bound} ({lagrangian.iterations} iterações, {lagrangian.elapsed:.2f}s)')
+        bounds[instance_name] = lagrangian.bound
+    return bounds
+
+def run_all_presets(runs: List[Run], core_budget: Optional[int] = None, resume: bool = True,
+                    selection: Optional[Dict[str, Run]] = None, ledger_file: str = LEDGER_FILE,
+                    lagrangian: bool = False, threads_per_job: int = THREADS_PER_JOB):
+    # selection: instância -> único run a executar nela (seletor de presets); None = todos os runs
+    # threads_per_job: threads do job mais largo (o executor roda no máximo core_budget / threads_per_job jobs)
+    # lagrangian: grava também o limitante lagrangiano de cada instância (opcional: custa segundos por instância)
+    instances = instances_by_size()
+    instance_names = list(instances)
+    instance_hashes = {name: instance_hash(instance) for name, instance in instances.items()}
+    versions = {name: backend_version(name) for name in {run.params.backend for run in runs}}
+
+    def job_key(job: SweepJob) -> str:
+        return ledger_key(instance_hashes[job.instance_name], solver_params_to_dict(job.run.params),
+                          job.run.params.time_limit, job.repetition, versions[job.run.params.backend])
+
+    all_jobs = [SweepJob(run, instance_name, repetition)
+                for instance_name in instance_names
+                for run in (runs if selection is None else [selection[instance_name]])
+                for repetition in range(TIMES_TO_RUN_EACH_PRESET)]
+
+    # só roda o que ainda não foi concluído (jobs que falharam ou foram interrompidos rodam de novo)
+    ledger = load_ledger(ledger_file) if resume else dict()
+    jobs = [job for job in all_jobs if not is_done(ledger, job_key(job))]
+    if len(jobs) < len(all_jobs):
+        print(f'[ledger] {len(all_jobs) - len(jobs)} de {len(all_jobs)} jobs já concluídos em {ledger_file}')
+
+    bounds = lagrangian_bounds({name: instances[name] for name in dict.fromkeys(job.instance_name for job in jobs)}) if lagrangian else dict()
+
+    def write_job_result(job: SweepJob, result: InstanceResult):
+        result.lagrangian_bound = bounds.get(job.instance_name)
+        # o job só conta como concluído depois que o lote com o resultado foi gravado no banco
+        store.add(result, job.run.name, solver_params_to_dict(job.run.params), instance_hashes[job.instance_name],
+                  job.repetition, job.run.params.time_limit,
+                  on_commit=partial(record_ledger_entry, ledger, ledger_file, job_key(job), LEDGER_OK))
+
+    def record_job_failure(job: SweepJob, error: BaseException):
+        record_ledger_entry(ledger, ledger_file, job_key(job), LEDGER_FAILED)
+
+    label = None if selection is None else SELECTED_NAME
+    with ResultsStore(STORE_FILE) as store:
+        for output_file, names in runs_by_file(runs).items():
+            import_missing_results(store, output_file, label or names[0])
+        run_sweep(jobs, solve_job, write_job_result, core_budget, threads_per_job, on_error=record_job_failure)
+    export_results(runs, label)
+
+def runs_by_file(runs: List[Run]) -> Dict[str, List[str]]:
+    files: Dict[str, List[str]] = dict()
+    for run in runs:
+        files.setdefault(run.output_file, []).append(run.name)
+    return files
+
+def export_results(runs: List[Run], label: Optional[str] = None):
+    # os CSVs de resultados são gerados a partir do banco, um por arquivo de saída dos runs; label: nome
+    # do arquivo quando vários runs gravam nele (e preset dos resultados importados de um CSV antigo)
+    connection = sqlite3.connect(STORE_FILE)
+    for output_file, names in runs_by_file(runs).items():
+        export_results_file(connection, names + ([label] if label else []), output_file, label)
+    connection.close()
+
+def select_presets(runs: List[Run]) -> Dict[str, Run]:
+    # seletor treinado com os CSVs dos runs (o histórico do sweep) escolhe um run por instância
+    selector = train_selector({run.name: run.output_file for run in runs},
+                              lambda instance_name: read_instance(f"instances/{instance_name}.in"))
+    print(f'\nSeletor treinado com {len(selector.instance_names)} instâncias: ' + ', '.join(selector.instance_names))
+    for instance_name, chosen, best, regret in leave_one_out(selector):
+        print(f'\t[leave-one-out] {instance_name}: {chosen} (melhor: {best}, {regret:+.3f} p.p. de gap)')
+
+    runs_by_name = {run.name: run for run in runs}
+    # mesmos sufixos do Default (ex.: results/default_highs.csv -> results/selecionado_highs.csv)
+    suffix = os.path.basename(runs[0].output_file)[len('default'):]
+    output_file = SELECTED_FILE.replace('.csv', suffix)
+    presets_file = SELECTED_PRESETS_FILE.replace('.csv', suffix)
+    label = os.path.splitext(os.path.basename(presets_file))[0]  # escolhas do mesmo backend no banco
+
+    selection: Dict[str, Run] = dict()
+    with ResultsStore(STORE_FILE) as store:
+        for instance_name, instance in instances_by_size().items():
+            start = time.perf_counter()
+            features = extract_features(instance)
+            feature_time = time.perf_counter() - start
+            run = runs_by_name[selector.select(features.as_vector())]
+            # nome próprio no banco: não se mistura com o histórico do sweep do mesmo preset
+            selection[instance_name] = Run(f'{run.name} (selecionado)', run.params, output_file)
+            print(f'\t{instance_name}: {run.name} (características em {feature_time * 1000:.1f} ms)')
+            store.add_selection(label, instance_name, run.name, feature_time)
+        export_selections_file(store.connection, label, presets_file)
+    return selection
+
+def compare_cover_cuts(runs: List[Run]):
+    # limitante dual e vazão de nós (nós/s) médios por instância, no banco de resultados: presets sem e com
+    # as coberturas, com o mesmo limite de tempo (linhas importadas de CSVs antigos não têm limite gravado)
+    connection = sqlite3.connect(STORE_FILE)
+    def mean_values(preset: str, time_limit: float) -> Dict[str, Tuple[float, float, int]]:
+        rows = connection.execute(
+            'SELECT instance, AVG(best_expected), AVG(nb_explored_nodes / MAX(exec_time, 1e-9)), COUNT(*) FROM results '
+            'WHERE preset = ? AND (time_limit = ? OR time_limit IS NULL) GROUP BY instance', (preset, time_limit)).fetchall()
+        return {instance: (bound, nodes_per_second, count) for instance, bound, nodes_per_second, count in rows}
+
+    names = [run.name.replace(' (coberturas)', '') for run in runs] + [run.name for run in runs]
+    time_limits = [run.params.time_limit for run in runs] * 2
+    columns = [(name, mean_values(name, time_limit)) for name, time_limit in zip(names, time_limits)]
+    connection.close()
+
+    print('\nLimitante dual médio (nós/s, execuções) por instância')
+    print(f'{"instância":>12} ' + ' '.join(f'{name:>36}' for name, _ in columns))
     for instance_name in INSTANCE_NAMES:
-        print("\n\tInstância: {}\n".format(instance_name))
-
-        instance = read_instance(f"instances/{instance_name}.in")
-        model = setup_instance_model(instance, solver_params)
-        result = solve_instance(instance, model)
-        write_instance_result(result, run.output_file)
+        cells = [f'{values[instance_name][0]:.1f} ({values[instance_name][1]:.0f}/s, {values[instance_name][2]})'
+                 if instance_name in values else '-' for _, values in columns]
+        print(f'{instance_name:>12} ' + ' '.join(f'{cell:>36}' for cell in cells))
+
+def run_thread_scaling(runs: List[Run], thread_counts: List[int], concurrent_mip: int = 0, resume: bool = True):
+    # cada (preset, instância, threads) roda sozinho (um job por vez): os números não disputam núcleos
+    scaling_runs: List[Run] = []
+    cases: ScalingCases = dict()
+    for run in runs:
+        for threads in thread_counts:
+            configurations = [0] + ([concurrent_mip] if concurrent_mip and threads >= concurrent_mip else [])
+            for concurrent in configurations:
+                name = f'{run.name} [{threads} threads' + (f', ConcurrentMIP {concurrent}]' if concurrent else ']')
+                suffix = f'_{threads}t' + (f'_concurrent{concurrent}' if concurrent else '')
+                scaling_runs.append(Run(name, dataclasses.replace(run.params, threads=threads, concurrent_mip=concurrent),
+                                        run.output_file.replace('.csv', f'{suffix}.csv')))
+                cases[name] = (run.name, threads, concurrent)
+
+    print('\nEscala por threads: ' + ', '.join(run.name for run in scaling_runs))
+    # orçamento e largura do job iguais à maior contagem: um job por vez, e o maior tem todos os núcleos
+    max_threads = max(thread_counts)
+    run_all_presets(scaling_runs, max_threads, resume, threads_per_job=max_threads)
+
+    connection = sqlite3.connect(STORE_FILE)
+    points = load_scaling_points(connection, cases, runs[0].params.time_limit)
+    connection.close()
+    output_file = SCALING_FILE.replace('.csv', os.path.basename(runs[0].output_file)[len('default'):])
+    write_scaling_report(points, output_file)
+    print_scaling_summary(points)
+    print(f'\nRelatório por instância em {output_file}')
+
+def setup_lns_model(instance: Instance, active: np.ndarray, time_limit: float, solver_params: SolverParams) -> SolverBackend:
+    # sub-MIP do LNS: mesmo modelo e parâmetros do preset, só com os pares livres da vizinhança
+    return setup_instance_model(instance, dataclasses.replace(solver_params, time_limit=time_limit), active)
+
+def run_lns_presets(run: Run, core_budget: Optional[int] = None) -> Run:
+    # LNS (lns.py) com o mesmo tempo de parede do preset (a heurística sai do limite de tempo, como no
+    # sweep), usando todos os núcleos para os sub-MIPs; compara com a execução única do preset
+    lns_run = Run(run.name + ' (LNS)', run.params, run.output_file.replace('.csv', '_lns.csv'))
+    output_file = lns_run.output_file
+    builder = partial(setup_lns_model, solver_params=run.params)
+    workers = nb_workers(core_budget, THREADS_PER_JOB)
+    store = ResultsStore(STORE_FILE)
+    import_missing_results(store, output_file, lns_run.name)
+    for instance_name, instance in instances_by_size().items():
+        for repetition in range(TIMES_TO_RUN_EACH_PRESET):
+            print(f'\n\tInstância: {instance_name} (LNS, repetição {repetition}, {workers} processos)\n')
+            heuristic = solve_heuristic(instance)
+            if heuristic is None:
+                print('\t[ERROR] LNS sem solução inicial: a heurística não achou solução viável')
+                continue
+            lagrangian = solve_lagrangian(instance, heuristic.objective)
+            result, stats = run_lns(instance, builder, heuristic.assignment, max(run.params.time_limit - heuristic.elapsed, 0.0), workers,
+                                    lagrangian.bound, heuristic.elapsed, seed=repetition)
+            result.solver = f'lns-{backend_version(run.params.backend)}'
+            print(f'\tLNS: {result.best_result:.0f} (heurística {heuristic.objective:.0f}); sub-MIPs {stats.nb_subproblems}, melhorias {stats.nb_improvements}')
+            store.add(result, lns_run.name, solver_params_to_dict(run.params), instance_hash(instance), repetition, run.params.time_limit)
+    store.close()
+    export_results([lns_run])
+    return lns_run
+
+def compare_results(baseline: Run, lns: Run):
+    # melhor solução média por instância (no banco de resultados): execução única do preset x LNS
+    connection = sqlite3.connect(STORE_FILE)
+    def mean_best(preset: str) -> Dict[str, float]:
+        return dict(connection.execute('SELECT instance, AVG(best_result) FROM results WHERE preset = ? GROUP BY instance', (preset,)).fetchall())
+    baseline_best, lns_best = mean_best(baseline.name), mean_best(lns.name)
+    connection.close()
+
+    if not baseline_best:
+        print(f'\nSem execuções de {baseline.name} para comparar (rode o preset primeiro)')
+        return
+    print(f'\n{"instância":>12} {baseline.name:>24} {lns.name:>24}')
+    for name in lns_best:
+        baseline_text = f'{baseline_best[name]:.1f}' if name in baseline_best else '-'
+        print(f'{name:>12} {baseline_text:>24} {lns_best[name]:>24.1f}')
+
+def setup_portfolio_model(instance: Instance, solver_params: SolverParams, time_offset: float = 0.0) -> SolverBackend:
+    # time_offset: tempo da heurística do MIP start, descontado do limite de tempo (como no sweep)
+    backend = setup_instance_model(instance, solver_params)
+    backend.configure(max(solver_params.time_limit - time_offset, 0.0), 1, solver_params.presolve)  # Threads=1 em cada processo da corrida
+    return backend
+
+def run_portfolio(runs: List[Run], core_budget: Optional[int] = None, lagrangian: bool = False):
+    # corrida dos presets em cada instância: um processo por preset, até o número de núcleos
+    nb_presets = min(len(runs), nb_workers(core_budget, 1))
+    if nb_presets < len(runs):
+        print(f'[portfolio] {core_budget} núcleos: só os {nb_presets} primeiros presets entram na corrida')
+    runs = runs[:nb_presets]
+    suffix = '' if runs[0].params.backend == GUROBI else f'_{runs[0].params.backend}'
+    output_file = PORTFOLIO_FILE.replace('.csv', f'{suffix}.csv')
+    winners_file = PORTFOLIO_WINNERS_FILE.replace('.csv', f'{suffix}.csv')
+    portfolio_run = Run('Portfolio' + suffix, runs[0].params, output_file)
+
+    store = ResultsStore(STORE_FILE)
+    import_missing_results(store, output_file, portfolio_run.name)
+    for instance_name, instance in instances_by_size().items():
+        bounds = lagrangian_bounds({instance_name: instance}) if lagrangian else dict()
+        for repetition in range(TIMES_TO_RUN_EACH_PRESET):
+            print(f'\n\tInstância: {instance_name} (portfolio, repetição {repetition}, {nb_presets} presets)\n')
+            heuristic = solve_heuristic(instance) if runs[0].params.mip_start else None
+            heuristic_time = 0.0 if heuristic is None else heuristic.elapsed
+            builders = {run.name: partial(setup_portfolio_model, instance, run.params, heuristic_time) for run in runs}
+            race = run_race(instance, builders,
+                            None if heuristic is None else heuristic.assignment,
+                            -math.inf if heuristic is None else heuristic.objective,
+                            heuristic_time, runs[0].params.termination)
+            result = race.result
+            result.lagrangian_bound = bounds.get(instance_name)
+            for name, run_result in race.runs.items():
+                print(f'\t{name}: {run_result.best_result:.0f} / {run_result.best_expected:.1f} ({run_result.status}, {run_result.exec_time:.1f}s)')
+            print(f'\tVencedor: {race.winner} ({result.status}, {result.exec_time:.1f}s)')
+
+            store.add(result, portfolio_run.name, {'presets': [run.name for run in runs], 'winner': race.winner},
+                      instance_hash(instance), repetition, runs[0].params.time_limit)
+    store.close()
+    export_results([portfolio_run])
+    connection = sqlite3.connect(STORE_FILE)
+    export_winners_file(connection, portfolio_run.name, winners_file)
+    connection.close()
+
+def config_name(params: SolverParams) -> str:
+    presolve = 'presolve' if params.presolve else 'sem_presolve'
+    return f'{presolve}_{params.method.name}_{params.cuts.name}_{params.var_branch.name}_{params.branch_dir.name}'
+
+def tune_presets(base_params: SolverParams, presets: List[SolverParams], nb_configs: int = NB_CONFIGS,
+                 core_budget: Optional[int] = None) -> List[ConfigScore]:
+    # sorteia configurações do espaço completo (os presets atuais sempre entram) e as compara por
+    # successive halving (tuner.py); o orçamento da última rodada é o MAX_SECONDS do sweep
+    space = [(True, False), list(Method), list(Cuts), list(VarBranch), list(BranchDir)]
+    required = [(p.presolve, p.method, p.cuts, p.var_branch, p.branch_dir) for p in presets]
+    configs: Dict[str, SolverParams] = dict()
+    for presolve, method, cuts, var_branch, branch_dir in sample_configurations(space, nb_configs, required=required):
+        params = dataclasses.replace(base_params, presolve=presolve, method=method, cuts=cuts, var_branch=var_branch, branch_dir=branch_dir)
+        configs[config_name(params)] = params
+
+    instance_names = list(instances_by_size())
+    os.makedirs(TUNER_DIR, exist_ok=True)
+    cpu_seconds = 0.0
+
+    def evaluate(round_configs: Dict[str, SolverParams], budget: float, round_index: int) -> RoundScores:
+        nonlocal cpu_seconds
+        runs = [Run(name, dataclasses.replace(params, time_limit=budget), os.path.join(TUNER_DIR, name + '.csv'))
+                for name, params in round_configs.items()]
+        results: Dict[str, List[InstanceResult]] = {run.name: [] for run in runs}
+        def write_job_result(job: SweepJob, result: InstanceResult):
+            nonlocal cpu_seconds
+            store.add(result, job.run.name, solver_params_to_dict(job.run.params), instance_hash(result.instance),
+                      job.repetition, job.run.params.time_limit)
+            results[job.run.name].append(result)
+            cpu_seconds += result.exec_time
+
+        jobs = [SweepJob(run, instance_name, round_index) for instance_name in instance_names for run in runs]
+        run_sweep(jobs, solve_job, write_job_result, core_budget, THREADS_PER_JOB)
+        store.flush()
+        export_results(runs)
+
+        # configuração que falhou em alguma instância fica sem nota (é descartada)
+        return {name: (float(np.mean([r.gap for r in rs])), float(np.mean([r.primal_integral for r in rs])))
+                for name, rs in results.items() if len(rs) == len(instance_names)}
+
+    with ResultsStore(STORE_FILE) as store:
+        ranking = successive_halving(configs, evaluate, base_params.time_limit)
+    print(f'\n[tuner] tempo de solver usado: {cpu_seconds / 3600:.2f} CPU-h')
+    return ranking
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Executa todas as instâncias com todos os presets')
+    parser.add_argument('--cores', type=int, default=None,
+                        help='orçamento de núcleos para o sweep (padrão: todos os disponíveis)')
+    parser.add_argument('--no-resume', dest='resume', action='store_false',
+                        help=f'ignora os jobs já concluídos em {LEDGER_FILE} e roda o sweep inteiro')
+    parser.add_argument('--no-mip-start', dest='mip_start', action='store_false',
+                        help='não passa a solução da heurística como MIP start (resultados em results/*_sem_mip_start.csv)')
+    # parada antecipada (resultados em results/*_parada_antecipada.csv); sem nenhuma delas, roda até MAX_SECONDS
+    parser.add_argument('--stop-gap', type=float, default=None,
+                        help='para quando o gap (%%) ficar abaixo deste valor')
+    parser.add_argument('--stall-seconds', type=float, default=None,
+                        help='para quando solução e limitante não mudarem por este tempo (segundos)')
+    parser.add_argument('--stall-nodes', type=float, default=None,
+                        help='para quando solução e limitante não mudarem por este número de nós')
+    parser.add_argument('--work-limit', type=float, default=None,
+                        help='orçamento determinístico em work units do gurobi')
+    parser.add_argument('--tune', action='store_true',
+                        help=f'no lugar dos presets fixos, procura a melhor configuração por successive halving (ranking em {TUNER_RANKING_FILE})')
+    parser.add_argument('--tune-configs', type=int, default=NB_CONFIGS,
+                        help='configurações sorteadas na primeira rodada do tuner')
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default=GUROBI,
+                        help='solver (highs e cbc rodam sem licença do gurobi; resultados em results/*_<backend>.csv)')
+    parser.add_argument('--engine', choices=[engine.value for engine in Engine], default=Engine.Compact.value,
+                        help='branch-and-price roda um único preset no lugar dos presets do modelo compacto (results/branch_and_price.csv)')
+    parser.add_argument('--reduce', action='store_true',
+                        help='remove pares impossíveis e fixa variáveis por custo reduzido antes de montar o modelo (resultados em results/*_reduzido.csv)')
+    parser.add_argument('--lns', action='store_true',
+                        help='no lugar do sweep, roda o LNS paralelo com o preset Default e compara com results/default.csv (resultados em results/*_lns.csv)')
+    parser.add_argument('--portfolio', action='store_true',
+                        help=f'corrida dos presets em cada instância, um processo por preset; para na primeira prova de otimalidade ou no --stop-gap ({PORTFOLIO_FILE})')
+    parser.add_argument('--select', action='store_true',
+                        help=f'roda cada instância uma vez, com o preset escolhido pelo seletor treinado nos CSVs dos presets ({SELECTED_FILE})')
+    parser.add_argument('--cover-cuts', action='store_true',
+                        help='separa coberturas levantadas no callback nos presets No Cuts e Cuts Very Agressive e compara com os CSVs deles (results/*_coberturas.csv)')
+    parser.add_argument('--scaling', action='store_true',
+                        help=f'roda os presets de --scaling-presets sozinhos na máquina com cada contagem de --threads e grava speedup e eficiência ({SCALING_FILE})')
+    parser.add_argument('--threads', type=lambda text: [int(threads) for threads in text.split(',')], default=None,
+                        help='contagens de threads do modo de escala (padrão: 1, 2, 4, ... até os núcleos disponíveis)')
+    parser.add_argument('--concurrent-mip', type=int, default=0,
+                        help='no modo de escala, também roda cada contagem >= K com ConcurrentMIP=K (só gurobi)')
+    parser.add_argument('--scaling-presets', type=lambda text: text.split(','), default=SCALING_PRESETS,
+                        help='presets do modo de escala, separados por vírgula')
+    parser.add_argument('--lagrangian', action='store_true',
+                        help='calcula uma vez por instância o limitante lagrangiano e grava na coluna limitante_lagrangiano')
+    parser.add_argument('--candidates', type=int, default=0,
+                        help='modelo esparso com os k melhores agentes por tarefa e pricing dos pares de fora (resultados em results/*_candidatos.csv)')
+    args = parser.parse_args(argv)
+    if args.tune and (args.backend != GUROBI or args.engine != Engine.Compact.value):
+        parser.error('o tuner só ajusta parâmetros do gurobi')
+    if args.engine != Engine.Compact.value and args.backend != GUROBI:
+        parser.error('o branch-and-price sempre resolve o mestre com o highs (não use --backend)')
+    if args.lns and (args.tune or args.engine != Engine.Compact.value or args.reduce or args.candidates):
+        parser.error('o LNS monta os sub-MIPs no modelo compacto completo (sem --tune, --engine, --reduce ou --candidates)')
+    if args.portfolio and (args.tune or args.lns or args.engine != Engine.Compact.value or args.candidates):
+        parser.error('o portfolio corre os presets do modelo compacto (sem --tune, --lns, --engine ou --candidates)')
+    if args.select and (args.tune or args.lns or args.portfolio or args.engine != Engine.Compact.value):
+        parser.error('o seletor escolhe entre os presets do modelo compacto (sem --tune, --lns, --portfolio ou --engine)')
+    if args.cover_cuts and not BACKENDS[args.backend].supports_cover_cuts:
+        parser.error(f'o backend {args.backend} não tem callback de cortes para separar as coberturas')
+    if args.cover_cuts and (args.engine != Engine.Compact.value or args.tune or args.lns or args.portfolio or args.select):
+        parser.error('as coberturas só são separadas no sweep do modelo compacto (sem --engine, --tune, --lns, --portfolio ou --select)')
+    if args.scaling and (args.tune or args.lns or args.portfolio or args.select or args.engine != Engine.Compact.value):
+        parser.error('o modo de escala roda os presets do modelo compacto (sem --tune, --lns, --portfolio, --select ou --engine)')
+    if args.concurrent_mip and (not args.scaling or args.backend != GUROBI):
+        parser.error('--concurrent-mip só vale no modo de escala com o gurobi')
+    if args.candidates and (args.engine != Engine.Compact.value or args.tune):
+        parser.error('a lista de candidatos só vale para o modelo compacto (o branch-and-price já faz o pricing de todos os pares)')
+    return args
 
 # Seleção de método utilizado pelo Solver -> https://www.gurobi.com/documentation/9.1/refman/method.html#parameter:Method
 # Seleção de parâmetros -> https://www.gurobi.com/documentation/8.0/refman/parameters.html#sec:Parameters 
 def main():
+    args = parse_args()
+
     default_params = SolverParams(
         presolve=True,
         method=Method.Auto,
@@ -366,10 +705,85 @@ def main():
         Run('Cuts Very Agressive', cuts_very_agressive_params, 'results/cuts_very_agressive.csv')
     ]
 
-    for run in runs:
-        print(f'\nExecutando solver com predefinições: {run.name}')
-        for _ in range(TIMES_TO_RUN_EACH_PRESET):
-            run_all_instances_with_params(run)
+    if Engine(args.engine) == Engine.BranchAndPrice:
+        # os parâmetros do gurobi não se aplicam ao branch-and-price; presolve/backend só identificam o run
+        runs = [Run('Branch and Price', dataclasses.replace(default_params, backend=HIGHS, engine=Engine.BranchAndPrice),
+                    'results/branch_and_price.csv')]
+
+    if args.cover_cuts:
+        # comparação com os cortes genéricos desligados e no máximo
+        runs = [Run(run.name + ' (coberturas)', dataclasses.replace(run.params, cover_cuts=True),
+                    run.output_file.replace('.csv', '_coberturas.csv'))
+                for run in runs if run.params.cuts in (Cuts.NoCuts, Cuts.VeryAggressive)]
+
+    if args.reduce:
+        runs = [Run(run.name + ' (reduzido)', dataclasses.replace(run.params, reduce=True),
+                    run.output_file.replace('.csv', '_reduzido.csv'))
+                for run in runs]
+
+    if args.candidates:
+        runs = [Run(f'{run.name} ({args.candidates} candidatos)', dataclasses.replace(run.params, candidates=args.candidates),
+                    run.output_file.replace('.csv', '_candidatos.csv'))
+                for run in runs]
+
+    if not args.mip_start:
+        runs = [Run(run.name + ' (sem MIP start)', dataclasses.replace(run.params, mip_start=False),
+                    run.output_file.replace('.csv', '_sem_mip_start.csv'))
+                for run in runs]
+
+    termination = TerminationPolicy(
+        gap=None if args.stop_gap is None else args.stop_gap / 100,
+        stall_seconds=args.stall_seconds,
+        stall_nodes=args.stall_nodes,
+        work_limit=args.work_limit
+    )
+    if termination != TerminationPolicy():
+        runs = [Run(run.name, dataclasses.replace(run.params, termination=termination),
+                    run.output_file.replace('.csv', '_parada_antecipada.csv'))
+                for run in runs]
+
+    if args.backend != GUROBI:
+        # fora do gurobi só o presolve dos presets tem efeito: um run por valor de presolve
+        by_presolve = {run.params.presolve: run for run in reversed(runs)}
+        runs = [Run(f'{run.name} ({args.backend})', dataclasses.replace(run.params, backend=args.backend),
+                    run.output_file.replace('.csv', f'_{args.backend}.csv'))
+                for run in runs if by_presolve[run.params.presolve] is run]
+
+    if args.portfolio:
+        run_portfolio(runs, args.cores, args.lagrangian)
+        return
+
+    if args.scaling:
+        thread_counts = args.threads or [2 ** k for k in range(available_cores().bit_length()) if 2 ** k <= available_cores()]
+        scaling_runs = [run for run in runs if any(run.name.startswith(name) for name in args.scaling_presets)]
+        run_thread_scaling(scaling_runs, thread_counts, args.concurrent_mip, args.resume)
+        return
+
+    if args.select:
+        selection = select_presets(runs)
+        run_all_presets(list({run.name: run for run in selection.values()}.values()), args.cores, args.resume,
+                        selection, SELECTED_LEDGER_FILE, args.lagrangian)
+        return
+
+    if args.lns:
+        compare_results(runs[0], run_lns_presets(runs[0], args.cores))
+        return
+
+    if args.tune:
+        sweep_cpu_hours = len(runs) * len(INSTANCE_NAMES) * TIMES_TO_RUN_EACH_PRESET * MAX_SECONDS / 3600
+        print(f'\nAjustando parâmetros ({args.tune_configs} configurações; o sweep fixo usa até {sweep_cpu_hours:.2f} CPU-h)')
+        ranking = tune_presets(runs[0].params, [run.params for run in runs], args.tune_configs, args.cores)
+        write_ranking(ranking, TUNER_RANKING_FILE)
+        preset_names = {config_name(run.params) for run in runs}
+        for position, score in enumerate(ranking[:10], start=1):
+            marker = ' (preset)' if score.name in preset_names else ''
+            print(f'{position:3d}. {score.name}{marker}: {score.rounds} rodadas, gap {score.mean_gap * 100:.3f}%, integral primal {score.mean_primal_integral:.3f}')
+        return
+
+    print('\nExecutando solver com predefinições: ' + ', '.join(run.name for run in runs))
+    run_all_presets(runs, args.cores, args.resume, lagrangian=args.lagrangian)
+    if args.cover_cuts:
+        compare_cover_cuts(runs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from instance_loader import TOKEN_DTYPE, Instance
+
+# Instâncias pequenas (m^n atribuições) resolvidas por enumeração: os testes comparam limitantes,
+# reduções e cortes com o ótimo exato.
+
+### CONSTANTES ###
+
+NB_AGENTS = 3
+NB_TASKS = 7
+SEEDS = range(6)
+
+### CLASSES E TIPOS ###
+
+@dataclass
+class BruteForce:
+    assignments: np.ndarray  # (k x n) todas as atribuições viáveis: agente de cada tarefa
+    values: np.ndarray       # (k,) lucro de cada uma
+    optimum: float
+
+    def optimal(self) -> np.ndarray:
+        return self.assignments[self.values == self.optimum]
+
+### FUNÇÕES ###
+
+def random_instance(seed: int, nb_agents: int = NB_AGENTS, nb_tasks: int = NB_TASKS) -> Instance:
+    # lucros negativos como nas instâncias do zip; capacidades apertadas, mas com uma atribuição aleatória
+    # sempre viável
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 30, (nb_agents, nb_tasks))
+    profits = -rng.integers(10, 60, (nb_agents, nb_tasks))
+    assignment = rng.integers(0, nb_agents, nb_tasks)
+    loads = np.bincount(assignment, weights[assignment, np.arange(nb_tasks)], minlength=nb_agents)
+    capacities = np.maximum(np.floor(0.6 * weights.sum(axis=1) / nb_agents), loads)
+    return Instance(f'teste_{seed}', nb_agents, nb_tasks, profits.astype(TOKEN_DTYPE),
+                    weights.astype(TOKEN_DTYPE), capacities.astype(TOKEN_DTYPE))
+
+
+def brute_force(instance: Instance) -> BruteForce:
+    tasks = np.arange(instance.nb_tasks)
+    assignments = np.array(list(itertools.product(range(instance.nb_agents), repeat=instance.nb_tasks)))
+    weights = np.asarray(instance.capacityReductions)[assignments, tasks]
+    loads = np.stack([(weights * (assignments == i)).sum(axis=1) for i in range(instance.nb_agents)], axis=1)
+    feasible = (loads <= np.asarray(instance.totalCaps)).all(axis=1)
+    assignments = assignments[feasible]
+    values = np.asarray(instance.profits)[assignments, tasks].sum(axis=1).astype(np.float64)
+    return BruteForce(assignments, values, float(values.max()))
+
+
+@pytest.fixture(params=SEEDS)
+def small_instance(request) -> Instance:
+    return random_instance(request.param)
+
+
+@pytest.fixture
+def solved(small_instance: Instance) -> BruteForce:
+    return brute_force(small_instance)
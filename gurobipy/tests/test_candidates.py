@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from candidates import candidate_mask, price_candidates
+from lagrangian import solve_linear_relaxation
+
+
+@pytest.mark.parametrize('nb_candidates', [1, 2])
+def test_priced_lp_is_the_full_lp(small_instance, nb_candidates):
+    universe = np.ones((small_instance.nb_agents, small_instance.nb_tasks), dtype=bool)
+    candidates, relaxation = price_candidates(small_instance, candidate_mask(small_instance, nb_candidates), universe)
+    assert relaxation.bound == pytest.approx(solve_linear_relaxation(small_instance).bound, abs=1e-6)
+    assert (relaxation.reduced_costs[universe & ~candidates] <= 1e-6).all()
+
+
+@pytest.mark.parametrize('nb_candidates', [1, 2])
+def test_excluded_pairs_respect_the_pricing_bound(small_instance, solved, nb_candidates):
+    # toda solução que usa um par de fora vale no máximo z_LP + d_ij desse par (a conta do exclusion_bound)
+    universe = np.ones((small_instance.nb_agents, small_instance.nb_tasks), dtype=bool)
+    candidates, relaxation = price_candidates(small_instance, candidate_mask(small_instance, nb_candidates), universe)
+    tasks = np.arange(small_instance.nb_tasks)
+    for assignment, value in zip(solved.assignments, solved.values):
+        excluded = ~candidates[assignment, tasks]
+        if excluded.any():
+            bound = relaxation.bound + relaxation.reduced_costs[assignment[excluded], tasks[excluded]].min()
+            assert value <= bound + 1e-6
+
+
+def test_candidate_backend_proves_the_optimum(small_instance, solved):
+    pytest.importorskip('highspy')
+    from candidates import CandidateBackend
+
+    backend = CandidateBackend('highs', small_instance, nb_candidates=1)
+    backend.configure(10.0, 1, True)
+    result = backend.solve()
+    assert result.best_result == solved.optimum
+    assert result.best_expected >= solved.optimum - 1e-6
+    # uma única amostra final, mesmo com várias rodadas do MIP
+    times = result.trajectory['time']
+    assert np.count_nonzero(times == times[-1]) == 1
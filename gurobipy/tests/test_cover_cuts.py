@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from cover_cuts import CoverSeparator
+from lagrangian import solve_linear_relaxation
+
+
+def agent_points(weights: np.ndarray, capacity: int) -> np.ndarray:
+    # todos os x_i* binários que cabem na mochila do agente
+    points = np.array(list(itertools.product((0, 1), repeat=weights.size)))
+    return points[points @ weights <= capacity]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_cuts_keep_every_feasible_point(small_instance, seed):
+    instance = small_instance
+    nb_agents, nb_tasks = instance.nb_agents, instance.nb_tasks
+    separator = CoverSeparator(instance, time_limit=1.0)
+    columns = np.arange(nb_agents * nb_tasks)
+    weights = np.asarray(instance.capacityReductions)
+    feasible = [agent_points(weights[i], int(instance.totalCaps[i])) for i in range(nb_agents)]
+
+    # pontos fracionários quase cheios: as capacidades estouram e aparecem coberturas violadas
+    values = np.random.default_rng(seed).uniform(0.3, 1.0, columns.size)
+    cuts = separator.separate(columns, values)
+    for positions, coeffs, rhs in cuts:
+        agents = positions // nb_tasks
+        assert (agents == agents[0]).all()  # cada corte é de um agente só
+        row = np.zeros(nb_tasks)
+        row[positions % nb_tasks] = coeffs
+        assert coeffs @ values[positions] > rhs  # violado no ponto separado
+        assert (feasible[agents[0]] @ row <= rhs + 1e-9).all()
+
+
+def test_lp_point_cuts_are_valid_and_not_repeated(small_instance, solved):
+    instance = small_instance
+    relaxation = solve_linear_relaxation(instance)
+    # cada tarefa dividida entre os dois agentes de maior custo reduzido no LP (ponto fracionário típico)
+    values = np.zeros((instance.nb_agents, instance.nb_tasks))
+    best = np.argsort(-relaxation.reduced_costs, axis=0)[:2]
+    values[best[0], np.arange(instance.nb_tasks)] = 0.6
+    values[best[1], np.arange(instance.nb_tasks)] = 0.4
+    separator = CoverSeparator(instance, time_limit=1.0)
+    columns = np.arange(values.size)
+    first = separator.separate(columns, values.ravel())
+    assert separator.separate(columns, values.ravel()) == []  # a mesma cobertura não sai duas vezes
+
+    # as soluções inteiras viáveis (inclusive as ótimas) continuam viáveis com os cortes
+    tasks = np.arange(instance.nb_tasks)
+    for assignment in solved.assignments:
+        x = np.zeros(values.shape)
+        x[assignment, tasks] = 1
+        for positions, coeffs, rhs in first:
+            assert coeffs @ x.ravel()[positions] <= rhs + 1e-9
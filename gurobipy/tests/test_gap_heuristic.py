@@ -0,0 +1,45 @@
+import numpy as np
+
+from gap_heuristic import SearchState, assignment_to_x, local_search, solve_heuristic
+from instance_generator import generate_instance
+
+
+def loads(instance, assignment):
+    weights = np.asarray(instance.capacityReductions)[assignment, np.arange(instance.nb_tasks)]
+    return np.bincount(assignment, weights, minlength=instance.nb_agents)
+
+
+def test_solution_is_feasible_and_objective_matches(small_instance, solved):
+    solution = solve_heuristic(small_instance, time_limit=1.0)
+    assert solution is not None
+    tasks = np.arange(small_instance.nb_tasks)
+    assert (loads(small_instance, solution.assignment) <= small_instance.totalCaps).all()
+    assert solution.objective == small_instance.profits[solution.assignment, tasks].sum()
+    assert solution.objective <= solved.optimum
+    assert assignment_to_x(solution.assignment, small_instance.nb_agents).sum(axis=0).tolist() == [1] * small_instance.nb_tasks
+
+
+def test_generated_classes_are_repaired():
+    # classes apertadas do gerador: a gulosa sobrecarrega agentes e a busca local conserta
+    for kind in ('D', 'E'):
+        instance = generate_instance(kind, 5, 60, 2)
+        solution = solve_heuristic(instance, time_limit=2.0)
+        assert solution is not None
+        assert (loads(instance, solution.assignment) <= instance.totalCaps).all()
+
+
+def test_incremental_state_matches_recomputation(small_instance):
+    rng = np.random.default_rng(3)
+    state = SearchState(small_instance, rng.integers(0, small_instance.nb_agents, small_instance.nb_tasks))
+    for _ in range(50):
+        state.move(int(rng.integers(small_instance.nb_tasks)), int(rng.integers(small_instance.nb_agents)))
+    tasks = np.arange(small_instance.nb_tasks)
+    assert state.objective == small_instance.profits[state.assignment, tasks].sum()
+    assert state.is_feasible() == bool((loads(small_instance, state.assignment) <= small_instance.totalCaps).all())
+
+
+def test_local_search_never_returns_an_infeasible_assignment(small_instance):
+    start = np.zeros(small_instance.nb_tasks, dtype=np.int64)  # tudo no agente 0: sobrecarregado
+    best = local_search(small_instance, start, time_limit=1.0)
+    assert best is not None
+    assert (loads(small_instance, best[0]) <= small_instance.totalCaps).all()
@@ -0,0 +1,86 @@
+import math
+
+import pytest
+
+from gap_results import (COLUMN_FIELDS, PRESET_MARKER, RESULT_COLUMNS, format_results_row, parse_results_row,
+                         read_results_file, results_preset_name, write_results_file)
+
+VALUES = {
+    'exec_time': 12.5,
+    'status': 'time limit reached',
+    'best_result': -97372.0,
+    'nb_explored_nodes': 1520.0,
+    'best_expected': -97034.0,
+    'gap': 0.00347,
+    'build_time': 0.25,
+    'lagrangian_bound': None,
+    'time_to_first_incumbent': 3.9,
+    'primal_integral': 0.125,
+    'time_to_target_gap': None,
+    'solver': 'highs-1.15.1',
+    'removed_variables': 240.0,
+    'removed_nonzeros': None,
+    'heuristic_time': 1.25,
+}
+
+# arquivo de execuções antigas: bloco sem esquema com as 8 colunas originais, depois um bloco novo
+LEGACY_FILE = (
+    f'{PRESET_MARKER}Default\n'
+    'data_atual,caso_teste,tempo_total,conclusao,melhor_resultado,num_nos_explorados,limitante_dual,gap(%)\n'
+    '2023-01-01,instances/d60900.in,180.000,time limit reached,-54853.000,1000,-54800.000,0.097\n'
+    '2023-01-01,instances/d801600.in,180.000,time limit reached,-97372.000,900,-97034.000,0.347,sobrando\n'
+    f'{PRESET_MARKER}Default\n'
+    'Esquema: 2\n'
+    'data_atual,caso_teste,tempo_total,conclusao,melhor_resultado,num_nos_explorados,limitante_dual,limitante_lagrangiano,gap(%)\n'
+    '2023-02-01,instances/e60900.in,10.000,optimal solution,-100606.000,5,-100606.000,-100500.000,0.000\n'
+    '2023-02-01,instances/e801600.in,10.000\n'
+)
+
+
+def test_row_round_trip(tmp_path):
+    output_file = str(tmp_path / 'default.csv')
+    write_results_file('Default', [format_results_row('2024-01-01', 'instances/d801600.in', VALUES)], output_file)
+
+    assert results_preset_name(output_file) == 'Default'
+    rows = read_results_file(output_file)
+    assert len(rows) == 1
+    assert list(rows[0]) == list(RESULT_COLUMNS)
+    parsed = parse_results_row(rows[0])
+    for field, value in VALUES.items():
+        if value is None:
+            assert parsed[field] is None
+        elif isinstance(value, str):
+            assert parsed[field] == value
+        else:
+            assert parsed[field] == pytest.approx(value, abs=1e-3)
+
+
+def test_export_overwrites_the_file(tmp_path):
+    output_file = str(tmp_path / 'default.csv')
+    row = format_results_row('2024-01-01', 'instances/d60900.in', VALUES)
+    write_results_file('Default', [row, row], output_file)
+    write_results_file('Default', [row], output_file)
+    assert len(read_results_file(output_file)) == 1
+
+
+def test_each_block_uses_its_own_header(tmp_path):
+    output_file = tmp_path / 'legacy.csv'
+    output_file.write_text(LEGACY_FILE)
+    rows = read_results_file(str(output_file))
+    assert len(rows) == 4
+
+    # a coluna limitante_lagrangiano do segundo bloco não desloca o gap
+    assert parse_results_row(rows[0])['gap'] == pytest.approx(0.00097)
+    assert parse_results_row(rows[2])['gap'] == 0.0
+    assert parse_results_row(rows[2])['lagrangian_bound'] == -100500.0
+    assert parse_results_row(rows[0])['lagrangian_bound'] is None
+
+    # valores a mais ficam na chave None e colunas que faltam não aparecem
+    assert rows[1][None] == ['sobrando']
+    assert 'conclusao' not in rows[3]
+    assert parse_results_row(rows[3])['best_result'] is None
+
+
+def test_every_column_has_a_field():
+    assert set(COLUMN_FIELDS) == set(RESULT_COLUMNS) - {'data_atual', 'caso_teste'}
+    assert math.isclose(COLUMN_FIELDS['gap(%)'][1], 100)
@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from instance_generator import KINDS, generate_instance, generated_file, instance_name
+from instance_loader import read_instance
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_same_parameters_same_instance(kind):
+    first, second = generate_instance(kind, 5, 40, 3), generate_instance(kind, 5, 40, 3)
+    assert first.name == second.name
+    for field in ('profits', 'capacityReductions', 'totalCaps'):
+        assert np.array_equal(getattr(first, field), getattr(second, field))
+    assert not np.array_equal(first.profits, generate_instance(kind, 5, 40, 4).profits)
+
+
+def test_written_file_reads_back(tmp_path):
+    filename = generated_file('E', 4, 30, 1, str(tmp_path))
+    instance, generated = read_instance(filename, cache_dir=None), generate_instance('E', 4, 30, 1)
+    assert filename.endswith(instance_name('E', 4, 30, 1) + '.in')
+    for field in ('profits', 'capacityReductions', 'totalCaps'):
+        assert np.array_equal(getattr(instance, field), getattr(generated, field))
+
+
+def test_names_are_unique():
+    sizes = [(20, 1600), (201, 600), (2, 1600), (21, 600), (80, 1600), (801, 600)]
+    names = [instance_name(kind, m, n, seed) for kind, (m, n), seed in itertools.product(KINDS, sizes, (0, 1, 10))]
+    assert len(set(names)) == len(names)
+    assert instance_name('D', 20, 1600, 0) != instance_name('D', 201, 600, 0)
+    assert instance_name('D', 80, 1600, 0) != 'd801600'  # não colide com as instâncias do zip
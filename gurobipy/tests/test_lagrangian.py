@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from lagrangian import knapsack_01, lagrangian_subproblem, solve_lagrangian, solve_linear_relaxation
+
+
+def brute_force_knapsack(values: np.ndarray, weights: np.ndarray, capacity: int) -> float:
+    best = 0.0
+    for chosen in itertools.product((False, True), repeat=values.size):
+        chosen = np.array(chosen)
+        if weights[chosen].sum() <= capacity:
+            best = max(best, float(values[chosen].sum()))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_knapsack_matches_enumeration(seed):
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(1, 11))
+    values = rng.random(size) * 50 + 0.5
+    weights = rng.integers(1, 40, size)
+    capacity = int(rng.integers(0, weights.sum() + 5))
+
+    value, chosen = knapsack_01(values, weights, capacity)
+    assert value == pytest.approx(brute_force_knapsack(values, weights, capacity))
+    assert weights[chosen].sum() <= capacity
+    assert values[chosen].sum() == pytest.approx(value)
+
+
+def test_knapsack_all_items_fit():
+    values, weights = np.array([3.0, 1.5, 2.0]), np.array([2, 3, 100])
+    value, chosen = knapsack_01(values, weights, 5)
+    assert value == 4.5
+    assert chosen.tolist() == [True, True, False]
+
+
+def test_relaxation_bounds_are_valid(small_instance, solved):
+    relaxation = solve_linear_relaxation(small_instance)
+    lagrangian = solve_lagrangian(small_instance, time_limit=1.0)
+    assert relaxation.bound >= solved.optimum - 1e-6
+    assert lagrangian.bound >= solved.optimum
+    assert lagrangian.bound == int(lagrangian.bound)  # lucros inteiros: arredondado para baixo
+
+
+@pytest.mark.parametrize('scale', [0.0, 10.0, 100.0])
+def test_any_multipliers_give_an_upper_bound(small_instance, solved, scale):
+    # L(u) >= ótimo para qualquer u, não só nos multiplicadores do subgradiente
+    multipliers = np.random.default_rng(7).normal(-30, scale, small_instance.nb_tasks)
+    profits = np.asarray(small_instance.profits, dtype=np.float64)
+    value, _ = lagrangian_subproblem(small_instance, profits, multipliers)
+    assert value >= solved.optimum - 1e-6
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+
+from lns import neighbourhood_mask, run_lns
+from solver_backends import HIGHS, make_backend
+
+
+def highs_builder(instance, active, time_limit):
+    backend = make_backend(HIGHS, instance, active)
+    backend.configure(time_limit, 1, True)
+    return backend
+
+
+def test_neighbourhood_keeps_the_current_assignment(small_instance, solved):
+    assignment = solved.assignments[0]
+    agents = np.array([0, 1])
+    active = neighbourhood_mask(small_instance, assignment, agents)
+    tasks = np.arange(small_instance.nb_tasks)
+    assert active[assignment, tasks].all()
+    assert active.sum(axis=0).max() <= agents.size
+
+
+def test_stops_at_zero_gap(small_instance, solved):
+    worst = solved.assignments[np.argmin(solved.values)]
+    result, stats = run_lns(small_instance, highs_builder, worst, time_limit=60.0, nb_workers=1, dual_bound=solved.optimum)
+
+    assert result.status == 'optimal solution'
+    assert result.best_result == solved.optimum
+    assert result.gap == 0.0
+    assert result.exec_time < 30.0
+
+
+def test_optimal_start_solves_nothing(small_instance, solved):
+    result, stats = run_lns(small_instance, highs_builder, solved.optimal()[0], time_limit=60.0, nb_workers=1,
+                            dual_bound=solved.optimum)
+    assert result.status == 'optimal solution'
+    assert sum(stats.nb_subproblems.values()) == 0
+
+
+def test_without_bound_runs_to_the_time_limit(small_instance, solved):
+    result, _ = run_lns(small_instance, highs_builder, solved.assignments[0], time_limit=1.5, nb_workers=1)
+    assert result.status == 'time limit reached'
+    assert math.isinf(result.gap)
+    assert result.best_result >= solved.values[0]
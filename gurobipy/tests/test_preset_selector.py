@@ -0,0 +1,55 @@
+import numpy as np
+
+from gap_results import format_results_row, write_results_file
+from instance_generator import generate_instance
+from preset_selector import PresetSelector, leave_one_out, train_selector
+
+PRESETS = ['Default', 'No Cuts']
+
+# dois grupos de instâncias no espaço das características: no primeiro o Default ganha, no segundo o No Cuts
+FEATURES = np.array([[0.0, 0.0], [0.1, 0.0], [0.0, 0.1], [10.0, 10.0], [10.1, 10.0], [10.0, 10.1]])
+RANKS = np.array([[0, 1], [0, 1], [0, 1], [1, 0], [1, 0], [1, 0]], dtype=float)
+
+
+def make_selector(ranks: np.ndarray = RANKS) -> PresetSelector:
+    names = [f'i{row}' for row in range(len(FEATURES))]
+    return PresetSelector(PRESETS, names, FEATURES, ranks, ranks.copy(), np.zeros(2), np.ones(2))
+
+
+def test_nearest_neighbours_choose_the_preset():
+    selector = make_selector()
+    assert selector.select(np.array([0.05, 0.05])) == 'Default'
+    assert selector.select(np.array([10.05, 10.05])) == 'No Cuts'
+    # na metade do caminho, os 3 vizinhos mais próximos ainda são do primeiro grupo
+    assert selector.select(np.array([4.0, 4.0])) == 'Default'
+
+
+def test_same_features_dominate_and_can_be_excluded():
+    ranks = RANKS.copy()
+    ranks[0] = [1, 0]  # a instância 0 destoa dos vizinhos
+    selector = make_selector(ranks)
+    assert selector.select(FEATURES[0]) == 'No Cuts'
+    assert selector.select(FEATURES[0], exclude=0) == 'Default'
+
+
+def test_train_reads_the_history_and_leaves_one_out(tmp_path):
+    instances = {f'c{seed}': generate_instance('C', 5, 30, seed) for seed in range(3)}
+    instances.update({f'e{seed}': generate_instance('E', 10, 60, seed) for seed in range(3)})
+    gaps = {'Default': {name: (0.5 if name[0] == 'c' else 2.0) for name in instances},
+            'No Cuts': {name: (1.0 if name[0] == 'c' else 0.1) for name in instances}}
+
+    result_files = dict()
+    for preset, preset_gaps in gaps.items():
+        rows = [format_results_row('2024-01-01', f'instances/{name}.in', {'gap': gap / 100, 'exec_time': 10.0})
+                for name, gap in preset_gaps.items()]
+        rows.append(rows[0] + ['sobrando'])  # linha fora do cabeçalho: não entra no histórico
+        result_files[preset] = str(tmp_path / f'{preset}.csv')
+        write_results_file(preset, rows, result_files[preset])
+
+    selector = train_selector(result_files, instances.get)
+    assert selector.instance_names == sorted(instances)
+    assert np.allclose(selector.gaps[:, 0], [gaps['Default'][name] for name in selector.instance_names])
+
+    evaluation = leave_one_out(selector)
+    assert [name for name, _, _, _ in evaluation] == selector.instance_names
+    assert all(chosen == best and loss == 0 for _, chosen, best, loss in evaluation)
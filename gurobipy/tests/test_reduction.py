@@ -0,0 +1,27 @@
+import numpy as np
+
+from reduction import reduce_problem
+
+
+def test_optimal_pairs_stay_active(small_instance, solved):
+    # com a solução conhecida igual ao ótimo, a fixação é a mais agressiva possível e mesmo assim
+    # nenhuma solução ótima pode perder um par
+    reduction = reduce_problem(small_instance, solved.optimum)
+    tasks = np.arange(small_instance.nb_tasks)
+    for assignment in solved.optimal():
+        assert reduction.active[assignment, tasks].all()
+
+
+def test_removed_counts_match_the_mask(small_instance, solved):
+    reduction = reduce_problem(small_instance, solved.optimum)
+    removed = ~reduction.active
+    weights = np.asarray(small_instance.capacityReductions)
+    assert reduction.nb_removed_variables == removed.sum()
+    assert reduction.nb_removed_nonzeros == removed.sum() + np.count_nonzero(weights[removed])
+
+
+def test_without_incumbent_only_impossible_pairs_leave(small_instance):
+    reduction = reduce_problem(small_instance)
+    feasible = np.asarray(small_instance.capacityReductions) <= np.asarray(small_instance.totalCaps)[:, None]
+    assert (reduction.active == feasible).all()
+    assert reduction.nb_fixed_zero == reduction.nb_fixed_tasks == 0
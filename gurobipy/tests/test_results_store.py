@@ -0,0 +1,95 @@
+import csv
+import math
+import sqlite3
+
+import numpy as np
+
+from gap_results import InstanceResult, parse_results_row, read_results_file
+from results_store import (RESULT_FIELDS, ResultsStore, export_results_file, export_selections_file, export_winners_file,
+                           query_results, read_stored_trajectory, summarize)
+
+
+def make_result(instance, gap=0.01, exec_time=10.0, status='time limit reached', **fields) -> InstanceResult:
+    return InstanceResult(instance=instance, exec_time=exec_time, build_time=0.1, status=status, best_result=-100.0,
+                          nb_explored_nodes=5.0, best_expected=-99.0, gap=gap, **fields)
+
+
+def test_old_store_gets_the_reduction_columns(tmp_path, small_instance):
+    store_file = str(tmp_path / 'results.sqlite')
+    old_fields = [name for name in RESULT_FIELDS if name not in ('removed_variables', 'removed_nonzeros')]
+    connection = sqlite3.connect(store_file)
+    connection.execute(f'CREATE TABLE results (id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, date TEXT NOT NULL, '
+                       f'preset TEXT NOT NULL, params TEXT, instance TEXT NOT NULL, instance_hash TEXT, '
+                       f'repetition INTEGER, time_limit REAL, {", ".join(old_fields)})')
+    connection.execute("INSERT INTO results (run_id, date, preset, instance, gap) VALUES ('antigo', '2024-01-01', 'Default', 'd60900', 0.5)")
+    connection.commit()
+    connection.close()
+
+    with ResultsStore(store_file) as store:
+        store.add(make_result(small_instance, removed_variables=12, removed_nonzeros=30), 'Default')
+
+    output_file = str(tmp_path / 'default.csv')
+    connection = sqlite3.connect(store_file)
+    assert export_results_file(connection, ['Default'], output_file) == 2
+    connection.close()
+    old, new = (parse_results_row(row) for row in read_results_file(output_file))
+    assert old['removed_variables'] is None and math.isclose(old['gap'], 0.5)
+    assert (new['removed_variables'], new['removed_nonzeros']) == (12, 30)
+
+
+def test_summarize_medians_wins_and_optimal():
+    # A ganha em i1 (gap mediano 1% contra 3%), empata em i2 (vitória para os dois); B fica sem gap numa execução
+    results = {
+        'preset': np.array(['A', 'A', 'A', 'B', 'B', 'B', 'A', 'B'], dtype=object),
+        'instance': np.array(['i1', 'i1', 'i1', 'i1', 'i1', 'i1', 'i2', 'i2'], dtype=object),
+        'gap': np.array([0.01, 0.0, 0.02, 0.03, 0.03, np.nan, 0.0, 0.0]),
+        'exec_time': np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 5.0, 5.0]),
+        'status': np.array(['time limit reached', 'optimal solution', 'time limit reached', 'time limit reached',
+                            'time limit reached', 'infeasible solution', 'optimal solution', 'optimal solution'], dtype=object),
+    }
+    summaries = {summary.preset: summary for summary in summarize(results)}
+    assert [summary.preset for summary in summarize(results)] == ['A', 'B']
+
+    a, b = summaries['A'], summaries['B']
+    assert (a.nb_runs, a.nb_instances, a.nb_optimal, a.wins) == (4, 2, 2, 2)
+    assert (b.nb_runs, b.nb_instances, b.nb_optimal, b.wins) == (4, 2, 1, 1)
+    assert a.median_gap == 0.5 and b.median_gap == 3.0
+    assert a.median_time == 15.0
+    assert math.isclose(a.sgm_gap, np.exp(np.log(np.array([1.0, 0.0, 2.0, 0.0]) + 1).mean()) - 1)
+
+
+def test_results_and_trajectories_round_trip(tmp_path, small_instance):
+    store_file = str(tmp_path / 'results.sqlite')
+    trajectory = {name: np.arange(3, dtype=float) + k for k, name in enumerate(('time', 'incumbent', 'bound', 'nodes', 'iterations'))}
+    with ResultsStore(store_file, batch_size=2) as store:
+        for repetition in range(3):
+            store.add(make_result(small_instance, gap=0.01 * repetition, trajectory=trajectory), 'Default', repetition=repetition)
+        assert len(store.pending) == 1  # o lote de 2 já foi gravado
+
+    connection = sqlite3.connect(store_file)
+    results = query_results(connection, ('preset', 'gap', 'repetition'), preset='Default')
+    assert results['gap'].tolist() == [0.0, 0.01, 0.02]
+    stored = read_stored_trajectory(connection, 1)
+    assert all((stored[name] == values).all() for name, values in trajectory.items())
+    connection.close()
+
+
+def test_winners_and_selections_are_exported_from_the_store(tmp_path, small_instance):
+    store_file = str(tmp_path / 'results.sqlite')
+    with ResultsStore(store_file) as store:
+        store.add(make_result(small_instance, status='optimal solution'), 'Portfolio', {'presets': ['A', 'B'], 'winner': 'B'}, repetition=0)
+        store.add(make_result(small_instance), 'Portfolio', {'presets': ['A', 'B'], 'winner': None}, repetition=1)
+        store.add_selection('selecionado_presets', 'd60900', 'Default', 0.0015)
+        store.add_selection('selecionado_presets_highs', 'd60900', 'No Cuts', 0.002)
+
+    connection = sqlite3.connect(store_file)
+    winners_file, selections_file = str(tmp_path / 'vencedores.csv'), str(tmp_path / 'presets.csv')
+    assert export_winners_file(connection, 'Portfolio', winners_file) == 2
+    assert export_selections_file(connection, 'selecionado_presets', selections_file) == 1
+    connection.close()
+
+    with open(winners_file) as winners:
+        rows = list(csv.DictReader(winners))
+    assert [(row['repeticao'], row['vencedor'], row['conclusao']) for row in rows] == [('0', 'B', 'optimal solution'), ('1', '', 'time limit reached')]
+    with open(selections_file) as selections:
+        assert list(csv.DictReader(selections)) == [{'caso_teste': 'd60900', 'preset': 'Default', 'tempo_caracteristicas': '0.001500'}]
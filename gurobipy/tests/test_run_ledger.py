@@ -0,0 +1,40 @@
+from run_ledger import LEDGER_FAILED, LEDGER_OK, is_done, ledger_key, load_ledger, record_ledger_entry
+
+PARAMS = {'presolve': True, 'cuts': 'Auto'}
+
+
+def test_resume_skips_only_completed_jobs(tmp_path):
+    ledger_file = str(tmp_path / 'ledger.jsonl')
+    done = ledger_key('hash-a', PARAMS, 180, 0, 'gurobi-13.0.3')
+    failed = ledger_key('hash-a', PARAMS, 180, 1, 'gurobi-13.0.3')
+    record_ledger_entry(dict(), ledger_file, done, LEDGER_OK)
+    record_ledger_entry(dict(), ledger_file, failed, LEDGER_FAILED)
+
+    ledger = load_ledger(ledger_file)
+    assert is_done(ledger, done)
+    assert not is_done(ledger, failed)  # falhou: roda de novo
+    assert not is_done(ledger, ledger_key('hash-b', PARAMS, 180, 0, 'gurobi-13.0.3'))
+
+
+def test_last_status_wins_and_a_torn_line_is_ignored(tmp_path):
+    ledger_file = tmp_path / 'ledger.jsonl'
+    key = ledger_key('hash-a', PARAMS, 180, 0, 'highs-1.15.1')
+    ledger = dict()
+    record_ledger_entry(ledger, str(ledger_file), key, LEDGER_FAILED)
+    record_ledger_entry(ledger, str(ledger_file), key, LEDGER_OK)
+    with open(ledger_file, 'a') as output_file:
+        output_file.write('{"key": "meio')  # processo morreu no meio da escrita
+    assert is_done(load_ledger(str(ledger_file)), key)
+
+
+def test_key_changes_with_every_component():
+    base = ledger_key('hash-a', PARAMS, 180, 0, 'gurobi-13.0.3')
+    assert ledger_key('hash-a', dict(reversed(PARAMS.items())), 180, 0, 'gurobi-13.0.3') == base
+    variants = [
+        ledger_key('hash-b', PARAMS, 180, 0, 'gurobi-13.0.3'),
+        ledger_key('hash-a', {**PARAMS, 'presolve': False}, 180, 0, 'gurobi-13.0.3'),
+        ledger_key('hash-a', PARAMS, 60, 0, 'gurobi-13.0.3'),
+        ledger_key('hash-a', PARAMS, 180, 1, 'gurobi-13.0.3'),
+        ledger_key('hash-a', PARAMS, 180, 0, 'gurobi-12.0.0'),
+    ]
+    assert base not in variants and len(set(variants)) == len(variants)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from solver_backends import BACKEND_NAMES, CBC, GUROBI, make_backend
+
+
+def backend_or_skip(backend_name, instance):
+    # os solvers são dependências opcionais: sem o pacote (ou a licença do gurobi) o teste é pulado
+    try:
+        return make_backend(backend_name, instance)
+    except ImportError as error:
+        pytest.skip(str(error))
+    except Exception as error:
+        if backend_name == GUROBI:
+            pytest.skip(f'gurobi indisponível: {error}')
+        raise
+
+
+def solve(backend, start=None):
+    backend.configure(time_limit=30.0, threads=1, presolve=True)
+    if start is not None:
+        backend.set_start(start)
+    return backend.solve()
+
+
+@pytest.mark.parametrize('backend_name', BACKEND_NAMES)
+def test_backends_agree_on_the_optimum(backend_name, small_instance, solved):
+    backend = backend_or_skip(backend_name, small_instance)
+    result = solve(backend)
+
+    assert result.status == 'optimal solution'
+    assert result.best_result == pytest.approx(solved.optimum)
+    assignment = backend.best_assignment()
+    assert any((assignment == optimal).all() for optimal in solved.optimal())
+
+
+@pytest.mark.parametrize('backend_name', [GUROBI, CBC])  # o HiGHS monta o Highs a cada execução
+def test_reset_reuses_the_model(backend_name, small_instance, solved):
+    backend = backend_or_skip(backend_name, small_instance)
+    model = backend.model
+    worst = solved.assignments[np.argmin(solved.values)]
+    first = solve(backend, start=worst)
+
+    backend.reset()
+    second = solve(backend)
+
+    assert backend.model is model
+    assert second.status == first.status == 'optimal solution'
+    assert second.best_result == pytest.approx(first.best_result)
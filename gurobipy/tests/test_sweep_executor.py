@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from sweep_executor import SweepJob, nb_workers, run_sweep
+
+
+def solve_in_worker(job: SweepJob):
+    if job.instance_name == 'falha':
+        raise RuntimeError('job com erro')
+    return os.getpid(), job.repetition
+
+
+@pytest.mark.parametrize('core_budget', [1, 3])
+def test_results_are_written_by_the_calling_process(core_budget):
+    jobs = [SweepJob('Default', name, repetition) for name in ('d60900', 'falha', 'e60900') for repetition in range(2)]
+    written, failed = [], []
+
+    def write_result(job, result):
+        written.append((job, result, os.getpid()))
+
+    run_sweep(jobs, solve_in_worker, write_result, core_budget, on_error=lambda job, error: failed.append(job))
+
+    assert sorted(job for job, _, _ in written) == sorted(job for job in jobs if job.instance_name != 'falha')
+    assert sorted(failed) == [job for job in jobs if job.instance_name == 'falha']
+    assert all(writer == os.getpid() for _, _, writer in written)
+    assert all(result[1] == job.repetition for job, result, _ in written)
+    if core_budget > 1:
+        assert all(result[0] != os.getpid() for _, result, _ in written)  # resolvidos nos workers
+
+
+def test_workers_never_oversubscribe_the_budget():
+    assert nb_workers(8, 1) == 8
+    assert nb_workers(8, 3) == 2
+    assert nb_workers(2, 4) == 1
+    assert nb_workers(None, 1) >= 1
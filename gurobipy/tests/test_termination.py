@@ -0,0 +1,34 @@
+from termination import TerminationMonitor, TerminationPolicy
+from trajectory import NO_VALUE
+
+
+def test_gap_stop():
+    monitor = TerminationMonitor(TerminationPolicy(gap=0.01))
+    assert monitor.check(1.0, NO_VALUE, -90.0, 0) is None
+    assert monitor.check(2.0, -100.0, -95.0, 10) is None  # 5%
+    reason = monitor.check(3.0, -100.0, -99.5, 20)  # 0.5%
+    assert reason is not None and reason.startswith('gap')
+    assert monitor.check(4.0, -100.0, -95.0, 30) == reason  # continua parado depois do terminate
+
+
+def test_stall_seconds_counts_from_the_last_change():
+    monitor = TerminationMonitor(TerminationPolicy(stall_seconds=10.0))
+    assert monitor.check(0.0, NO_VALUE, -90.0, 0) is None
+    assert monitor.check(20.0, NO_VALUE, -90.0, 0) is None  # sem solução ainda: não conta
+    assert monitor.check(21.0, -100.0, -90.0, 0) is None
+    assert monitor.check(30.0, -100.0, -91.0, 0) is None  # limitante mudou
+    assert monitor.check(39.0, -100.0, -91.0, 0) is None
+    assert monitor.check(40.0, -100.0, -91.0, 0) == 'no progress for 10s'
+
+
+def test_stall_nodes_and_tolerance():
+    monitor = TerminationMonitor(TerminationPolicy(stall_nodes=1000))
+    assert monitor.check(0.0, -100.0, -90.0, 0) is None
+    assert monitor.check(1.0, -100.0, -90.0 + 1e-9, 999) is None  # variação abaixo da tolerância
+    assert monitor.check(2.0, -100.0, -90.0, 1000) == 'no progress for 1000 nodes'
+
+
+def test_without_policy_never_stops():
+    monitor = TerminationMonitor(TerminationPolicy())
+    for t in range(100):
+        assert monitor.check(float(t), -100.0, -100.0, t * 1000) is None
@@ -0,0 +1,47 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from gap_results import InstanceResult
+from results_store import ResultsStore
+from thread_scaling import load_scaling_points, write_scaling_report
+
+TIME_LIMIT = 60.0
+HEURISTIC_TIME = 5.0
+
+CASES = {'Default (1 thread)': ('Default', 1, 0), 'Default (2 threads)': ('Default', 2, 0)}
+
+
+def scaling_result(instance, target_time: float) -> InstanceResult:
+    # trajetória já deslocada pela heurística (como o TrajectoryRecorder com time_offset): o limitante
+    # cai de -90 para -99 aos 2 s de solver
+    times = HEURISTIC_TIME + np.array([0.0, 2.0, target_time])
+    trajectory = {'time': times, 'incumbent': np.array([-110.0, -110.0, -100.0]), 'bound': np.array([-90.0, -99.0, -99.0]),
+                  'nodes': np.zeros(3), 'iterations': np.zeros(3)}
+    return InstanceResult(instance=instance, exec_time=20.0, build_time=0.0, status='optimal solution', best_result=-100.0,
+                          nb_explored_nodes=400.0, best_expected=-99.0, gap=0.01, trajectory=trajectory,
+                          time_to_target_gap=HEURISTIC_TIME + target_time, heuristic_time=HEURISTIC_TIME)
+
+
+def test_time_to_gap_starts_at_the_solver(tmp_path, small_instance):
+    store_file = str(tmp_path / 'results.sqlite')
+    with ResultsStore(store_file) as store:
+        for name, target_time in zip(CASES, (10.0, 5.0)):
+            store.add(scaling_result(small_instance, target_time), name, repetition=0, time_limit=TIME_LIMIT)
+
+    connection = sqlite3.connect(store_file)
+    one, two = load_scaling_points(connection, CASES, TIME_LIMIT, bound_time=1.0)
+    connection.close()
+
+    assert (one.time_to_target_gap, two.time_to_target_gap) == (10.0, 5.0)
+    assert one.heuristic_time == two.heuristic_time == HEURISTIC_TIME
+    assert two.speedup == pytest.approx(2.0)  # com a heurística no tempo seria 15 / 10
+    assert two.efficiency == pytest.approx(1.0)
+    assert one.bound_at_time == -90.0  # 1 s de solver, não 1 s desde o início do job
+
+    report = tmp_path / 'escala.csv'
+    write_scaling_report([one, two], str(report), bound_time=1.0)
+    header, first = report.read_text().splitlines()[:2]
+    assert 'tempo_heuristica' in header.split(',')
+    assert dict(zip(header.split(','), first.split(',')))['tempo_heuristica'] == '5.000'
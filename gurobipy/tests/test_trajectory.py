@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+import pytest
+
+from trajectory import (NO_VALUE, TrajectoryRecorder, primal_gap, primal_integral, time_to_first_incumbent,
+                        time_to_gap, value_at)
+
+
+def test_primal_integral_is_the_area_under_the_gap_step():
+    # sem solução até 2s (gap 1), depois -110 até 5s e o ótimo -100 até o fim
+    incumbents = [(5.0, -100.0), (2.0, -110.0)]
+    expected = 2.0 * 1.0 + 3.0 * (10 / 110)
+    assert primal_integral(incumbents, -100.0, 10.0) == pytest.approx(expected)
+    assert time_to_first_incumbent(incumbents) == 2.0
+
+
+def test_primal_integral_limits():
+    assert primal_integral([], -100.0, 10.0) == 10.0
+    assert primal_integral([(0.0, -100.0)], -100.0, 10.0) == 0.0
+    # solução pior depois de uma melhor não piora o gap
+    assert primal_integral([(0.0, -100.0), (1.0, -200.0)], -100.0, 10.0) == 0.0
+    # instantes depois do horizonte são cortados
+    assert primal_integral([(20.0, -100.0)], -100.0, 10.0) == 10.0
+
+
+def test_primal_gap():
+    assert primal_gap(None, -100.0) == 1.0
+    assert primal_gap(5.0, -100.0) == 1.0  # sinais diferentes
+    assert primal_gap(-120.0, -100.0) == pytest.approx(20 / 120)
+
+
+def test_recorder_columns_and_time_to_gap():
+    recorder = TrajectoryRecorder(time_offset=1.5)
+    recorder.sample(0.0, NO_VALUE, -90.0, 0, 0)
+    recorder.new_incumbent(1.0, -120.0, -90.0, 10)
+    recorder.new_incumbent(2.0, -130.0, -95.0, 20)  # pior: a amostra guarda -120
+    recorder.sample(3.0, -99.5, -99.0, 30, 500)
+    trajectory = recorder.to_columns()
+
+    assert trajectory['time'].tolist() == [1.5, 2.5, 3.5, 4.5]
+    assert math.isnan(trajectory['incumbent'][0])
+    assert trajectory['incumbent'][2] == -120.0
+    assert time_to_gap(trajectory) == 4.5
+    assert time_to_gap(trajectory, 0.5) == 2.5
+    assert value_at(trajectory, 'bound', 3.0) == -90.0
+    assert math.isnan(value_at(trajectory, 'bound', 1.0))
+
+
+def test_recorder_samples_at_most_once_per_interval():
+    recorder = TrajectoryRecorder(sample_interval=1.0)
+    due = [recorder.due(t) for t in np.arange(0.0, 3.0, 0.25)]
+    assert sum(due) == 3
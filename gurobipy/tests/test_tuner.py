@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from tuner import ConfigScore, budgets, pareto_layers, rank, sample_configurations, successive_halving
+
+
+def test_budgets_grow_by_eta_up_to_the_maximum():
+    assert budgets(180.0, 81) == pytest.approx([180 / 81, 180 / 27, 180 / 9, 180 / 3, 180])
+    assert budgets(180.0, 9, eta=3) == pytest.approx([20.0, 60.0, 180.0])
+    assert budgets(180.0, 1) == [180.0]
+
+
+def test_halving_keeps_the_best_third_each_round():
+    # configuração k tem gap k em todas as rodadas: sobrevive sempre a menor fração
+    configs = {f'c{k}': k for k in range(27)}
+    calls = []
+
+    def evaluate(round_configs, budget, round_index):
+        calls.append((sorted(round_configs, key=lambda name: configs[name]), budget))
+        return {name: (float(config), float(config)) for name, config in round_configs.items()}
+
+    ranking = successive_halving(configs, evaluate, 90.0)
+    assert [len(names) for names, _ in calls] == [27, 9, 3, 1]
+    assert calls[1][0] == [f'c{k}' for k in range(9)]
+    assert calls[-1] == (['c0'], 90.0)
+    assert [score.name for score in ranking[:3]] == ['c0', 'c1', 'c2']
+    assert ranking[0].rounds == 4 and ranking[-1].rounds == 1
+
+
+def test_failed_configuration_is_dropped():
+    configs = {'boa': 1, 'falhou': 2, 'ruim': 3}
+
+    def evaluate(round_configs, budget, round_index):
+        return {name: (0.01 * config, 1.0) for name, config in round_configs.items() if name != 'falhou'}
+
+    ranking = successive_halving(configs, evaluate, 10.0)
+    scores = {score.name: score for score in ranking}
+    assert ranking[0].name == 'boa'
+    assert math.isinf(scores['falhou'].mean_gap) and scores['falhou'].rounds == 1
+
+
+def test_pareto_layers_and_rank():
+    assert pareto_layers([(1, 3), (2, 2), (3, 1), (2, 3), (3, 3)]) == [0, 0, 0, 1, 2]
+    scores = [ConfigScore('a', None, 1, 1, 0.2, 5), ConfigScore('b', None, 2, 3, 0.5, 9), ConfigScore('c', None, 1, 1, 0.1, 9)]
+    assert [score.name for score in rank(scores)] == ['b', 'c', 'a']
+
+
+def test_sampling_is_seeded_and_keeps_required():
+    space = [(0, 1), ('a', 'b', 'c'), (True, False)]
+    first = sample_configurations(space, 5, seed=1, required=[(1, 'c', False)])
+    assert first == sample_configurations(space, 5, seed=1, required=[(1, 'c', False)])
+    assert first[0] == (1, 'c', False) and len(set(first)) == 5
+    assert len(sample_configurations(space, 100)) == 12
@@ -0,0 +1,129 @@
+import math
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from results_store import read_stored_trajectory
+from trajectory import value_at
+
+# Escala por número de threads: o mesmo (instância, preset) roda sozinho na máquina com 1, 2, 4, ...
+# threads (e, no gurobi, também com ConcurrentMIP, vários MIPs com sementes diferentes dividindo as
+# threads). As execuções vêm do banco de resultados (results_store.py; a última de cada repetição). Para
+# cada contagem: tempo até 1% de gap, nós/s e limitante dual num instante fixo, todos contados a partir
+# do início do solver: a heurística do MIP start (sequencial, igual em todas as contagens) fica de fora
+# e sai numa coluna própria. O speedup é sobre a menor
+# contagem de threads do mesmo preset (sem ConcurrentMIP) e a eficiência é speedup / razão de threads.
+# Só entram as execuções com o limite de tempo do modo de escala: as de outros limites (ou importadas de
+# CSVs antigos, sem limite nem trajetória) com o mesmo nome de run não se misturam.
+# Eficiência perto de 1 favorece mais threads por solve; bem abaixo de 1, mais solves em paralelo com
+# menos threads cada rendem mais por máquina.
+
+### CONSTANTES ###
+
+BOUND_TIME = 60.0  # segundos de parede do limitante comparado entre as contagens de threads
+
+### CLASSES E TIPOS ###
+
+# nome do run no banco -> (preset de origem, threads, ConcurrentMIP; 0 = desligado)
+ScalingCases = Dict[str, Tuple[str, int, int]]
+
+@dataclass
+class ScalingPoint:
+    preset: str
+    concurrent_mip: int
+    instance: str
+    threads: int
+    nb_runs: int
+    time_to_target_gap: float  # média entre as repetições, desde o início do solver; nan se alguma não chegou a 1%
+    nodes_per_second: float
+    bound_at_time: float
+    heuristic_time: float  # média do tempo da heurística antes do solver (fora do tempo até 1% de gap)
+    speedup: float = math.nan  # tempo até 1% de gap da base / o deste ponto
+    efficiency: float = math.nan
+    nodes_speedup: float = math.nan  # razão de nós/s (a vazão de nós cresce mesmo quando o tempo não cai)
+
+### FUNÇÕES ###
+
+def load_scaling_points(connection: sqlite3.Connection, cases: ScalingCases, time_limit: float,
+                        bound_time: float = BOUND_TIME) -> List[ScalingPoint]:
+    if not cases:
+        return []
+    names = list(cases)
+    rows = connection.execute(
+        f'SELECT id, preset, instance, repetition, exec_time, nb_explored_nodes, time_to_target_gap, heuristic_time FROM results '
+        f'WHERE preset IN ({", ".join("?" * len(names))}) AND time_limit = ? ORDER BY id', names + [time_limit]).fetchall()
+
+    # a última execução de cada (run, instância, repetição): um sweep retomado não conta duas vezes
+    latest = {tuple(row[1:4]): row for row in rows}
+    groups: Dict[Tuple[str, str], List[tuple]] = dict()
+    for (preset, instance, _), row in latest.items():
+        groups.setdefault((preset, instance), []).append(row)
+
+    points = []
+    for (name, instance), group in groups.items():
+        preset, threads, concurrent_mip = cases[name]
+        target_times, nodes_rates, bounds, heuristic_times = [], [], [], []
+        for result_id, _, _, _, exec_time, nodes, target_time, heuristic_time in group:
+            # a trajetória começa no fim da heurística (time_offset): os instantes voltam para o início do solver
+            offset = heuristic_time or 0.0
+            heuristic_times.append(offset)
+            target_times.append(math.nan if target_time is None else max(target_time - offset, 0.0))
+            nodes_rates.append(math.nan if nodes is None or not exec_time else nodes / exec_time)
+            trajectory = read_stored_trajectory(connection, result_id)
+            bounds.append(math.nan if trajectory is None else value_at(trajectory, 'bound', bound_time + offset))
+        points.append(ScalingPoint(preset, concurrent_mip, instance, threads, len(group), float(np.mean(target_times)),
+                                   float(np.mean(nodes_rates)), float(np.mean(bounds)), float(np.mean(heuristic_times))))
+    return compute_speedups(points)
+
+
+def compute_speedups(points: List[ScalingPoint]) -> List[ScalingPoint]:
+    base: Dict[Tuple[str, str], ScalingPoint] = dict()
+    for point in points:
+        key = (point.preset, point.instance)
+        if point.concurrent_mip == 0 and (key not in base or point.threads < base[key].threads):
+            base[key] = point
+
+    for point in points:
+        reference = base.get((point.preset, point.instance))
+        if reference is None:
+            continue
+        thread_ratio = point.threads / reference.threads
+        if point.time_to_target_gap > 0 and not math.isnan(reference.time_to_target_gap):
+            point.speedup = reference.time_to_target_gap / point.time_to_target_gap
+            point.efficiency = point.speedup / thread_ratio
+        if reference.nodes_per_second > 0:
+            point.nodes_speedup = point.nodes_per_second / reference.nodes_per_second
+    return sorted(points, key=lambda point: (point.preset, point.instance, point.concurrent_mip, point.threads))
+
+
+def geometric_mean(values: List[float]) -> float:
+    values = [value for value in values if value > 0 and math.isfinite(value)]
+    return float(np.exp(np.mean(np.log(values)))) if values else math.nan
+
+
+def write_scaling_report(points: List[ScalingPoint], output_file_name: str, bound_time: float = BOUND_TIME):
+    os.makedirs(os.path.dirname(output_file_name) or '.', exist_ok=True)
+    with open(output_file_name, 'w') as output_file:
+        output_file.write(f'preset,concurrent_mip,caso_teste,threads,execucoes,tempo_gap_1pct,nos_por_segundo,'
+                          f'limitante_{bound_time:.0f}s,tempo_heuristica,speedup,eficiencia,speedup_nos\n')
+        for p in points:
+            output_file.write(f'{p.preset},{p.concurrent_mip},{p.instance},{p.threads},{p.nb_runs},{p.time_to_target_gap:.3f},'
+                              f'{p.nodes_per_second:.1f},{p.bound_at_time:.3f},{p.heuristic_time:.3f},{p.speedup:.3f},{p.efficiency:.3f},{p.nodes_speedup:.3f}\n')
+
+
+def print_scaling_summary(points: List[ScalingPoint]):
+    # média geométrica sobre as instâncias de cada (preset, ConcurrentMIP, threads)
+    summary: Dict[Tuple[str, int, int], List[ScalingPoint]] = dict()
+    for point in points:
+        summary.setdefault((point.preset, point.concurrent_mip, point.threads), []).append(point)
+
+    print(f'\n{"preset":>30} {"concurrent":>10} {"threads":>7} {"speedup":>8} {"eficiência":>10} {"speedup nós":>11} {"instâncias":>10}')
+    for (preset, concurrent_mip, threads), group in sorted(summary.items()):
+        speedup = geometric_mean([point.speedup for point in group])
+        efficiency = geometric_mean([point.efficiency for point in group])
+        nodes_speedup = geometric_mean([point.nodes_speedup for point in group])
+        print(f'{preset:>30} {concurrent_mip or "-":>10} {threads:7d} {speedup:8.2f} {efficiency:10.2f} {nodes_speedup:11.2f} {len(group):10d}')
+
@@ -0,0 +1,104 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Trajetória de uma execução do solver: amostras (tempo, melhor solução, limitante dual, nós, iterações
+# do simplex) coletadas pelo callback. Usada para comparar os presets pela velocidade com que fecham
+# o gap, e não só pelo ponto onde pararam no limite de tempo.
+
+### CONSTANTES ###
+
+SAMPLE_INTERVAL = 1.0  # segundos entre amostras do callback (custo fixo, independente do número de nós)
+TARGET_GAP = 0.01  # gap relativo do tempo_gap_1pct
+NO_VALUE = 1e100  # "infinito" dos solvers (GRB.INFINITY): sem solução/limitante ainda
+
+TRAJECTORY_COLUMNS = ('time', 'incumbent', 'bound', 'nodes', 'iterations')
+
+### CLASSES E TIPOS ###
+
+Incumbents = List[Tuple[float, float]]  # (tempo em segundos, valor da solução encontrada)
+Trajectory = Dict[str, np.ndarray]  # coluna -> valores (gravada no banco de resultados, results_store.py)
+
+
+class TrajectoryRecorder:
+    # Guarda as amostras em listas e só converte para arrays no final; as novas soluções (MIPSOL) são
+    # sempre registradas, o resto no máximo uma vez a cada sample_interval segundos.
+    def __init__(self, time_offset: float = 0.0, sample_interval: float = SAMPLE_INTERVAL, maximize: bool = True):
+        self.time_offset = time_offset  # tempo gasto antes do solver (ex.: heurística do MIP start)
+        self.sample_interval = sample_interval
+        self.maximize = maximize
+        self.best: Optional[float] = None
+        self.next_sample = 0.0
+        self.iterations = 0.0  # o callback MIPSOL não informa iterações: usa a última conhecida
+        self.samples: List[Tuple[float, float, float, float, float]] = []
+        self.incumbents: Incumbents = []
+
+    def sample(self, runtime: float, incumbent: float, bound: float, nodes: float, iterations: float):
+        incumbent = math.nan if abs(incumbent) >= NO_VALUE else incumbent
+        bound = math.nan if abs(bound) >= NO_VALUE else bound
+        self.samples.append((self.time_offset + runtime, incumbent, bound, nodes, iterations))
+
+    def new_incumbent(self, runtime: float, value: float, bound: float, nodes: float):
+        # nem toda solução nova é melhor que a atual: a amostra guarda sempre a melhor
+        if self.best is None or (value > self.best if self.maximize else value < self.best):
+            self.best = value
+        self.incumbents.append((self.time_offset + runtime, value))
+        self.sample(runtime, self.best, bound, nodes, self.iterations)
+
+    def due(self, runtime: float) -> bool:
+        if runtime < self.next_sample:
+            return False
+        self.next_sample = runtime + self.sample_interval
+        return True
+
+    def to_columns(self) -> Trajectory:
+        values = np.array(self.samples, dtype=np.float64).reshape(-1, len(TRAJECTORY_COLUMNS))
+        return {name: values[:, k] for k, name in enumerate(TRAJECTORY_COLUMNS)}
+
+### FUNÇÕES ###
+
+def primal_gap(value: Optional[float], reference: float) -> float:
+    # gap primal de Berthold: 1 sem solução (ou com sinais diferentes), senão |z* - z| / max(|z*|, |z|)
+    if value is None:
+        return 1.0
+    if value == reference:
+        return 0.0
+    if value * reference < 0:
+        return 1.0
+    return abs(reference - value) / max(abs(reference), abs(value))
+
+
+def time_to_first_incumbent(incumbents: Incumbents) -> Optional[float]:
+    return min(t for t, _ in incumbents) if incumbents else None
+
+
+def primal_integral(incumbents: Incumbents, reference: float, horizon: float, maximize: bool = True) -> float:
+    # Integral do gap primal em [0, horizon] (função em escada: vale o melhor incumbente até o
+    # momento). Quanto menor, mais cedo apareceram boas soluções; no máximo igual a horizon.
+    integral = 0.0
+    last_time = 0.0
+    best: Optional[float] = None
+    for t, value in sorted(incumbents):
+        t = min(max(t, 0.0), horizon)
+        integral += primal_gap(best, reference) * (t - last_time)
+        last_time = t
+        if best is None or (value > best if maximize else value < best):
+            best = value
+    integral += primal_gap(best, reference) * (horizon - last_time)
+    return integral
+
+
+def time_to_gap(trajectory: Trajectory, target_gap: float = TARGET_GAP) -> Optional[float]:
+    # primeiro instante em que o gap do solver, |limitante - solução| / |solução|, ficou <= target_gap
+    incumbent, bound = trajectory['incumbent'], trajectory['bound']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap = np.abs(bound - incumbent) / np.abs(incumbent)
+    reached = np.flatnonzero(gap <= target_gap)  # NaN (sem solução ou limitante) nunca passa
+    return float(trajectory['time'][reached[0]]) if reached.size else None
+
+
+def value_at(trajectory: Trajectory, column: str, at_time: float) -> float:
+    # valor da coluna na última amostra até at_time (nan se ainda não havia amostra ou valor)
+    samples = np.flatnonzero(trajectory['time'] <= at_time)
+    return float(trajectory[column][samples[-1]]) if samples.size else math.nan
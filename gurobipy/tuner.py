@@ -0,0 +1,105 @@
+import math
+import random
+from dataclasses import dataclass
+from itertools import product
+from typing import Callable, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+# Ajuste de parâmetros por successive halving: todas as configurações rodam em todas as instâncias com
+# um orçamento curto, só a melhor fração 1/eta passa para a rodada seguinte, com eta vezes mais tempo.
+# Cada rodada custa aproximadamente o mesmo tempo de CPU (n configurações * orçamento constante).
+
+### CONSTANTES ###
+
+ETA = 3  # fração mantida (1/ETA) e fator de aumento do orçamento a cada rodada
+NB_CONFIGS = 81  # configurações sorteadas na primeira rodada (ETA^4 -> 5 rodadas)
+SEED = 0
+
+### CLASSES E TIPOS ###
+
+T = TypeVar('T')
+
+RoundScores = Dict[str, Tuple[float, float]]  # nome da configuração -> (gap médio, integral primal média)
+
+@dataclass
+class ConfigScore(Generic[T]):
+    name: str
+    config: T
+    rounds: int = 0          # rodadas em que a configuração foi avaliada
+    budget: float = 0.0      # orçamento (segundos por instância) da última rodada avaliada
+    mean_gap: float = math.inf
+    mean_primal_integral: float = math.inf
+
+### FUNÇÕES ###
+
+def sample_configurations(space: Sequence[Sequence[T]], nb_configs: int, seed: int = SEED, required: Sequence[tuple] = ()) -> List[tuple]:
+    # sorteia nb_configs combinações do produto cartesiano; as de `required` (ex.: presets atuais) sempre entram
+    configs = list(dict.fromkeys(required))
+    remaining = [config for config in product(*space) if config not in set(configs)]
+    nb_sampled = max(0, min(nb_configs - len(configs), len(remaining)))
+    return configs + random.Random(seed).sample(remaining, nb_sampled)
+
+
+def budgets(max_budget: float, nb_configs: int, eta: int = ETA) -> List[float]:
+    # orçamento de cada rodada; a última (com ~1 configuração) recebe max_budget
+    nb_rounds = int(math.floor(math.log(nb_configs, eta) + 1e-9)) + 1 if nb_configs > 1 else 1
+    return [max_budget / eta ** (nb_rounds - 1 - r) for r in range(nb_rounds)]
+
+
+def pareto_layers(points: Sequence[Tuple[float, float]]) -> List[int]:
+    # camada de Pareto de cada ponto (0 = não dominado), minimizando as duas coordenadas
+    layers = [-1] * len(points)
+    layer = 0
+    remaining = set(range(len(points)))
+    while remaining:
+        front = {p for p in remaining
+                 if not any(points[q][0] <= points[p][0] and points[q][1] <= points[p][1] and points[q] != points[p]
+                            for q in remaining)}
+        for p in front:
+            layers[p] = layer
+        remaining -= front
+        layer += 1
+    return layers
+
+
+def rank(scores: List[ConfigScore]) -> List[ConfigScore]:
+    # mais rodadas primeiro (sobreviventes), depois camada de Pareto em (gap, integral primal) e, dentro
+    # da camada, menor gap e menor integral
+    ranked: List[ConfigScore] = []
+    for rounds in sorted({score.rounds for score in scores}, reverse=True):
+        group = [score for score in scores if score.rounds == rounds]
+        layers = pareto_layers([(score.mean_gap, score.mean_primal_integral) for score in group])
+        order = sorted(range(len(group)), key=lambda k: (layers[k], group[k].mean_gap, group[k].mean_primal_integral))
+        ranked += [group[k] for k in order]
+    return ranked
+
+
+def successive_halving(configs: Dict[str, T],
+                       evaluate: Callable[[Dict[str, T], float, int], RoundScores],
+                       max_budget: float,
+                       eta: int = ETA) -> List[ConfigScore]:
+    # evaluate(configurações, orçamento, rodada) roda as configurações em todas as instâncias e devolve
+    # (gap médio, integral primal média) de cada uma; configurações sem resultado ficam com infinito
+    scores = {name: ConfigScore(name, config) for name, config in configs.items()}
+    survivors = list(configs)
+
+    for round_index, budget in enumerate(budgets(max_budget, len(configs), eta)):
+        print(f'\n[tuner] rodada {round_index}: {len(survivors)} configurações com {budget:.1f}s por instância')
+        round_scores = evaluate({name: configs[name] for name in survivors}, budget, round_index)
+
+        for name in survivors:
+            score = scores[name]
+            score.mean_gap, score.mean_primal_integral = round_scores.get(name, (math.inf, math.inf))
+            score.rounds = round_index + 1
+            score.budget = budget
+
+        nb_kept = max(1, math.ceil(len(survivors) / eta))
+        survivors = [score.name for score in rank([scores[name] for name in survivors])[:nb_kept]]
+
+    return rank(list(scores.values()))
+
+
+def write_ranking(ranking: List[ConfigScore], output_file_name: str):
+    with open(output_file_name, 'w') as output_file:
+        output_file.write('posicao,configuracao,rodadas,orcamento_ultima_rodada,gap_medio(%),integral_primal_media\n')
+        for position, score in enumerate(ranking, start=1):
+            output_file.write(f'{position},{score.name},{score.rounds},{score.budget:.3f},{score.mean_gap * 100:.3f},{score.mean_primal_integral:.3f}\n')